@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Analysis Cache Module
+This module stores agent outputs (tweet classifications, engagement scores) in a
+local SQLite database so that tweets seen in a previous scrape are not re-analyzed.
+"""
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Any
+from pydantic import BaseModel
+
+# Store the cache next to the other data files
+SCRIPT_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
+CACHE_PATH = SCRIPT_DIR / "analysis_cache.db"
+
+# Defaults can be overridden from the environment
+DEFAULT_TTL_SECONDS = float(os.getenv("ANALYSIS_CACHE_TTL_HOURS", "72")) * 3600
+DEFAULT_MAX_ENTRIES = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "5000"))
+
+
+def agent_fingerprint(agent) -> str:
+    """Hash the parts of an agent that affect its output (name, instructions and model)"""
+    payload = json.dumps([agent.name, str(agent.instructions), str(agent.model)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """Content-addressed, size-bounded LRU cache for structured agent outputs
+
+    Entries are keyed by a hash of the agent fingerprint together with the tweet URL
+    and text, so editing an agent's instructions or model never returns stale results.
+    Entries older than ``ttl_seconds`` are treated as misses, and the least recently
+    used entries are evicted once the cache holds more than ``max_entries`` rows.
+    """
+
+    def __init__(self, path: Path = CACHE_PATH, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits: Dict[str, int] = {}
+        self.misses: Dict[str, int] = {}
+        self._checked_fingerprints = set()
+        self._lock = threading.Lock()
+
+        # The Flask dev server handles requests on several threads, so share one guarded connection
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    agent_name TEXT NOT NULL,
+                    fingerprint TEXT NOT NULL,
+                    post TEXT,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_last_access ON entries (last_access)")
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_entries_agent ON entries (agent_name)")
+
+    def get(self, agent, tweet: Dict[str, Any]) -> Optional[BaseModel]:
+        """Return the cached output of ``agent`` for ``tweet``, or None on a miss"""
+        fingerprint = self._prepare(agent)
+        key = self._make_key(fingerprint, tweet)
+        now = time.time()
+
+        with self._lock, self._conn:
+            row = self._conn.execute(
+                "SELECT value, created_at FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is not None and now - row[1] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+                row = None
+
+            if row is None:
+                self.misses[agent.name] = self.misses.get(agent.name, 0) + 1
+                return None
+
+            self._conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+
+        try:
+            value = agent.output_type.model_validate_json(row[0])
+        except Exception:
+            # The output model changed shape since this entry was written
+            with self._lock, self._conn:
+                self._conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self.misses[agent.name] = self.misses.get(agent.name, 0) + 1
+            return None
+
+        self.hits[agent.name] = self.hits.get(agent.name, 0) + 1
+        return value
+
+    def set(self, agent, tweet: Dict[str, Any], value: BaseModel) -> None:
+        """Store the output of ``agent`` for ``tweet`` and evict old entries if needed"""
+        fingerprint = self._prepare(agent)
+        key = self._make_key(fingerprint, tweet)
+        now = time.time()
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (key, agent_name, fingerprint, post, value, created_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, agent.name, fingerprint, tweet.get('post'), value.model_dump_json(), now, now)
+            )
+            self._evict(now)
+
+    def labeled_outputs(self, agent) -> List[Tuple[str, BaseModel]]:
+        """Return (post text, output) pairs stored for the current version of ``agent``"""
+        fingerprint = self._prepare(agent)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT post, value FROM entries WHERE fingerprint = ? AND post IS NOT NULL AND created_at >= ?",
+                (fingerprint, time.time() - self.ttl_seconds)
+            ).fetchall()
+
+        outputs = []
+        for post, value in rows:
+            try:
+                outputs.append((post, agent.output_type.model_validate_json(value)))
+            except Exception:
+                continue
+        return outputs
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters per agent along with the current number of entries"""
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+        agents = sorted(set(self.hits) | set(self.misses))
+        return {
+            "entries": size,
+            "hits": sum(self.hits.values()),
+            "misses": sum(self.misses.values()),
+            "agents": {
+                name: {"hits": self.hits.get(name, 0), "misses": self.misses.get(name, 0)}
+                for name in agents
+            }
+        }
+
+    def clear(self) -> None:
+        """Remove every cached entry"""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM entries")
+
+    def _prepare(self, agent) -> str:
+        """Fingerprint the agent and drop its entries written under an older prompt or model"""
+        fingerprint = agent_fingerprint(agent)
+        if (agent.name, fingerprint) not in self._checked_fingerprints:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "DELETE FROM entries WHERE agent_name = ? AND fingerprint != ?",
+                    (agent.name, fingerprint)
+                )
+            self._checked_fingerprints.add((agent.name, fingerprint))
+        return fingerprint
+
+    def _make_key(self, fingerprint: str, tweet: Dict[str, Any]) -> str:
+        """Build the content-addressed key for an agent/tweet pair"""
+        payload = json.dumps([fingerprint, tweet.get('url', ''), tweet.get('post', '')])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries, then the least recently used ones beyond ``max_entries``"""
+        self._conn.execute("DELETE FROM entries WHERE created_at < ?", (now - self.ttl_seconds,))
+        size = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+        if size > self.max_entries:
+            self._conn.execute(
+                "DELETE FROM entries WHERE key IN (SELECT key FROM entries ORDER BY last_access ASC LIMIT ?)",
+                (size - self.max_entries,)
+            )
@@ -5,17 +5,21 @@ This Flask application provides a web interface for the Twitter analysis tool wi
 """
 import os
 import json
+import uuid
+import queue
 import asyncio
 import logging
+import threading
 from pathlib import Path
-from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session
+from flask import Flask, render_template, request, redirect, url_for, flash, jsonify, session, Response
 from flask_bootstrap import Bootstrap
 from werkzeug.utils import secure_filename
 
-# Import modules for Twitter analysis
-from twitter_wrapper import fetch_tweets_async
-from twitter_analyzer import TwitterAnalyzer, TweetData
-from tweet_poster import post_reply_async, post_tweet_async
+# Import modules for Twitter analysis. The analyzer (agents SDK, pydantic, NumPy) and the
+# Playwright scraper and poster are imported by the routes that use them, which keeps
+# startup and pages such as / and /restart fast.
+from metrics import AgentMetrics, write_report
+from tweet_stats import format_stats
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, 
@@ -26,15 +30,40 @@ logger = logging.getLogger(__name__)
 app = Flask(__name__)
 app.secret_key = os.urandom(24)
 Bootstrap(app)
+app.add_template_filter(format_stats)
 
 # Configure file paths
 SCRIPT_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
 DATA_PATH = SCRIPT_DIR / "data.json"
 ANALYSIS_PATH = SCRIPT_DIR / "analysis_results.json"
+METRICS_PATH = SCRIPT_DIR / "analysis_metrics.json"
 STORAGE_STATE_PATH = SCRIPT_DIR / "state.json"
 
-# Global variables
-twitter_analyzer = TwitterAnalyzer()
+# Seconds without progress before the analysis stream sends a keep-alive comment
+SSE_KEEPALIVE_SECONDS = 15
+
+# Global variables; the analyzer is built by the first request that needs it
+twitter_analyzer = None
+analyzer_lock = threading.Lock()
+
+def get_twitter_analyzer():
+    """Return the process-wide TwitterAnalyzer, building it on first use"""
+    global twitter_analyzer
+    with analyzer_lock:
+        if twitter_analyzer is None:
+            from twitter_analyzer import TwitterAnalyzer, PREFILTER_ENABLED, DEDUPE_ENABLED
+            from analysis_cache import AnalysisCache
+            from tech_prefilter import TechPrefilter
+            from near_duplicates import NearDuplicateIndex
+            from news_cache import NewsCache
+            
+            twitter_analyzer = TwitterAnalyzer(
+                cache=AnalysisCache(),
+                prefilter=TechPrefilter() if PREFILTER_ENABLED else None,
+                news_cache=NewsCache(),
+                deduplicator=NearDuplicateIndex() if DEDUPE_ENABLED else None
+            )
+        return twitter_analyzer
 
 @app.route('/')
 def index():
@@ -56,6 +85,8 @@ def fetch_tweets():
     
     # Always fetch fresh tweets when requested
     try:
+        from twitter_wrapper import fetch_tweets_async
+        
         # Start async task to fetch tweets
         asyncio.run(fetch_tweets_async(scroll_count))
         flash(f'Successfully fetched tweets with {scroll_count} scrolls!', 'success')
@@ -90,15 +121,15 @@ def analyze_tweets():
         
     try:
         # Run the Twitter analyzer asynchronously
-        results = asyncio.run(_analyze_tweets())
+        results = asyncio.run(_analyze_tweets(**_analysis_options(request.args)))
         
         # Check if there was an error in analysis
         if 'error' in results:
             flash(results['error'], 'error')
             return render_template('error.html', error_code="Analysis Error", message=results['error'])
             
-        # Store results in session
-        session['analysis_results'] = results
+        # The session only remembers which saved analysis it was shown
+        session['analysis_id'] = results['id']
         
         return render_template('analysis.html', results=results)
     except Exception as e:
@@ -106,37 +137,152 @@ def analyze_tweets():
         flash(f'Error analyzing tweets: {str(e)}', 'error')
         return render_template('error.html', error_code="Analysis Error", message=f"Failed to analyze tweets: {str(e)}")
 
-async def _analyze_tweets():
-    """Helper function to run the analysis asynchronously"""
+@app.route('/analysis/live')
+def analysis_live():
+    """Render the analysis page in live mode; main.js follows the progress stream"""
+    if not DATA_PATH.exists():
+        flash('No tweets available for analysis. Please fetch tweets first.', 'warning')
+        return redirect(url_for('index'))
+    
+    return render_template(
+        'analysis.html',
+        results=None,
+        stream_url=url_for('analyze_tweets_stream', **request.args),
+        fallback_url=url_for('analyze_tweets', **request.args)
+    )
+
+@app.route('/analyze_tweets/stream')
+def analyze_tweets_stream():
+    """Run the analysis and stream its progress as server-sent events
+
+    The analysis runs on a worker thread and hands its progress events over a queue.
+    A ``done`` event points the browser at /analysis, which records the saved results'
+    id in the session; the session cookie cannot be changed once streaming has begun.
+    """
+    if not DATA_PATH.exists():
+        return Response(_sse('failed', {'message': 'No tweets available for analysis. Please fetch tweets first.'}),
+                        mimetype='text/event-stream')
+    
+    options = _analysis_options(request.args)
+    analysis_url = url_for('show_analysis')
+    events = queue.Queue()
+    
+    def run():
+        try:
+            results = asyncio.run(_analyze_tweets(**options, on_event=lambda event, data: events.put((event, data))))
+            if 'error' in results:
+                events.put(('failed', {'message': results['error']}))
+            else:
+                events.put(('done', {'redirect': analysis_url}))
+        except Exception as e:
+            logger.error(f"Error analyzing tweets: {str(e)}")
+            events.put(('failed', {'message': f"Failed to analyze tweets: {str(e)}"}))
+        finally:
+            events.put(None)
+    
+    threading.Thread(target=run, name="analysis-stream", daemon=True).start()
+    
+    def stream():
+        while True:
+            try:
+                item = events.get(timeout=SSE_KEEPALIVE_SECONDS)
+            except queue.Empty:
+                # Comment lines keep idle connections from being closed by proxies
+                yield ": keep-alive\n\n"
+                continue
+            if item is None:
+                return
+            yield _sse(*item)
+    
+    return Response(stream(), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/analysis')
+def show_analysis():
+    """Show the results of the last analysis run, e.g. one that finished streaming"""
+    try:
+        with open(ANALYSIS_PATH, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+    except (OSError, ValueError):
+        flash('No analysis results found. Please analyze tweets first.', 'error')
+        return redirect(url_for('index'))
+    
+    session['analysis_id'] = results.get('id')
+    return render_template('analysis.html', results=results)
+
+def _analysis_options(args):
+    """Read analysis overrides from the query string"""
+    from twitter_analyzer import DEFAULT_CONCURRENCY, DEFAULT_BATCH_SIZE, DEFAULT_VARIANTS, ANALYSIS_MODES
+    
+    analysis_mode = args.get('mode')
+    if analysis_mode not in ANALYSIS_MODES:
+        analysis_mode = None  # Fall back to the analyzer's configured mode
+    pipelined = args.get('pipeline')
+    if pipelined is not None:
+        pipelined = pipelined.lower() not in ('0', 'false', 'no')
+    
+    return {
+        # Allow overriding the number of in-flight agent calls per request
+        "max_concurrency": args.get('concurrency', DEFAULT_CONCURRENCY, type=int),
+        "batch_size": args.get('batch_size', DEFAULT_BATCH_SIZE, type=int),
+        "variants": args.get('variants', DEFAULT_VARIANTS, type=int),
+        "analysis_mode": analysis_mode,
+        "pipelined": pipelined
+    }
+
+def _sse(event, data):
+    """Format one server-sent event"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+async def _analyze_tweets(max_concurrency=None, batch_size=None, analysis_mode=None,
+                          pipelined=None, variants=None, on_event=None):
+    """Helper function to run the analysis asynchronously
+
+    Unset ``max_concurrency``, ``batch_size`` and ``variants`` fall back to the analyzer's
+    environment defaults.
+    """
+    from twitter_analyzer import (
+        TweetData, DEFAULT_CONCURRENCY, DEFAULT_BATCH_SIZE, DEFAULT_VARIANTS, ENGAGEMENT_STOP_SCORE,
+        ENGAGEMENT_MAX_SCORED, ENGAGEMENT_SHORTLIST
+    )
+    analyzer = get_twitter_analyzer()
+    
     # Load tweet data
     tweet_data = TweetData()
     tweets = tweet_data.get_tweets()
     
-    # Classify tech tweets
-    tech_tweets = await twitter_analyzer.classify_tech_tweets(tweets)
+    # Classify and score tweets, then generate a reply and a new post. News gathering
+    # and the two generators overlap with each other and with the analysis.
+    analysis = await analyzer.run_analysis(
+        tweets,
+        max_concurrency=DEFAULT_CONCURRENCY if max_concurrency is None else max_concurrency,
+        batch_size=DEFAULT_BATCH_SIZE if batch_size is None else batch_size,
+        stop_at_score=ENGAGEMENT_STOP_SCORE,
+        max_scored=ENGAGEMENT_MAX_SCORED,
+        shortlist=ENGAGEMENT_SHORTLIST,
+        analysis_mode=analysis_mode,
+        pipelined=pipelined,
+        variants=DEFAULT_VARIANTS if variants is None else variants,
+        on_event=on_event
+    )
     
     # If no tech tweets found, return error
-    if not tech_tweets:
-        return {"error": "No technology-related tweets found."}
-    
-    # Score engagement potential
-    scored_tweets = await twitter_analyzer.score_engagement_potential(tech_tweets)
-    
-    # Find best tweet
-    best_tweet = await twitter_analyzer.find_best_tweet(scored_tweets)
+    if analysis is None:
+        return {"error": "No technology-related tweets found to reply to."}
     
-    # Generate reply
-    tweet_reply = await twitter_analyzer.generate_reply(best_tweet)
+    tech_tweets = analysis["tech_tweets"]
+    best_tweet = analysis["best_tweet"]
+    tweet_reply = analysis["tweet_reply"]
+    new_post = analysis["new_post"]
     
-    # Generate a new standalone post
-    new_post = await twitter_analyzer.generate_new_post(tech_tweets)
-    
-    # Create results dictionary
+    # Create results dictionary. It is saved to ANALYSIS_PATH and only its id goes into
+    # the session, since drafts for every reply candidate do not fit in a cookie.
     results = {
+        "id": uuid.uuid4().hex,
         "best_tweet": {
             "url": best_tweet['url'],
             "post": best_tweet['post'],
-            "stats": best_tweet['stats'],
+            "stats": format_stats(best_tweet['stats'], abbreviate=True),
             "engagement_score": best_tweet['engagement_score'].engagement_potential,
             "tech_categories": best_tweet['tech_analysis'].tech_categories
         },
@@ -144,49 +290,129 @@ async def _analyze_tweets():
             "text": tweet_reply.reply_text,
             "tone": tweet_reply.tone,
             "style": tweet_reply.humor_style if hasattr(tweet_reply, 'humor_style') else "",
-            "reasoning": tweet_reply.reasoning
+            "reasoning": tweet_reply.reasoning,
+            "variants": [_draft(reply) for reply in analysis["reply_variants"]]
         },
+        "reply_candidates": [
+            {
+                "url": tweet['url'],
+                "post": tweet['post'],
+                "stats": format_stats(tweet['stats'], abbreviate=True),
+                "engagement_score": tweet['engagement_score'].engagement_potential,
+                "tech_categories": tweet['tech_analysis'].tech_categories,
+                "reply": _draft(replies[0]),
+                "variants": [_draft(reply) for reply in replies]
+            }
+            for tweet, replies in analysis["reply_candidates"]
+        ],
         "generated_post": {
             "text": new_post.reply_text,
             "tone": new_post.tone,
             "style": new_post.humor_style if hasattr(new_post, 'humor_style') else "",
-            "reasoning": new_post.reasoning
+            "reasoning": new_post.reasoning,
+            "variants": [_draft(post) for post in analysis["post_variants"]]
         },
         "analysis_summary": {
             "total_tweets": len(tweets),
             "tech_tweets_found": len(tech_tweets),
-            "best_score": best_tweet['engagement_score'].engagement_potential
+            "best_score": best_tweet['engagement_score'].engagement_potential,
+            "llm_calls_avoided": analysis["prefilter"].get("llm_calls_avoided", 0),
+            "scorer_calls_avoided": analysis["shortlist"].get("scorer_calls_avoided", 0),
+            "duplicates_collapsed": analysis["dedupe"].get("duplicates_collapsed", 0)
         }
     }
     
-    # Save results to file
+    # Save results to file, with the agent metrics for this run alongside
     with open(ANALYSIS_PATH, 'w', encoding='utf-8') as f:
         json.dump(results, f, indent=2, ensure_ascii=False, default=str)
+    write_report(analysis["metrics"], METRICS_PATH)
+    
+    totals = analysis["metrics"]["totals"]
+    if totals['hedges']:
+        logger.info(f"Hedged {totals['hedges']} slow agent calls, {totals['hedge_wins']} hedges finished first")
+    limiter_stats = analyzer.rate_limiter.stats()
+    logger.info(f"Rate limiter: concurrency limit {limiter_stats['concurrency_limit']}, "
+                f"{limiter_stats['throttle_events']} throttle events, {limiter_stats['retries']} retries")
+    cache_stats = analyzer.cache.stats()
+    logger.info(f"Analysis cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                f"{cache_stats['entries']} entries")
+    for agent_name, usage in analyzer.prompt_builder.report().items():
+        logger.info(f"{agent_name}: {usage['tokens_sent']} prompt tokens over {usage['prompts']} prompts "
+                    f"({usage['avg_tokens_per_prompt']:.0f} avg, {usage['tokens_saved']} saved by compaction)")
     
     return results
 
+def _draft(reply):
+    """Copy of a generated draft for the saved results and the analysis page, without the reasoning"""
+    return {"text": reply.reply_text, "tone": reply.tone, "style": reply.humor_style}
+
+def _session_results():
+    """Load the saved analysis this session was shown, or None if it is missing or was replaced"""
+    analysis_id = session.get('analysis_id')
+    if analysis_id is None:
+        return None
+    try:
+        with open(ANALYSIS_PATH, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return results if results.get('id') == analysis_id else None
+
+def _choose_variant(generated, index):
+    """Make draft ``index`` the current text of a generated reply or post; False if there is no such draft"""
+    variants = generated.get('variants', [])
+    if index == 0:
+        return True
+    if not 0 <= index < len(variants):
+        return False
+    generated.update(variants[index], reasoning="")
+    return True
+
+@app.route('/metrics')
+def metrics():
+    """Expose agent latency, token, error and cache metrics in the Prometheus text format"""
+    # Before the first analysis there are no agent calls to report, so don't build the analyzer
+    agent_metrics = twitter_analyzer.metrics if twitter_analyzer is not None else AgentMetrics()
+    return Response(agent_metrics.to_prometheus(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/confirm_reply', methods=['POST'])
 def confirm_reply():
     """Confirm and post reply to Twitter"""
-    if 'analysis_results' not in session:
+    # Get the analysis results this session was shown
+    results = _session_results()
+    if results is None:
         flash('No analysis results found. Please analyze tweets first.', 'error')
         return redirect(url_for('index'))
     
-    # Get analysis results from session
-    results = session['analysis_results']
-    
     # Post reply
     if request.form.get('confirm') == 'yes':
+        # Switch to the reply target picked on the results page; its drafts are in the saved results
+        candidates = results.get('reply_candidates', [])
+        target = request.form.get('target', 0, type=int)
+        # Results saved before reply candidates only have the best tweet's draft, target 0
+        if not 0 <= target < max(1, len(candidates)):
+            flash('Unknown reply target. Please pick one of the ranked tweets.', 'error')
+            return redirect(url_for('index'))
+        if target > 0:
+            candidate = candidates[target]
+            results['best_tweet'] = {key: value for key, value in candidate.items() if key not in ('reply', 'variants')}
+            results['generated_reply'] = dict(candidate['reply'], reasoning="", variants=candidate.get('variants', []))
+        
+        # Switch to the draft picked for that tweet
+        if not _choose_variant(results['generated_reply'], request.form.get('variant', 0, type=int)):
+            flash('Unknown reply draft. Please pick one of the generated drafts.', 'error')
+            return redirect(url_for('index'))
+        
         try:
             tweet_url = results['best_tweet']['url']
             # Get the edited reply if available, otherwise use the original
             reply_text = request.form.get('edited_reply', results['generated_reply']['text'])
             
-            # Update the reply text in session for display on confirmation
+            # Show the reply text that was posted on the confirmation page
             results['generated_reply']['text'] = reply_text
-            session['analysis_results'] = results
             
             # Post the reply asynchronously
+            from tweet_poster import post_reply_async
             success = asyncio.run(post_reply_async(tweet_url, reply_text))
             
             if success:
@@ -207,23 +433,27 @@ def confirm_reply():
 @app.route('/create_post', methods=['POST'])
 def create_post():
     """Create and post a new standalone tweet to Twitter"""
-    if 'analysis_results' not in session:
+    # Get the analysis results this session was shown
+    results = _session_results()
+    if results is None:
         flash('No analysis results found. Please analyze tweets first.', 'error')
         return redirect(url_for('index'))
     
-    # Get analysis results from session
-    results = session['analysis_results']
-    
     if request.form.get('confirm') == 'yes':
+        # Switch to the draft picked on the results page
+        if not _choose_variant(results['generated_post'], request.form.get('variant', 0, type=int)):
+            flash('Unknown post draft. Please pick one of the generated drafts.', 'error')
+            return redirect(url_for('index'))
+        
         try:
             # Get the edited post text if available, otherwise use the original
             post_text = request.form.get('edited_post', results['generated_post']['text'])
             
-            # Update the post text in session for display on confirmation
+            # Show the post text that was posted on the confirmation page
             results['generated_post']['text'] = post_text
-            session['analysis_results'] = results
             
             # Post the tweet asynchronously
+            from tweet_poster import post_tweet_async
             success = asyncio.run(post_tweet_async(post_text))
             
             if success:
@@ -0,0 +1,4 @@
+"""
+Offline benchmarks for the tweet analyzer.
+Run from the project root, e.g. ``python -m benchmarks.bench_analyzer``.
+"""
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+Analyzer Benchmark
+This script runs the web app's end-to-end analysis (``app._analyze_tweets``) against
+synthetic tweets and the offline fake model at several concurrency settings, and
+reports throughput, agent call counts and peak memory. With ``--baseline`` it exits
+non-zero when a run is slower, makes more calls or uses more memory than allowed.
+
+Usage: python -m benchmarks.bench_analyzer --tweets 1000 --concurrency 1 5 20
+"""
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import logging
+import argparse
+import tempfile
+import tracemalloc
+import contextlib
+from pathlib import Path
+from typing import Dict, List, Any
+
+from agents import set_tracing_disabled
+
+import app
+from twitter_analyzer import TwitterAnalyzer, ANALYSIS_MODES
+from rate_limiter import AdaptiveRateLimiter, AIMDController
+from analysis_cache import AnalysisCache
+from benchmarks.fake_model import FakeModelProvider
+from benchmarks.synthetic_data import generate_tweets
+
+# Throughput may drop and memory may grow by this fraction before a run counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+
+def run_once(tweets: List[Dict[str, Any]], concurrency: int, args: argparse.Namespace,
+             trace_memory: bool = False) -> Dict[str, Any]:
+    """Run one end-to-end analysis in a scratch directory and return its measurements
+
+    tracemalloc slows Python down several times over, so peak memory is only
+    measured when ``trace_memory`` is set and timings from that run are not used.
+    """
+    random.seed(args.seed)
+    provider = FakeModelProvider(seed=args.seed, time_scale=args.time_scale, error_rate=args.error_rate)
+
+    # Let the stage limit under test decide concurrency rather than the adaptive limiter
+    rate_limiter = AdaptiveRateLimiter(
+        requests_per_second=0,
+        concurrency=AIMDController(initial=concurrency, maximum=concurrency),
+        backoff_base=args.time_scale
+    )
+
+    with tempfile.TemporaryDirectory() as scratch:
+        scratch = Path(scratch)
+        # Start from an empty cache each run so every tweet is really analyzed
+        analyzer = TwitterAnalyzer(cache=AnalysisCache(path=scratch / "analysis_cache.db"),
+                                   model_provider=provider, rate_limiter=rate_limiter)
+        with open(scratch / "data.json", "w", encoding="utf-8") as f:
+            json.dump(tweets, f)
+
+        # _analyze_tweets reads data.json from the working directory and writes next to the app
+        previous = (app.twitter_analyzer, app.ANALYSIS_PATH, app.METRICS_PATH, os.getcwd())
+        app.twitter_analyzer = analyzer
+        app.ANALYSIS_PATH = scratch / "analysis_results.json"
+        app.METRICS_PATH = scratch / "analysis_metrics.json"
+        os.chdir(scratch)
+        try:
+            if trace_memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                results = asyncio.run(app._analyze_tweets(
+                    max_concurrency=concurrency, batch_size=args.batch_size,
+                    analysis_mode=args.mode, pipelined=args.pipelined
+                ))
+            elapsed = time.perf_counter() - start
+            peak_memory = 0
+            if trace_memory:
+                _, peak_memory = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+
+            with open(app.METRICS_PATH, "r", encoding="utf-8") as f:
+                metrics = json.load(f)
+        finally:
+            app.twitter_analyzer, app.ANALYSIS_PATH, app.METRICS_PATH, cwd = previous
+            os.chdir(cwd)
+
+    if "error" in results:
+        raise RuntimeError(f"Analysis failed: {results['error']}")
+
+    return {
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "tweets_per_second": round(len(tweets) / elapsed, 2),
+        "agent_calls": metrics["totals"]["calls"],
+        "agent_errors": metrics["totals"]["errors"],
+        "input_tokens": metrics["totals"]["input_tokens"],
+        "output_tokens": metrics["totals"]["output_tokens"],
+        "peak_memory_mb": round(peak_memory / 2 ** 20, 2),
+        "calls_by_agent": {name: entry["calls"] for name, entry in metrics["agents"].items()},
+        "tech_tweets_found": results["analysis_summary"]["tech_tweets_found"]
+    }
+
+
+def find_regressions(runs: List[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Compare runs with a previous report and describe every regression found"""
+    previous = {run["concurrency"]: run for run in baseline.get("runs", [])}
+    regressions = []
+    for run in runs:
+        before = previous.get(run["concurrency"])
+        if before is None:
+            continue
+        label = f"concurrency {run['concurrency']}"
+        if run["tweets_per_second"] < before["tweets_per_second"] * (1 - tolerance):
+            regressions.append(f"{label}: throughput {run['tweets_per_second']} < {before['tweets_per_second']} tweets/s")
+        if run["agent_calls"] > before["agent_calls"]:
+            regressions.append(f"{label}: {run['agent_calls']} agent calls > {before['agent_calls']}")
+        if run["peak_memory_mb"] > before["peak_memory_mb"] * (1 + tolerance):
+            regressions.append(f"{label}: peak memory {run['peak_memory_mb']} > {before['peak_memory_mb']} MB")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark end-to-end tweet analysis offline")
+    parser.add_argument("--tweets", type=int, default=1000, help="Number of synthetic tweets (default: 1000)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 5, 20],
+                        help="Concurrency settings to measure (default: 1 5 20)")
+    parser.add_argument("--batch-size", type=int, default=1, help="Tweets per classifier call (default: 1)")
+    parser.add_argument("--mode", choices=ANALYSIS_MODES, default="two_stage", help="Analysis mode (default: two_stage)")
+    parser.add_argument("--no-pipeline", dest="pipelined", action="store_false", help="Disable pipelining")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the data and the fake model (default: 0)")
+    parser.add_argument("--time-scale", type=float, default=0.01,
+                        help="Multiplier applied to the fake model's latencies (default: 0.01)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of fake calls that fail (default: 0)")
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    parser.add_argument("--baseline", help="Previous report to compare against; regressions exit with status 1")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Allowed throughput drop and memory growth (default: {DEFAULT_TOLERANCE})")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    set_tracing_disabled(True)
+
+    tweets = generate_tweets(args.tweets, seed=args.seed)
+    print(f"Benchmarking {len(tweets)} synthetic tweets ({args.mode}, batch size {args.batch_size})")
+    print(f"{'concurrency':>11} {'seconds':>9} {'tweets/s':>9} {'calls':>7} {'errors':>7} {'peak MB':>8}")
+
+    runs = []
+    for concurrency in args.concurrency:
+        run = run_once(tweets, concurrency, args)
+        run["peak_memory_mb"] = run_once(tweets, concurrency, args, trace_memory=True)["peak_memory_mb"]
+        runs.append(run)
+        print(f"{run['concurrency']:>11} {run['seconds']:>9.2f} {run['tweets_per_second']:>9.1f} "
+              f"{run['agent_calls']:>7} {run['agent_errors']:>7} {run['peak_memory_mb']:>8.1f}")
+
+    report = {
+        "tweets": len(tweets),
+        "mode": args.mode,
+        "batch_size": args.batch_size,
+        "pipelined": args.pipelined,
+        "seed": args.seed,
+        "time_scale": args.time_scale,
+        "error_rate": args.error_rate,
+        "runs": runs
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        for setting in ("tweets", "mode", "batch_size", "pipelined", "time_scale", "error_rate"):
+            if baseline.get(setting) != report[setting]:
+                print(f"Warning: baseline {setting} is {baseline.get(setting)!r}, this run used {report[setting]!r}")
+        regressions = find_regressions(runs, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate Benchmark
+This script times ``NearDuplicateIndex.group`` on synthetic timelines of growing size
+and checks its accuracy. Each timeline mixes unique posts with near-copies of
+them: retweets, posts with a link appended, re-punctuated posts and posts with a
+word added or dropped. The report gives the share of copies grouped with their
+original and the number of distinct posts wrongly merged.
+
+Usage: python -m benchmarks.bench_dedupe --tweets 1000 10000 50000
+"""
+import sys
+import json
+import time
+import random
+import argparse
+from typing import Dict, List, Any, Tuple
+
+from near_duplicates import NearDuplicateIndex, DEFAULT_THRESHOLD
+
+# Ways a post gets copied on a timeline, each turning a post into its near-duplicate
+MUTATIONS = {
+    "retweet": lambda post, rng: f"RT @user{rng.randint(1, 999)}: {post}",
+    "link": lambda post, rng: f"{post} https://t.co/{rng.getrandbits(40):x}",
+    "punctuation": lambda post, rng: post.upper().replace(" ", ", ", 1) + "!!",
+    "word_added": lambda post, rng: f"{post} {rng.choice(['agreed', 'wow', 'exactly', 'this'])}",
+    "word_dropped": lambda post, rng: " ".join(word for i, word in enumerate(post.split()) if i != 3),
+}
+
+
+def generate_timeline(count: int, duplicate_ratio: float, seed: int) -> Tuple[List[Dict[str, Any]], List[int], List[str]]:
+    """Return tweets, the index of the original each tweet copies (its own index if unique) and the mutation used"""
+    rng = random.Random(seed)
+    vocabulary = [f"w{number}" for number in range(5000)]
+    tweets, sources, kinds = [], [], []
+    for position in range(count):
+        if tweets and rng.random() < duplicate_ratio:
+            source = sources[rng.randrange(len(tweets))]
+            kind = rng.choice(list(MUTATIONS))
+            post = MUTATIONS[kind](tweets[source]["post"], rng)
+        else:
+            source, kind = position, "original"
+            post = " ".join(rng.choice(vocabulary) for _ in range(rng.randint(12, 40)))
+        likes = int(rng.paretovariate(1.2) * 20)
+        tweets.append({
+            "url": f"https://x.com/user{rng.randint(1, 5000)}/status/{1800000000000000000 + position}",
+            "post": post,
+            "stats": {"replies": likes // 10, "reposts": likes // 6, "likes": likes, "bookmarks": 0, "views": likes * 30},
+            "comments": [post],
+        })
+        sources.append(source)
+        kinds.append(kind)
+    return tweets, sources, kinds
+
+
+def run_once(count: int, args: argparse.Namespace) -> Dict[str, Any]:
+    tweets, sources, kinds = generate_timeline(count, args.duplicate_ratio, args.seed)
+    index = NearDuplicateIndex(threshold=args.threshold)
+
+    start = time.perf_counter()
+    groups = index.group(tweets)
+    elapsed = time.perf_counter() - start
+
+    group_of = {}
+    for number, group in enumerate(groups):
+        for member in group:
+            group_of[member] = number
+
+    found: Dict[str, List[int]] = {kind: [0, 0] for kind in MUTATIONS}
+    for position, (source, kind) in enumerate(zip(sources, kinds)):
+        if kind != "original":
+            found[kind][0] += group_of[position] == group_of[source]
+            found[kind][1] += 1
+    originals_per_group: Dict[int, int] = {}
+    for position, kind in enumerate(kinds):
+        if kind == "original":
+            originals_per_group[group_of[position]] = originals_per_group.get(group_of[position], 0) + 1
+
+    copies = sum(total for _, total in found.values())
+    return {
+        "tweets": count,
+        "groups": len(groups),
+        "seconds": round(elapsed, 3),
+        "microseconds_per_tweet": round(elapsed / count * 1e6, 1),
+        "recall": round(sum(hit for hit, _ in found.values()) / copies, 3) if copies else None,
+        "recall_by_mutation": {kind: round(hit / total, 3) for kind, (hit, total) in found.items() if total},
+        "originals_merged": sum(originals - 1 for originals in originals_per_group.values())
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark near-duplicate tweet grouping")
+    parser.add_argument("--tweets", type=int, nargs="+", default=[1000, 10000, 50000],
+                        help="Timeline sizes to measure (default: 1000 10000 50000)")
+    parser.add_argument("--duplicate-ratio", type=float, default=0.3,
+                        help="Share of tweets that copy an earlier one (default: 0.3)")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"Similarity above which posts are grouped (default: {DEFAULT_THRESHOLD})")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    print(f"{'tweets':>8} {'groups':>8} {'seconds':>8} {'us/tweet':>9} {'recall':>7} {'merged':>7}")
+    runs = []
+    for count in args.tweets:
+        run = run_once(count, args)
+        runs.append(run)
+        print(f"{run['tweets']:>8} {run['groups']:>8} {run['seconds']:>8.2f} {run['microseconds_per_tweet']:>9.1f} "
+              f"{run['recall']:>7.1%} {run['originals_merged']:>7}")
+    print("Recall by mutation: " + ", ".join(f"{kind} {share:.0%}" for kind, share in runs[-1]["recall_by_mutation"].items()))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"duplicate_ratio": args.duplicate_ratio, "threshold": args.threshold,
+                       "seed": args.seed, "runs": runs}, f, indent=2)
+        print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
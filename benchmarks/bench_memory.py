@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Tweet Memory Benchmark
+This script measures the memory a batch of tweets holds once it is loaded from
+data.json and half of it has been classified as tech, comparing plain dicts copied
+for every classified tweet (how the analyzer stored tweets before TweetRecord) with
+TweetRecords that receive their analysis in place. Memory is the size still
+allocated afterwards according to tracemalloc, so only what the analysis keeps
+alive is counted.
+
+Usage: python -m benchmarks.bench_memory --tweets 10000 --comments 40
+"""
+import sys
+import json
+import argparse
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List, Any, Callable
+
+from tweet_record import TweetRecord, as_record, intern_strings
+from tweet_stats import normalize_stats
+from twitter_analyzer import TweetAnalysis
+from benchmarks.synthetic_data import generate_tweets
+
+# Category labels the classifier returns, parsed into new strings for every tweet
+CATEGORIES = '["Artificial Intelligence", "Software Development", "Cloud Computing"]'
+
+
+def _analysis() -> TweetAnalysis:
+    return TweetAnalysis(is_technology_related=True, confidence_score=0.9,
+                         reasoning="Discusses a developer tool.", tech_categories=json.loads(CATEGORIES))
+
+
+def load_dicts(path: Path) -> List[Any]:
+    """Load tweets as dicts and attach analyses to copies, as the analyzer used to"""
+    with open(path, "r", encoding="utf-8") as f:
+        tweets = json.load(f)
+    for tweet in tweets:
+        tweet['stats'] = normalize_stats(tweet.get('stats'))
+
+    tech_tweets = []
+    for tweet in tweets[::2]:
+        tweet_with_analysis = tweet.copy()
+        tweet_with_analysis['tech_analysis'] = _analysis()
+        tech_tweets.append(tweet_with_analysis)
+    return [tweets, tech_tweets]
+
+
+def load_records(path: Path) -> List[Any]:
+    """Load tweets as TweetRecords and attach analyses in place, as the analyzer does now"""
+    with open(path, "r", encoding="utf-8") as f:
+        tweets = [TweetRecord.from_dict(tweet) for tweet in json.load(f)]
+
+    tech_tweets = []
+    for tweet in tweets[::2]:
+        analysis = _analysis()
+        analysis.tech_categories = intern_strings(analysis.tech_categories)
+        tweet = as_record(tweet)
+        tweet.tech_analysis = analysis
+        tech_tweets.append(tweet)
+    return [tweets, tech_tweets]
+
+
+def measure(load: Callable[[Path], List[Any]], path: Path) -> int:
+    """Return the bytes still allocated by ``load`` while its result is alive"""
+    tracemalloc.start()
+    result = load(path)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return retained
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare the memory held by tweet dicts and TweetRecords")
+    parser.add_argument("--tweets", type=int, default=10000, help="Number of synthetic tweets (default: 10000)")
+    parser.add_argument("--comments", type=int, default=40,
+                        help="Maximum comments scraped per synthetic tweet (default: 40)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    tweets = generate_tweets(args.tweets, seed=args.seed, max_comments=args.comments)
+    with tempfile.TemporaryDirectory() as scratch:
+        path = Path(scratch) / "data.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(tweets, f)
+        del tweets
+        results: Dict[str, int] = {"dicts": measure(load_dicts, path), "records": measure(load_records, path)}
+
+    print(f"{'storage':>8} {'MB':>8} {'bytes/tweet':>12}")
+    for name, retained in results.items():
+        print(f"{name:>8} {retained / 2 ** 20:>8.2f} {retained / args.tweets:>12.0f}")
+    saved = 1 - results["records"] / results["dicts"]
+    print(f"Records hold {saved:.0%} less memory")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"tweets": args.tweets, "max_comments": args.comments, "seed": args.seed,
+                       "retained_mb": {name: round(retained / 2 ** 20, 2) for name, retained in results.items()},
+                       "saved": round(saved, 3)}, f, indent=2)
+        print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Scraper Benchmark
+This script runs the real Playwright scraper (``fetch_tweets_async``) headless against
+the local x.com fixture server and reports tweets per second, page navigations and
+bytes transferred. With ``--baseline`` it exits non-zero on regressions.
+
+Requires Chromium for Playwright: python -m playwright install chromium
+Usage: python -m benchmarks.bench_scraper --tweets 50 --scrolls 3 --latency-ms 50 --concurrency 4
+"""
+import sys
+import json
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Any
+
+from twitter_wrapper import fetch_tweets_async, SCRAPE_CONCURRENCY
+from tweet_stats import normalize_stats
+from benchmarks.x_fixture_server import FixtureServer, FixtureTimeline, load_tweets
+
+# Throughput may drop and traffic may grow by this fraction before a run counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+
+def run_once(args: argparse.Namespace) -> Dict[str, Any]:
+    """Scrape the fixture site once and return the measurements"""
+    tweets = load_tweets(args.data, args.tweets, args.seed)
+    timeline = FixtureTimeline(tweets, page_size=args.page_size, max_pages=args.max_pages,
+                               latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, seed=args.seed)
+
+    with FixtureServer(timeline) as server, tempfile.TemporaryDirectory() as scratch:
+        data_path = Path(scratch) / "data.json"
+        scrape_stats: Dict[str, int] = {}
+        start = time.perf_counter()
+        asyncio.run(fetch_tweets_async(args.scrolls, base_url=server.base_url, headless=True,
+                                       stats=scrape_stats, data_path=data_path, concurrency=args.concurrency))
+        elapsed = time.perf_counter() - start
+
+        with open(data_path, "r", encoding="utf-8") as f:
+            scraped = json.load(f)
+        server_stats = timeline.stats()
+
+    # Every scraped tweet should match the fixture it came from
+    expected = {tweet["post"]: tweet for tweet in tweets}
+    mismatches = sum(1 for tweet in scraped if tweet["post"] not in expected
+                     or tweet["comments"] != expected[tweet["post"]]["comments"]
+                     or tweet["stats"] != normalize_stats(expected[tweet["post"]].get("stats")))
+
+    return {
+        "seconds": round(elapsed, 3),
+        "tweets": len(scraped),
+        "tweets_per_second": round(len(scraped) / elapsed, 3) if elapsed else 0.0,
+        "navigations": scrape_stats["navigations"],
+        "scrolls": scrape_stats["scrolls"],
+        "urls_found": scrape_stats["urls_found"],
+        "failed_pages": scrape_stats["failed"],
+        "requests": server_stats["total_requests"],
+        "requests_by_route": server_stats["requests"],
+        "bytes_transferred": server_stats["bytes_sent"],
+        "mismatched_tweets": mismatches
+    }
+
+
+def find_regressions(run: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Compare a run with a previous report and describe every regression found"""
+    before = baseline.get("run", {})
+    regressions = []
+    if before.get("tweets_per_second") and run["tweets_per_second"] < before["tweets_per_second"] * (1 - tolerance):
+        regressions.append(f"throughput {run['tweets_per_second']} < {before['tweets_per_second']} tweets/s")
+    if before.get("navigations") is not None and run["navigations"] > before["navigations"]:
+        regressions.append(f"{run['navigations']} navigations > {before['navigations']}")
+    if before.get("bytes_transferred") and run["bytes_transferred"] > before["bytes_transferred"] * (1 + tolerance):
+        regressions.append(f"{run['bytes_transferred']} bytes > {before['bytes_transferred']}")
+    if run["mismatched_tweets"]:
+        regressions.append(f"{run['mismatched_tweets']} scraped tweets do not match the fixture")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the Playwright scraper against a local x.com fixture")
+    parser.add_argument("--data", help="Recorded data.json to serve (default: synthetic tweets)")
+    parser.add_argument("--tweets", type=int, default=50, help="Synthetic tweets on the timeline (default: 50)")
+    parser.add_argument("--scrolls", type=int, default=3, help="Timeline scrolls, as in the app (default: 3)")
+    parser.add_argument("--concurrency", type=int, default=SCRAPE_CONCURRENCY,
+                        help=f"Status pages fetched at once (default: {SCRAPE_CONCURRENCY})")
+    parser.add_argument("--page-size", type=int, default=10, help="Tweets per timeline page (default: 10)")
+    parser.add_argument("--max-pages", type=int, help="End the timeline after this many pages")
+    parser.add_argument("--latency-ms", type=float, default=50, help="Delay added to every response (default: 50)")
+    parser.add_argument("--jitter-ms", type=float, default=20, help="Random +/- variation of the delay (default: 20)")
+    parser.add_argument("--seed", type=int, default=0, help="Seed for the tweets and latency jitter (default: 0)")
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    parser.add_argument("--baseline", help="Previous report to compare against; regressions exit with status 1")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Allowed throughput drop and traffic growth (default: {DEFAULT_TOLERANCE})")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+
+    run = run_once(args)
+    print(f"Scraped {run['tweets']} tweets in {run['seconds']:.1f}s ({run['tweets_per_second']:.2f} tweets/s)")
+    print(f"Navigations: {run['navigations']}, failed pages: {run['failed_pages']}, requests: {run['requests']}, "
+          f"bytes transferred: {run['bytes_transferred']}, mismatched tweets: {run['mismatched_tweets']}")
+
+    report = {key: getattr(args, key) for key in ("tweets", "scrolls", "concurrency", "page_size", "latency_ms", "jitter_ms", "seed")}
+    report["run"] = run
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = find_regressions(run, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Startup Benchmark
+This script measures how long a fresh process takes to import the web app and to
+answer its first requests, using Flask's test client so no server or network is
+needed. Each run is a new interpreter started with ``python -X importtime``, so the
+report also lists the slowest modules imported by app.py. With ``--baseline`` it exits
+non-zero when startup got slower than allowed.
+
+Usage: python -m benchmarks.bench_startup --runs 5 --paths / /restart /metrics
+"""
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Any
+
+# Startup may get this much slower before a run counts as a regression
+DEFAULT_TOLERANCE = 0.25
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Runs in the fresh interpreter and prints its timings as JSON on stdout
+CHILD_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+client = app.app.test_client()
+responses = {}
+for path in sys.argv[1:]:
+    before = time.perf_counter()
+    status = client.get(path).status_code
+    responses[path] = {"status": status, "seconds": time.perf_counter() - before}
+print(json.dumps({"import_seconds": imported - start, "responses": responses,
+                  "analyzer_built": app.twitter_analyzer is not None}))
+"""
+
+
+def parse_importtime(stderr: str, parent: str = "app") -> Dict[str, float]:
+    """Return the cumulative import time in seconds of each module ``parent`` imports directly
+
+    In -X importtime output a module is listed after the imports it triggered, indented
+    two spaces deeper than the module that imported it.
+    """
+    modules = {}
+    pending = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 0:
+            if name.strip() == parent:
+                modules.update(pending)
+            pending = []
+        elif depth == 1:
+            pending.append((name.strip(), int(cumulative) / 1e6))
+    return modules
+
+
+def run_once(paths: List[str]) -> Dict[str, Any]:
+    """Start a fresh interpreter, import the app and request ``paths`` once each"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", CHILD_SCRIPT, *paths],
+        cwd=ROOT, capture_output=True, text=True, env={**os.environ, "PYTHONPATH": str(ROOT)}
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Startup run failed:\n{result.stderr[-2000:]}")
+    timings = json.loads(result.stdout.strip().splitlines()[-1])
+    timings["imports"] = parse_importtime(result.stderr)
+    return timings
+
+
+def summarize(runs: List[Dict[str, Any]], paths: List[str], top: int) -> Dict[str, Any]:
+    """Take the median of every measurement across runs"""
+    imports: Dict[str, List[float]] = {}
+    for run in runs:
+        for name, seconds in run["imports"].items():
+            imports.setdefault(name, []).append(seconds)
+    slowest = sorted(((name, statistics.median(values)) for name, values in imports.items()),
+                     key=lambda item: item[1], reverse=True)[:top]
+
+    return {
+        "import_seconds": round(statistics.median(run["import_seconds"] for run in runs), 4),
+        "first_response_seconds": {
+            path: round(statistics.median(run["responses"][path]["seconds"] for run in runs), 4) for path in paths
+        },
+        "status_codes": {path: runs[-1]["responses"][path]["status"] for path in paths},
+        "analyzer_built_at_startup": any(run["analyzer_built"] for run in runs),
+        "slowest_imports": [{"module": name, "seconds": round(seconds, 4)} for name, seconds in slowest]
+    }
+
+
+def find_regressions(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Compare a report with a previous one and describe every regression found"""
+    regressions = []
+    if report["import_seconds"] > baseline["import_seconds"] * (1 + tolerance):
+        regressions.append(f"import: {report['import_seconds']}s > {baseline['import_seconds']}s")
+    for path, seconds in report["first_response_seconds"].items():
+        before = baseline.get("first_response_seconds", {}).get(path)
+        if before is not None and seconds > before * (1 + tolerance):
+            regressions.append(f"first response to {path}: {seconds}s > {before}s")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark web app import and first-response time")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to start (default: 5)")
+    parser.add_argument("--paths", nargs="+", default=["/", "/restart", "/metrics"],
+                        help="Routes requested after the import, in order (default: / /restart /metrics)")
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to list (default: 10)")
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    parser.add_argument("--baseline", help="Previous report to compare against; regressions exit with status 1")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help=f"Allowed slowdown (default: {DEFAULT_TOLERANCE})")
+    args = parser.parse_args()
+
+    runs = [run_once(args.paths) for _ in range(max(1, args.runs))]
+    report = summarize(runs, args.paths, args.top)
+
+    print(f"Import app: {report['import_seconds'] * 1000:.0f} ms (median of {len(runs)} runs)")
+    for path, seconds in report["first_response_seconds"].items():
+        print(f"First GET {path}: {seconds * 1000:.1f} ms (status {report['status_codes'][path]})")
+    print(f"Analyzer built at startup: {'yes' if report['analyzer_built_at_startup'] else 'no'}")
+    print("Slowest imports made by app.py:")
+    for entry in report["slowest_imports"]:
+        print(f"  {entry['seconds'] * 1000:>8.1f} ms  {entry['module']}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = find_regressions(report, baseline, args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Pre-ranker Comparison
+This script measures how well the local engagement pre-ranker picks the tweets the
+LLM engagement scorer would rate highest. The labeled sample is every tweet in
+data.json with an engagement score in analysis_cache.db; ``--score`` first scores
+the tech tweets that are missing one, which costs API calls.
+
+Usage: python -m benchmarks.compare_preranker --shortlist 5 10 20
+"""
+import sys
+import json
+import asyncio
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Any, Tuple
+
+from agents import set_tracing_disabled
+
+from twitter_analyzer import TwitterAnalyzer, TweetData, DEFAULT_TOP_K
+from engagement_preranker import EngagementPreRanker, compare_with_scores
+from analysis_cache import AnalysisCache
+from benchmarks.fake_model import FakeModelProvider
+
+
+def labeled_sample(analyzer: TwitterAnalyzer, tweets: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[float]]:
+    """Return the tweets with a cached engagement score, and those scores"""
+    sample, scores = [], []
+    for tweet in tweets:
+        engagement = analyzer.cache.get(analyzer.engagement_scorer, tweet)
+        if engagement is not None:
+            sample.append(tweet)
+            scores.append(engagement.engagement_potential)
+    return sample, scores
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Compare pre-ranker shortlists with LLM engagement scores")
+    parser.add_argument("--data", default="data.json", help="Scraped tweets to evaluate (default: data.json)")
+    parser.add_argument("--shortlist", type=int, nargs="+", default=[5, 10, 20],
+                        help="Shortlist sizes to evaluate (default: 5 10 20)")
+    parser.add_argument("--k", type=int, default=DEFAULT_TOP_K,
+                        help=f"Size of the LLM top list the shortlist should keep (default: {DEFAULT_TOP_K})")
+    parser.add_argument("--score", action="store_true",
+                        help="Classify and score tweets missing from the cache before comparing (uses the API)")
+    parser.add_argument("--fake", action="store_true",
+                        help="Score with the offline fake model and a scratch cache; checks the script, not the ranker")
+    parser.add_argument("--concurrency", type=int, default=5, help="Agent calls in flight with --score (default: 5)")
+    parser.add_argument("--output", help="Write the report as JSON to this path")
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    tweets = TweetData(args.data).get_tweets()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        if args.fake:
+            set_tracing_disabled(True)
+            analyzer = TwitterAnalyzer(cache=AnalysisCache(path=Path(scratch) / "analysis_cache.db"),
+                                       model_provider=FakeModelProvider())
+        else:
+            analyzer = TwitterAnalyzer(cache=AnalysisCache())
+
+        if args.score or args.fake:
+            # Full scoring: every tech tweet goes to the scorer and the results land in the cache
+            asyncio.run(analyzer.classify_and_score(
+                tweets, max_concurrency=args.concurrency, k=len(tweets),
+                analysis_mode="two_stage", pipelined=False
+            ))
+        sample, scores = labeled_sample(analyzer, tweets)
+
+    if not sample:
+        print("No tweets in the sample have a cached engagement score; run an analysis or pass --score")
+        return 1
+
+    report = compare_with_scores(EngagementPreRanker(), sample, scores, args.shortlist, k=args.k)
+    print(f"\nLabeled sample: {report['sample_size']} tweets, mean LLM score {report['mean_llm_score']}, "
+          f"Spearman correlation {report['spearman']}")
+    print(f"{'shortlist':>9} {'calls saved':>11} {'top-' + str(args.k) + ' recall':>13} {'best kept':>9} {'mean score':>10}")
+    for entry in report["shortlists"]:
+        print(f"{entry['size']:>9} {entry['scorer_calls_saved']:>11} {entry['top_k_recall']:>13.0%} "
+              f"{'yes' if entry['best_kept'] else 'no':>9} {entry['mean_llm_score']!s:>10}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Report written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Fake Model Module
+This module provides an offline stand-in for the OpenAI models used by TwitterAnalyzer.
+It returns schema-valid structured outputs after a seeded, log-normally distributed
+delay and can inject rate-limit and server errors, so analysis runs are reproducible
+and cost nothing.
+"""
+import re
+import json
+import time
+import random
+import asyncio
+import hashlib
+import threading
+from typing import Dict, List, Optional, Tuple, Any, get_args, get_origin, Literal
+
+from pydantic import BaseModel
+from openai.types.responses import (
+    Response, ResponseCompletedEvent, ResponseOutputMessage, ResponseOutputText, ResponseUsage
+)
+from agents.items import ModelResponse
+from agents.usage import Usage
+from agents.models.interface import Model, ModelProvider
+
+from tech_prefilter import TechPrefilter
+from prompt_builder import count_tokens
+
+# Median latency and log-normal sigma in seconds, keyed by output type name ("text" for plain output)
+DEFAULT_LATENCIES = {
+    "TweetAnalysis": (0.8, 0.4),
+    "TweetAnalysisBatch": (2.5, 0.4),
+    "EngagementScore": (1.2, 0.4),
+    "TweetAssessment": (1.5, 0.4),
+    "NewsAnalysisBatch": (1.5, 0.4),
+    "TweetReply": (2.0, 0.5),
+    "TweetReplyVariants": (2.6, 0.5),
+    "text": (4.0, 0.5),
+}
+FALLBACK_LATENCY = (1.0, 0.4)
+
+# Splits a batched prompt into its "[index]" entries
+ENTRY_PATTERN = re.compile(r"^\s*\[(\d+)\]", re.MULTILINE)
+
+# Number of drafts a variant generator prompt asks for
+VARIANTS_PATTERN = re.compile(r"Write (\d+) variants")
+
+SEARCH_HEADLINES = [
+    "OpenAI launches a new reasoning model for enterprise developers",
+    "Startup raises $40M Series B to build GPU cloud for AI inference",
+    "Major cloud provider announces price cuts on serverless compute",
+    "Security researchers disclose critical vulnerability in popular open-source library",
+    "Big tech company reveals plans to open source its internal developer tools",
+    "Chipmaker introduces new AI accelerator to compete with Nvidia",
+]
+
+
+class FakeAPIError(Exception):
+    """Simulated API failure carrying an HTTP status code like the OpenAI client errors"""
+
+    def __init__(self, status_code: int):
+        super().__init__(f"Simulated API error (HTTP {status_code})")
+        self.status_code = status_code
+
+
+class FakeModel(Model):
+    """Model that fabricates plausible outputs for whatever output schema it is given"""
+
+    def __init__(self, provider: "FakeModelProvider", model_name: Optional[str]):
+        self.provider = provider
+        self.model_name = model_name
+
+    async def get_response(self, system_instructions, input, model_settings, tools, output_schema,
+                           handoffs, tracing, *, previous_response_id=None, conversation_id=None,
+                           prompt=None) -> ModelResponse:
+        text = input if isinstance(input, str) else _input_text(input)
+        output_type = getattr(output_schema, "output_type", None) if output_schema is not None else None
+        kind = output_type.__name__ if isinstance(output_type, type) else "text"
+
+        rng = self.provider.rng_for(kind, text)
+        await asyncio.sleep(self.provider.sample_latency(kind, rng))
+        error = self.provider.sample_error(rng)
+        if error is not None:
+            raise error
+
+        if isinstance(output_type, type) and issubclass(output_type, BaseModel):
+            output_text = fabricate(output_type, text, rng).model_dump_json()
+        else:
+            output_text = "\n".join(rng.sample(SEARCH_HEADLINES, 3))
+
+        input_tokens = count_tokens((system_instructions or "") + text)
+        output_tokens = count_tokens(output_text)
+        message = ResponseOutputMessage(
+            id="fake-message",
+            type="message",
+            role="assistant",
+            status="completed",
+            content=[ResponseOutputText(type="output_text", text=output_text, annotations=[])]
+        )
+        usage = Usage(requests=1, input_tokens=input_tokens, output_tokens=output_tokens,
+                      total_tokens=input_tokens + output_tokens)
+        return ModelResponse(output=[message], usage=usage, response_id=None)
+
+    async def stream_response(self, system_instructions, input, model_settings, tools, output_schema,
+                              handoffs, tracing, *, previous_response_id=None, conversation_id=None,
+                              prompt=None):
+        """Yield the ``get_response`` result as one completed event, so streamed runs work offline too
+
+        Text deltas are not emitted; the whole output arrives after the sampled delay.
+        """
+        result = await self.get_response(system_instructions, input, model_settings, tools, output_schema,
+                                         handoffs, tracing, previous_response_id=previous_response_id,
+                                         conversation_id=conversation_id, prompt=prompt)
+        usage = ResponseUsage.model_construct(
+            input_tokens=result.usage.input_tokens, output_tokens=result.usage.output_tokens,
+            total_tokens=result.usage.total_tokens, input_tokens_details=result.usage.input_tokens_details,
+            output_tokens_details=result.usage.output_tokens_details
+        )
+        response = Response.model_construct(
+            id="fake-response", object="response", created_at=time.time(), model=self.model_name or "fake",
+            output=result.output, usage=usage, status="completed", tool_choice="auto", tools=[],
+            parallel_tool_calls=False
+        )
+        yield ResponseCompletedEvent.model_construct(type="response.completed", sequence_number=0, response=response)
+
+
+class FakeModelProvider(ModelProvider):
+    """Hands out FakeModels sharing one seeded latency and error configuration
+
+    Randomness is derived from the seed, the prompt and how many times that prompt
+    has been sent, so a run produces the same outputs, delays and failures no
+    matter how calls interleave. ``time_scale`` multiplies every delay.
+    """
+
+    def __init__(self, seed: int = 0, latencies: Optional[Dict[str, Tuple[float, float]]] = None,
+                 time_scale: float = 1.0, error_rate: float = 0.0, rate_limit_share: float = 0.8):
+        self.seed = seed
+        self.latencies = dict(DEFAULT_LATENCIES)
+        self.latencies.update(latencies or {})
+        self.time_scale = time_scale
+        self.error_rate = error_rate
+        self.rate_limit_share = rate_limit_share
+        self._attempts: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get_model(self, model_name: Optional[str]) -> Model:
+        return FakeModel(self, model_name)
+
+    def rng_for(self, kind: str, text: str) -> random.Random:
+        """Return a random generator unique to this seed, prompt and attempt"""
+        digest = hashlib.sha256(f"{self.seed}\0{kind}\0{text}".encode("utf-8")).hexdigest()
+        with self._lock:
+            attempt = self._attempts.get(digest, 0)
+            self._attempts[digest] = attempt + 1
+        return random.Random(f"{digest}:{attempt}")
+
+    def sample_latency(self, kind: str, rng: random.Random) -> float:
+        median, sigma = self.latencies.get(kind, FALLBACK_LATENCY)
+        return rng.lognormvariate(0, sigma) * median * self.time_scale
+
+    def sample_error(self, rng: random.Random) -> Optional[FakeAPIError]:
+        if rng.random() >= self.error_rate:
+            return None
+        return FakeAPIError(429 if rng.random() < self.rate_limit_share else 500)
+
+
+# Shared keyword model used to decide whether fabricated classifications say "tech"
+_keywords = TechPrefilter()
+
+
+def fabricate(model_type: type, text: str, rng: random.Random, index: int = 0) -> BaseModel:
+    """Build an instance of ``model_type`` whose values are plausible for ``text``
+
+    Lists of models with an ``index`` field get one entry per "[index]" block in the
+    prompt, which is how batched prompts are laid out. Other lists of models get as
+    many entries as a "Write N variants" prompt asks for.
+    """
+    is_tech = bool(_keywords.matched_categories(text))
+    values: Dict[str, Any] = {}
+    for name, field in model_type.model_fields.items():
+        annotation = field.annotation
+        origin = get_origin(annotation)
+        if annotation is bool:
+            values[name] = is_tech
+        elif annotation is int:
+            values[name] = index
+        elif annotation is float:
+            if "confidence" in name:
+                values[name] = round(rng.uniform(0.75, 0.99), 2)
+            else:
+                values[name] = round(rng.uniform(3, 9.5) if is_tech else rng.uniform(0, 4), 1)
+        elif origin is Literal:
+            values[name] = rng.choice(get_args(annotation))
+        elif origin in (list, List):
+            item_type = get_args(annotation)[0]
+            if isinstance(item_type, type) and issubclass(item_type, BaseModel) and "index" in item_type.model_fields:
+                values[name] = [fabricate(item_type, entry, rng, entry_index)
+                                for entry_index, entry in _split_entries(text)]
+            elif isinstance(item_type, type) and issubclass(item_type, BaseModel):
+                match = VARIANTS_PATTERN.search(text)
+                values[name] = [fabricate(item_type, text, rng, variant)
+                                for variant in range(int(match.group(1)) if match else 1)]
+            elif "categor" in name:
+                values[name] = _keywords.matched_categories(text) or ["General"]
+            else:
+                values[name] = rng.sample(["timely topic", "strong opinion", "active replies",
+                                           "well-known author", "practical insight"], 2)
+        elif "text" in name:
+            values[name] = "Shipping beats planning. The teams that win here iterate in public."
+            if index:
+                values[name] += f" Take {index + 1}."
+        else:
+            values[name] = f"Synthetic {name.replace('_', ' ')}"
+    return model_type(**values)
+
+
+def _split_entries(text: str) -> List[Tuple[int, str]]:
+    """Return (index, text) for each "[index]" block, or the whole text as entry 0"""
+    matches = list(ENTRY_PATTERN.finditer(text))
+    if not matches:
+        return [(0, text)]
+    return [
+        (int(match.group(1)), text[match.end():matches[position + 1].start() if position + 1 < len(matches) else len(text)])
+        for position, match in enumerate(matches)
+    ]
+
+
+def _input_text(items: List[Any]) -> str:
+    """Flatten Responses-format input items into plain text"""
+    parts = []
+    for item in items:
+        content = item.get("content") if isinstance(item, dict) else getattr(item, "content", None)
+        if isinstance(content, str):
+            parts.append(content)
+        elif isinstance(content, list):
+            parts.extend(str(part.get("text", "")) if isinstance(part, dict) else str(part) for part in content)
+        else:
+            parts.append(json.dumps(item, default=str))
+    return "\n".join(parts)
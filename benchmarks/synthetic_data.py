@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Synthetic Data Module
+This module generates tweets shaped like the scraper's data.json output, so the
+analyzer can be exercised at any scale without touching Twitter/X.
+"""
+import json
+import random
+import argparse
+from typing import Dict, List, Any
+
+TECH_TEMPLATES = [
+    "Hot take: most {topic} teams would ship faster with half the {thing}.",
+    "We just moved our {thing} to {tool} and cut costs by {number}%. Thread on what broke.",
+    "Every {topic} founder I talk to is rethinking {thing} this quarter.",
+    "The best {topic} engineers I know spend more time deleting {thing} than writing it.",
+    "{tool} is quietly becoming the default for {topic}. Curious who is still holding out.",
+    "Raised our seed round to build better {thing} for {topic}. Hiring engineers now.",
+]
+TECH_TOPICS = ["AI", "LLM", "startup", "SaaS", "cloud", "security", "developer", "GPU", "open-source"]
+TECH_THINGS = ["code", "infrastructure", "APIs", "models", "frontend frameworks", "database migrations",
+               "kubernetes clusters", "inference costs", "backend services"]
+TECH_TOOLS = ["Python", "Rust", "TypeScript", "AWS", "Kubernetes", "GitHub Actions", "Postgres", "Nvidia GPUs"]
+
+OTHER_TEMPLATES = [
+    "What a {event} last night. The {team} never stop surprising me.",
+    "Can't believe this {event} is already sold out. Anyone have a spare ticket?",
+    "Trying a new {food} recipe this weekend, wish me luck lol",
+    "That {event} ending was unreal. Still thinking about it.",
+    "Happy birthday to my favourite {person}! Wedding photos coming soon.",
+]
+OTHER_EVENTS = ["football match", "concert", "movie", "playoffs game", "album release", "election debate"]
+OTHER_TEAMS = ["home side", "underdogs", "champions", "league leaders"]
+OTHER_FOODS = ["pasta", "curry", "sourdough", "taco", "dessert"]
+OTHER_PEOPLE = ["sister", "coach", "best friend", "neighbour"]
+
+COMMENT_TEMPLATES = [
+    "Totally agree with this.",
+    "Strong disagree, we tried this and it was a mess.",
+    "This is the way.",
+    "Source?",
+    "Saving this for later.",
+    "Underrated point about {word}.",
+    "Curious how this plays out with {word} at scale.",
+    "lol same",
+]
+
+
+def generate_tweets(count: int, seed: int = 0, tech_ratio: float = 0.5,
+                    max_comments: int = 12) -> List[Dict[str, Any]]:
+    """Return ``count`` tweets with url, post, stats and comments fields
+
+    As in scraped data, the first comment repeats the post text. Roughly
+    ``tech_ratio`` of the tweets are about technology.
+    """
+    rng = random.Random(seed)
+    tweets = []
+    for position in range(count):
+        if rng.random() < tech_ratio:
+            post = rng.choice(TECH_TEMPLATES).format(
+                topic=rng.choice(TECH_TOPICS), thing=rng.choice(TECH_THINGS),
+                tool=rng.choice(TECH_TOOLS), number=rng.randint(10, 80)
+            )
+        else:
+            post = rng.choice(OTHER_TEMPLATES).format(
+                event=rng.choice(OTHER_EVENTS), team=rng.choice(OTHER_TEAMS),
+                food=rng.choice(OTHER_FOODS), person=rng.choice(OTHER_PEOPLE)
+            )
+
+        words = [word.strip(".,!?") for word in post.split() if len(word) > 4] or ["this"]
+        comments = [post] + [
+            rng.choice(COMMENT_TEMPLATES).format(word=rng.choice(words))
+            for _ in range(rng.randint(0, max_comments))
+        ]
+
+        likes = int(rng.paretovariate(1.2) * 20)
+        tweets.append({
+            "url": f"https://x.com/user{rng.randint(1, 5000)}/status/{1800000000000000000 + position}",
+            "post": post,
+            "stats": {"replies": likes // 10, "reposts": likes // 6, "likes": likes,
+                      "bookmarks": likes // 20, "views": likes * rng.randint(20, 60)},
+            "comments": comments,
+        })
+    return tweets
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a synthetic data.json for offline analysis runs")
+    parser.add_argument("--count", type=int, default=1000, help="Number of tweets to generate (default: 1000)")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed (default: 0)")
+    parser.add_argument("--tech-ratio", type=float, default=0.5, help="Share of tech tweets (default: 0.5)")
+    parser.add_argument("--output", default="data.json", help="Where to write the tweets (default: data.json)")
+    args = parser.parse_args()
+
+    tweets = generate_tweets(args.count, seed=args.seed, tech_ratio=args.tech_ratio)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(tweets, f, indent=2)
+    print(f"Wrote {len(tweets)} synthetic tweets to {args.output}")
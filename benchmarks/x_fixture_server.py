@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+X Fixture Server
+This module serves recorded tweets as a minimal imitation of the x.com home timeline
+and status pages, using the same data-testid markup the scraper looks for. Latency
+and infinite-scroll behaviour are configurable, and the server counts the requests
+and bytes it serves.
+"""
+import json
+import time
+import random
+import argparse
+import threading
+from html import escape
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Any
+
+from tweet_stats import stats_label
+from benchmarks.synthetic_data import generate_tweets
+
+TIMELINE_PAGE = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>Home / X</title></head>
+<body>
+<main>
+<div aria-label="Timeline: Your Home Timeline"><div id="timeline">{articles}</div></div>
+<div id="loader" style="height: 2000px"></div>
+</main>
+<script>
+let cursor = {next_cursor};
+let loading = false;
+window.addEventListener("scroll", async () => {{
+    if (loading || cursor === null) return;
+    if (window.innerHeight + window.scrollY < document.body.scrollHeight - 2500) return;
+    loading = true;
+    const response = await fetch("/i/api/timeline?cursor=" + cursor);
+    const page = await response.json();
+    document.getElementById("timeline").insertAdjacentHTML("beforeend", page.html);
+    cursor = page.next_cursor;
+    loading = false;
+}});
+</script>
+</body></html>"""
+
+TIMELINE_ARTICLE = """<article data-testid="tweet">
+<div data-testid="User-Name"><a href="/{user}">{user}</a> <a href="/{user}/status/{status_id}">1h</a></div>
+<div data-testid="tweetText">{text}</div>
+</article>"""
+
+STATUS_PAGE = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{user} on X</title></head>
+<body><main>
+<article data-testid="tweet">
+<div data-testid="User-Name"><a href="/{user}">{user}</a></div>
+<div data-testid="tweetText">{text}</div>
+<div role="group" aria-label="{stats}"></div>
+</article>
+{replies}
+<div style="height: 3000px"></div>
+</main></body></html>"""
+
+REPLY_ARTICLE = """<article data-testid="tweet"><div data-testid="tweetText">{text}</div></article>"""
+
+
+class FixtureTimeline:
+    """Recorded tweets plus the rules for paging through them"""
+
+    def __init__(self, tweets: List[Dict[str, Any]], page_size: int = 10, max_pages: Optional[int] = None,
+                 latency_ms: float = 0.0, jitter_ms: float = 0.0, seed: int = 0):
+        self.tweets = tweets
+        self.page_size = max(1, page_size)
+        self.max_pages = max_pages
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rng = random.Random(seed)
+        self.by_status = {}
+        for position, tweet in enumerate(tweets):
+            user, status_id = _status_parts(tweet.get("url", ""), position)
+            self.by_status[status_id] = (user, tweet)
+        self.requests: Dict[str, int] = {}
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+
+    def page(self, cursor: int) -> Dict[str, Any]:
+        """Render one timeline page; next_cursor is None once the timeline ends"""
+        start = cursor * self.page_size
+        chunk = self.tweets[start:start + self.page_size]
+        last_page = self.max_pages is not None and cursor + 1 >= self.max_pages
+        has_more = start + self.page_size < len(self.tweets) and not last_page
+        articles = []
+        for position, tweet in enumerate(chunk, start):
+            user, status_id = _status_parts(tweet.get("url", ""), position)
+            articles.append(TIMELINE_ARTICLE.format(user=escape(user), status_id=status_id, text=escape(tweet["post"])))
+        return {"html": "\n".join(articles), "next_cursor": cursor + 1 if has_more else None}
+
+    def delay(self) -> None:
+        """Sleep for the configured latency plus jitter"""
+        with self._lock:
+            seconds = max(0.0, self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+        if seconds:
+            time.sleep(seconds)
+
+    def record(self, route: str, size: int) -> None:
+        with self._lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+            self.bytes_sent += size
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"requests": dict(self.requests), "total_requests": sum(self.requests.values()),
+                    "bytes_sent": self.bytes_sent}
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Serves /home, /i/api/timeline and /<user>/status/<id> from the server's timeline"""
+
+    def do_GET(self):
+        timeline: FixtureTimeline = self.server.timeline
+        timeline.delay()
+        url = urlparse(self.path)
+        parts = [part for part in url.path.split("/") if part]
+
+        if url.path == "/home":
+            first = timeline.page(0)
+            next_cursor = "null" if first["next_cursor"] is None else str(first["next_cursor"])
+            self._send("timeline", "text/html", TIMELINE_PAGE.format(articles=first["html"], next_cursor=next_cursor))
+        elif url.path == "/i/api/timeline":
+            cursor = int(parse_qs(url.query).get("cursor", ["0"])[0])
+            self._send("timeline_api", "application/json", json.dumps(timeline.page(cursor)))
+        elif len(parts) == 3 and parts[1] == "status" and parts[2] in timeline.by_status:
+            user, tweet = timeline.by_status[parts[2]]
+            # Scraped comments start with the post itself, which the page renders as the main tweet
+            comments = tweet.get("comments", [])
+            replies = comments[1:] if comments and comments[0] == tweet["post"] else comments
+            self._send("status", "text/html", STATUS_PAGE.format(
+                user=escape(user), text=escape(tweet["post"]), stats=escape(stats_label(tweet.get("stats"))),
+                replies="\n".join(REPLY_ARTICLE.format(text=escape(reply)) for reply in replies)
+            ))
+        else:
+            self._send("not_found", "text/plain", "Not found", status=404)
+
+    def _send(self, route: str, content_type: str, body: str, status: int = 200) -> None:
+        payload = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+        self.server.timeline.record(route, len(payload))
+
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """Runs the fixture site on a background thread; use as a context manager"""
+
+    def __init__(self, timeline: FixtureTimeline, host: str = "127.0.0.1", port: int = 0):
+        self.timeline = timeline
+        self.httpd = ThreadingHTTPServer((host, port), FixtureHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.timeline = timeline
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FixtureServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="x-fixture-server", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "FixtureServer":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+
+def _status_parts(url: str, position: int):
+    """Return (user, status id) from a status URL, inventing them if the URL is unusable"""
+    parts = [part for part in urlparse(url).path.split("/") if part]
+    if len(parts) >= 3 and parts[1] == "status":
+        return parts[0], parts[2]
+    return "fixture_user", str(position)
+
+
+def load_tweets(path: Optional[str], count: int, seed: int) -> List[Dict[str, Any]]:
+    """Load recorded tweets from a data.json file, or generate synthetic ones"""
+    if path:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    return generate_tweets(count, seed=seed)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve recorded tweets as a local x.com fixture")
+    parser.add_argument("--data", help="Recorded data.json to serve (default: synthetic tweets)")
+    parser.add_argument("--tweets", type=int, default=100, help="Synthetic tweets to serve (default: 100)")
+    parser.add_argument("--page-size", type=int, default=10, help="Tweets per timeline page (default: 10)")
+    parser.add_argument("--max-pages", type=int, help="End the timeline after this many pages")
+    parser.add_argument("--latency-ms", type=float, default=0, help="Delay added to every response (default: 0)")
+    parser.add_argument("--jitter-ms", type=float, default=0, help="Random +/- variation of the delay (default: 0)")
+    parser.add_argument("--port", type=int, default=8765, help="Port to listen on (default: 8765)")
+    args = parser.parse_args()
+
+    fixture = FixtureTimeline(load_tweets(args.data, args.tweets, 0), page_size=args.page_size,
+                              max_pages=args.max_pages, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms)
+    server = FixtureServer(fixture, port=args.port)
+    print(f"Serving {len(fixture.tweets)} tweets at {server.base_url}/home (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
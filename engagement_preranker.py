@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+Engagement Pre-ranker Module
+This module scores the engagement potential of a whole batch of scraped tweets at
+once from their stats, comment count and text length with NumPy, so only a short
+list of the most promising tech tweets has to be sent to the LLM engagement scorer.
+"""
+from typing import Dict, List, Optional, Any, Sequence
+
+import numpy as np
+
+from tweet_stats import normalize_stats
+
+# Features computed for every tweet, in column order
+FEATURES = ("volume", "engagement_rate", "discussion", "comments", "length")
+
+# Weight of each standardized feature in the pre-rank score
+DEFAULT_WEIGHTS = {
+    "volume": 1.0,           # log of likes, reposts, replies and bookmarks combined
+    "engagement_rate": 0.8,  # interactions per view
+    "discussion": 0.6,       # replies per like: tweets people argue with are easy to join
+    "comments": 0.5,         # log of the scraped comment count
+    "length": 0.2,           # closeness to a medium-length tweet
+}
+
+# Post length in characters that the length feature favours
+PREFERRED_LENGTH = 140
+
+
+class EngagementPreRanker:
+    """Weighted sum of batch-standardized engagement features"""
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None):
+        weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        unknown = set(weights) - set(FEATURES)
+        if unknown:
+            raise ValueError(f"Unknown pre-ranker features: {', '.join(sorted(unknown))}")
+        self.weights = np.array([weights[feature] for feature in FEATURES], dtype=float)
+
+    def features(self, tweets: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """Return an (n tweets, n features) matrix of raw features"""
+        stats = [normalize_stats(tweet.get('stats')) for tweet in tweets]
+        replies, reposts, likes, bookmarks, views = (
+            np.array([tweet_stats[field] for tweet_stats in stats], dtype=float)
+            for field in ("replies", "reposts", "likes", "bookmarks", "views")
+        )
+        # The first scraped comment is the post itself; records also count comments beyond their storage cap
+        comments = np.array([max(0, tweet.get('comment_count', len(tweet.get('comments') or [])) - 1)
+                             for tweet in tweets], dtype=float)
+        length = np.array([len(tweet.get('post') or "") for tweet in tweets], dtype=float)
+
+        interactions = likes + reposts + replies + bookmarks
+        with np.errstate(divide="ignore", invalid="ignore"):
+            # Views are missing on some tweets; those get the batch median rate instead of infinity
+            engagement_rate = np.where(views > 0, interactions / views, np.nan)
+        if np.isnan(engagement_rate).all():
+            engagement_rate[:] = 0.0
+        else:
+            engagement_rate[np.isnan(engagement_rate)] = np.nanmedian(engagement_rate)
+
+        return np.column_stack([
+            np.log1p(likes + 2 * reposts + 3 * replies + bookmarks),
+            engagement_rate,
+            replies / np.maximum(likes, 1),
+            np.log1p(comments),
+            -np.abs(np.log((length + 1) / PREFERRED_LENGTH)),
+        ])
+
+    def scores(self, tweets: Sequence[Dict[str, Any]]) -> np.ndarray:
+        """Return one pre-rank score per tweet; scores only compare within the same batch"""
+        if not tweets:
+            return np.zeros(0)
+        features = self.features(tweets)
+        spread = features.std(axis=0)
+        # A feature that is constant over the batch says nothing about which tweet is better
+        standardized = np.divide(features - features.mean(axis=0), spread,
+                                 out=np.zeros_like(features), where=spread > 0)
+        return standardized @ self.weights
+
+    def rank(self, tweets: Sequence[Dict[str, Any]]) -> List[int]:
+        """Return tweet indices from the highest to the lowest pre-rank score, ties in input order"""
+        return np.argsort(-self.scores(tweets), kind="stable").tolist()
+
+    def shortlist(self, tweets: Sequence[Dict[str, Any]], size: int) -> List[int]:
+        """Return the indices of the ``size`` best pre-ranked tweets, in input order"""
+        return sorted(self.rank(tweets)[:max(0, size)])
+
+
+def spearman(a: Sequence[float], b: Sequence[float]) -> float:
+    """Spearman rank correlation of two equally long score lists, with tied values sharing their mean rank"""
+    ranks_a, ranks_b = _ranks(np.asarray(a, dtype=float)), _ranks(np.asarray(b, dtype=float))
+    if len(ranks_a) < 2 or ranks_a.std() == 0 or ranks_b.std() == 0:
+        return 0.0
+    return float(np.corrcoef(ranks_a, ranks_b)[0, 1])
+
+
+def compare_with_scores(ranker: EngagementPreRanker, tweets: Sequence[Dict[str, Any]],
+                        llm_scores: Sequence[float], sizes: Sequence[int], k: int = 3) -> Dict[str, Any]:
+    """Compare pre-ranker shortlists with full LLM engagement scoring of the same tweets
+
+    For each shortlist size, reports how many of the LLM's top ``k`` tweets the shortlist
+    keeps, whether it keeps the LLM's best tweet, and how many scorer calls it saves.
+    """
+    llm_scores = np.asarray(llm_scores, dtype=float)
+    order = ranker.rank(tweets)
+    llm_top = set(np.argsort(-llm_scores, kind="stable")[:k].tolist())
+
+    shortlists = []
+    for size in sizes:
+        kept = set(order[:size])
+        shortlists.append({
+            "size": size,
+            "scorer_calls_saved": max(0, len(tweets) - size),
+            "top_k_recall": round(len(kept & llm_top) / len(llm_top), 3) if llm_top else 0.0,
+            "best_kept": bool(len(tweets)) and int(np.argmax(llm_scores)) in kept,
+            "mean_llm_score": round(float(llm_scores[sorted(kept)].mean()), 2) if kept else None,
+        })
+
+    return {
+        "sample_size": len(tweets),
+        "k": k,
+        "spearman": round(spearman(ranker.scores(tweets), llm_scores), 3),
+        "mean_llm_score": round(float(llm_scores.mean()), 2) if len(tweets) else None,
+        "shortlists": shortlists,
+    }
+
+
+def _ranks(values: np.ndarray) -> np.ndarray:
+    order = np.argsort(values, kind="stable")
+    ranks = np.empty(len(values))
+    ranks[order] = np.arange(len(values))
+    # Give tied values the mean of the ranks they span
+    _, inverse, counts = np.unique(values, return_inverse=True, return_counts=True)
+    sums = np.bincount(inverse, weights=ranks)
+    return (sums / counts)[inverse]
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Metrics Module
+This module records latency, token usage, errors and cache hits for every agent call
+made during analysis. Metrics can be rendered in the Prometheus text format or
+summarized as a JSON run report.
+"""
+import json
+import math
+import time
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+# The CLI stores the run report in the working directory, next to the analysis_results.json
+# it writes there; the app passes its own path beside its results file
+METRICS_REPORT_PATH = Path("analysis_metrics.json")
+
+# Upper bounds (in seconds) of the latency histogram buckets
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+# Recent successful-call latencies kept per agent for percentile estimates
+MAX_LATENCY_SAMPLES = 2048
+
+# Percentiles used to steer calls (e.g. hedging) need at least this many samples
+MIN_PERCENTILE_SAMPLES = 20
+
+COUNTERS = ("calls", "errors", "retries", "hedges", "hedge_wins", "cache_hits", "cache_misses",
+            "requests", "input_tokens", "output_tokens")
+
+
+def percentile(values: List[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of ``values`` (0 for an empty list)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(fraction * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class AgentMetrics:
+    """Thread-safe per-agent counters and latency histograms
+
+    Counters only ever grow, so the Prometheus output stays monotonic for the life
+    of the process. A run keeps its own figures in an ``AgentMetrics`` whose ``parent``
+    is the process-wide one: every observation is recorded in both, so concurrent
+    runs never count each other's calls.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS, parent: Optional["AgentMetrics"] = None):
+        self.buckets = tuple(sorted(buckets))
+        self.agents: Dict[str, Dict[str, Any]] = {}
+        self.parent = parent
+        self._lock = threading.Lock()
+
+    def observe_call(self, agent_name: str, seconds: float, usage=None, error: bool = False) -> None:
+        """Record one agent run with its latency, its token usage and whether it failed"""
+        with self._lock:
+            stats = self._agent(agent_name)
+            stats["calls"] += 1
+            stats["errors"] += int(error)
+            stats["latency_sum"] += seconds
+            if not error:
+                stats["samples"].append(seconds)
+            for position, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    stats["buckets"][position] += 1
+            if usage is not None:
+                stats["requests"] += usage.requests
+                stats["input_tokens"] += usage.input_tokens
+                stats["output_tokens"] += usage.output_tokens
+        if self.parent is not None:
+            self.parent.observe_call(agent_name, seconds, usage=usage, error=error)
+
+    def observe_retry(self, agent_name: str) -> None:
+        """Record that a failed agent run is being retried"""
+        with self._lock:
+            self._agent(agent_name)["retries"] += 1
+        if self.parent is not None:
+            self.parent.observe_retry(agent_name)
+
+    def observe_hedge(self, agent_name: str) -> None:
+        """Record that a duplicate run was started for a slow agent call"""
+        with self._lock:
+            self._agent(agent_name)["hedges"] += 1
+        if self.parent is not None:
+            self.parent.observe_hedge(agent_name)
+
+    def observe_hedge_win(self, agent_name: str) -> None:
+        """Record that a duplicate run finished before the original"""
+        with self._lock:
+            self._agent(agent_name)["hedge_wins"] += 1
+        if self.parent is not None:
+            self.parent.observe_hedge_win(agent_name)
+
+    def latency_percentile(self, agent_name: str, fraction: float,
+                           min_samples: int = MIN_PERCENTILE_SAMPLES) -> Optional[float]:
+        """Return a percentile of the agent's recent successful-call latency, or None without enough data"""
+        with self._lock:
+            stats = self.agents.get(agent_name)
+            samples = list(stats["samples"]) if stats else []
+        return percentile(samples, fraction) if len(samples) >= min_samples else None
+
+    def observe_cache(self, agent_name: str, hit: bool) -> None:
+        """Record a cache lookup made on behalf of an agent"""
+        with self._lock:
+            self._agent(agent_name)["cache_hits" if hit else "cache_misses"] += 1
+        if self.parent is not None:
+            self.parent.observe_cache(agent_name, hit)
+
+    def report(self) -> Dict[str, Any]:
+        """Summarize every agent's calls, errors, hedges, cache hits, tokens and latency"""
+        agents = {}
+        with self._lock:
+            for name, stats in sorted(self.agents.items()):
+                entry = {counter: stats[counter] for counter in COUNTERS}
+                if not any(entry.values()):
+                    continue
+
+                recent = list(stats["samples"])
+                entry["latency_seconds"] = {
+                    "avg": round(stats["latency_sum"] / entry["calls"], 3) if entry["calls"] else 0.0,
+                    "p50": round(percentile(recent, 0.5), 3),
+                    "p95": round(percentile(recent, 0.95), 3),
+                    "max": round(max(recent), 3) if recent else 0.0
+                }
+                entry["hedge_rate"] = round(entry["hedges"] / entry["calls"], 3) if entry["calls"] else 0.0
+                entry["hedge_win_rate"] = round(entry["hedge_wins"] / entry["hedges"], 3) if entry["hedges"] else 0.0
+                agents[name] = entry
+
+        totals = {counter: sum(entry[counter] for entry in agents.values()) for counter in COUNTERS}
+        return {"generated_at": time.strftime("%Y-%m-%dT%H:%M:%S"), "totals": totals, "agents": agents}
+
+    def to_prometheus(self, prefix: str = "matschia") -> str:
+        """Render all metrics in the Prometheus text exposition format"""
+        lines = []
+        with self._lock:
+            agents = sorted(self.agents.items())
+
+            name = f"{prefix}_agent_call_duration_seconds"
+            lines += [f"# HELP {name} Latency of agent runs.", f"# TYPE {name} histogram"]
+            for agent_name, stats in agents:
+                label = f'agent="{_escape_label(agent_name)}"'
+                for bound, count in zip(self.buckets, stats["buckets"]):
+                    lines.append(f'{name}_bucket{{{label},le="{bound}"}} {count}')
+                lines.append(f'{name}_bucket{{{label},le="+Inf"}} {stats["calls"]}')
+                lines.append(f"{name}_sum{{{label}}} {stats['latency_sum']:.6f}")
+                lines.append(f"{name}_count{{{label}}} {stats['calls']}")
+
+            for counter, help_text in (
+                ("calls", "Agent runs started."),
+                ("errors", "Agent runs that raised an error."),
+                ("retries", "Failed agent runs that were retried."),
+                ("hedges", "Duplicate runs started for slow agent calls."),
+                ("hedge_wins", "Duplicate runs that finished before the original."),
+                ("requests", "Model API requests made by agent runs."),
+                ("cache_hits", "Agent outputs served from a cache."),
+                ("cache_misses", "Cache lookups that required an agent run."),
+            ):
+                name = f"{prefix}_agent_{counter}_total"
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for agent_name, stats in agents:
+                    lines.append(f'{name}{{agent="{_escape_label(agent_name)}"}} {stats[counter]}')
+
+            name = f"{prefix}_agent_tokens_total"
+            lines += [f"# HELP {name} Tokens used by agent runs.", f"# TYPE {name} counter"]
+            for agent_name, stats in agents:
+                label = f'agent="{_escape_label(agent_name)}"'
+                lines.append(f'{name}{{{label},type="input"}} {stats["input_tokens"]}')
+                lines.append(f'{name}{{{label},type="output"}} {stats["output_tokens"]}')
+
+        return "\n".join(lines) + "\n"
+
+    def _agent(self, agent_name: str) -> Dict[str, Any]:
+        stats = self.agents.get(agent_name)
+        if stats is None:
+            stats = {counter: 0 for counter in COUNTERS}
+            stats["latency_sum"] = 0.0
+            stats["buckets"] = [0] * len(self.buckets)
+            stats["samples"] = deque(maxlen=MAX_LATENCY_SAMPLES)
+            self.agents[agent_name] = stats
+        return stats
+
+
+def write_report(report: Dict[str, Any], path: Path = METRICS_REPORT_PATH) -> None:
+    """Write a run report as JSON"""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Near-duplicate Module
+This module groups tweets whose normalized text is nearly identical, such as reposted
+threads, copy-paste takes and retweets with a link appended, so each group needs only
+one classifier and scorer call. Posts are summarized with MinHash signatures and
+candidate matches are found through LSH band tables, in roughly linear time.
+"""
+import os
+import re
+import zlib
+from typing import Dict, List, Optional, Any, Sequence, Tuple
+
+import numpy as np
+
+from tweet_stats import normalize_stats
+
+# Estimated Jaccard similarity of two posts' word sets above which they count as near-duplicates
+DEFAULT_THRESHOLD = float(os.getenv("DEDUPE_THRESHOLD", "0.7"))
+
+# Posts with fewer words than this are too short to compare reliably and are never grouped
+MIN_TOKENS = 4
+
+# MinHash signature length, split into LSH bands of BAND_ROWS values. Pairs above a
+# similarity of about (1 / bands) ** (1 / BAND_ROWS) = 0.5 share a band and get compared.
+NUM_HASHES = 64
+BAND_ROWS = 4
+
+# Feature hashes processed per vectorized step, which bounds the temporary arrays to a few MB
+CHUNK_FEATURES = 50000
+
+URL_PATTERN = re.compile(r"https?://\S+|\bpic\.twitter\.com/\S+")
+MENTION_PATTERN = re.compile(r"@\w+")
+RETWEET_PATTERN = re.compile(r"^(?:rt\b\s*)+:?")
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def normalize(text: str) -> List[str]:
+    """Return the words of a post, lowercased, without URLs, @mentions, an "RT" prefix or punctuation"""
+    text = text.lower()
+    text = URL_PATTERN.sub(" ", text)
+    text = MENTION_PATTERN.sub(" ", text)
+    text = RETWEET_PATTERN.sub(" ", text.strip())
+    return WORD_PATTERN.findall(text)
+
+
+def features(text: str) -> List[str]:
+    """Return the distinct words and word pairs of a post, or nothing when it has fewer than MIN_TOKENS words"""
+    tokens = normalize(text)
+    if len(tokens) < MIN_TOKENS:
+        return []
+    return list(set(tokens + [f"{first} {second}" for first, second in zip(tokens, tokens[1:])]))
+
+
+class NearDuplicateIndex:
+    """Groups near-duplicate posts by MinHash similarity using LSH band tables"""
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, seed: int = 0):
+        if not 0 < threshold <= 1:
+            raise ValueError("Near-duplicate threshold must be between 0 and 1")
+        self.threshold = threshold
+        self.bands = NUM_HASHES // BAND_ROWS
+
+        # Multiply-shift hash functions; the multipliers must be odd
+        rng = np.random.default_rng(seed)
+        self.multipliers = rng.integers(0, 2 ** 63, NUM_HASHES, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self.offsets = rng.integers(0, 2 ** 63, NUM_HASHES, dtype=np.uint64)
+
+    def signatures(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Return an (n texts, NUM_HASHES) MinHash matrix and a mask of the texts long enough to compare
+
+        Feature hashes of many texts are permuted and reduced to per-text minimums in
+        a few large NumPy operations instead of one small operation per text.
+        """
+        signatures = np.zeros((len(texts), NUM_HASHES), dtype=np.uint64)
+        valid = np.zeros(len(texts), dtype=bool)
+        chunk_rows, chunk_hashes = [], []
+
+        for row, text in enumerate(texts):
+            text_features = features(text)
+            if not text_features:
+                continue
+            valid[row] = True
+            chunk_rows.append((row, len(text_features)))
+            chunk_hashes.extend(zlib.crc32(feature.encode("utf-8")) for feature in text_features)
+            if len(chunk_hashes) >= CHUNK_FEATURES:
+                self._fill(signatures, chunk_rows, chunk_hashes)
+                chunk_rows, chunk_hashes = [], []
+
+        if chunk_rows:
+            self._fill(signatures, chunk_rows, chunk_hashes)
+        return signatures, valid
+
+    def _fill(self, signatures: np.ndarray, rows: List[Tuple[int, int]], hashes: List[int]) -> None:
+        values = np.array(hashes, dtype=np.uint64)
+        # Unsigned products wrap around 2**64; the high bits are the permuted value
+        permuted = (values[:, None] * self.multipliers + self.offsets) >> np.uint64(32)
+        counts = np.array([count for _, count in rows])
+        starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        signatures[[row for row, _ in rows]] = np.minimum.reduceat(permuted, starts, axis=0)
+
+    def group(self, tweets: Sequence[Dict[str, Any]]) -> List[List[int]]:
+        """Return groups of tweet indices that share near-identical posts
+
+        Every tweet is in exactly one group and groups are ordered by their earliest
+        tweet. The first index of each group is its representative: the most engaged
+        tweet in the group, which is the one worth replying to.
+        """
+        signatures, valid = self.signatures([tweet.get('post') or "" for tweet in tweets])
+        tables: List[Dict[bytes, List[int]]] = [{} for _ in range(self.bands)]
+        leader_of = list(range(len(tweets)))
+
+        for index in np.flatnonzero(valid).tolist():
+            signature = signatures[index]
+            keys = [signature[band * BAND_ROWS:(band + 1) * BAND_ROWS].tobytes() for band in range(self.bands)]
+            leader = self._find_leader(signatures, tables, keys, signature)
+            if leader is not None:
+                leader_of[index] = leader
+                continue
+            # Only group leaders are indexed, which keeps every lookup bucket small
+            for table, key in zip(tables, keys):
+                table.setdefault(key, []).append(index)
+
+        members: Dict[int, List[int]] = {}
+        for index, leader in enumerate(leader_of):
+            members.setdefault(leader, []).append(index)
+
+        return [sorted(group, key=lambda index: (-_interactions(tweets[index]), index)) for group in members.values()]
+
+    def _find_leader(self, signatures: np.ndarray, tables: List[Dict[bytes, List[int]]],
+                     keys: List[bytes], signature: np.ndarray) -> Optional[int]:
+        checked = set()
+        for table, key in zip(tables, keys):
+            for leader in table.get(key, ()):
+                if leader in checked:
+                    continue
+                checked.add(leader)
+                # The share of matching MinHash values estimates the Jaccard similarity
+                if np.count_nonzero(signatures[leader] == signature) >= self.threshold * NUM_HASHES:
+                    return leader
+        return None
+
+
+def _interactions(tweet: Dict[str, Any]) -> int:
+    stats = normalize_stats(tweet.get('stats'))
+    return stats["likes"] + stats["reposts"] + stats["replies"] + stats["bookmarks"]
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+News Cache Module
+This module keeps the latest tech news snapshot in memory and on disk so that
+post generation can reuse it instead of running fresh web searches every time.
+Stale snapshots are served immediately while a background refresh runs.
+"""
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Callable, Awaitable
+
+logger = logging.getLogger(__name__)
+
+# Store the snapshot next to the other data files
+SCRIPT_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
+NEWS_CACHE_PATH = SCRIPT_DIR / "news_cache.json"
+
+# A snapshot is fresh for the TTL; after that it is still served (and refreshed in the
+# background) until it is older than the max stale age, when callers wait for a new one
+DEFAULT_TTL_SECONDS = float(os.getenv("NEWS_CACHE_TTL_MINUTES", "30")) * 60
+DEFAULT_MAX_STALE_SECONDS = float(os.getenv("NEWS_CACHE_MAX_STALE_HOURS", "24")) * 3600
+
+
+class NewsCache:
+    """Process-wide, disk-backed tech news snapshot with stale-while-revalidate refresh"""
+
+    def __init__(self, path: Path = NEWS_CACHE_PATH, ttl_seconds: float = DEFAULT_TTL_SECONDS,
+                 max_stale_seconds: float = DEFAULT_MAX_STALE_SECONDS):
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_stale_seconds = max(ttl_seconds, max_stale_seconds)
+        self._lock = threading.Lock()
+        self._refresh_thread: Optional[threading.Thread] = None
+        self._news: Optional[List[Dict]] = None
+        self._fetched_at = 0.0
+        self._load()
+
+    def snapshot(self) -> Tuple[Optional[List[Dict]], float]:
+        """Return the cached news and its age in seconds, or (None, inf) if there is none"""
+        with self._lock:
+            if self._news is None:
+                return None, float("inf")
+            return list(self._news), time.time() - self._fetched_at
+
+    def is_fresh(self, age: float) -> bool:
+        return age <= self.ttl_seconds
+
+    def is_usable(self, age: float) -> bool:
+        return age <= self.max_stale_seconds
+
+    def put(self, news: List[Dict]) -> None:
+        """Replace the snapshot and persist it to disk"""
+        with self._lock:
+            self._news = list(news)
+            self._fetched_at = time.time()
+            payload = {"fetched_at": self._fetched_at, "news": self._news}
+
+        try:
+            temp_path = self.path.with_suffix(".tmp")
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(payload, f, indent=2, ensure_ascii=False)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not persist news cache to {self.path}: {e}")
+
+    def refresh_in_background(self, fetch: Callable[[], Awaitable[List[Dict]]]) -> bool:
+        """Start a background refresh with ``fetch`` unless one is already running
+
+        The refresh runs in its own thread and event loop so it outlives the request
+        that triggered it. Returns True if a new refresh was started.
+        """
+        with self._lock:
+            if self._refresh_thread is not None and self._refresh_thread.is_alive():
+                return False
+            self._refresh_thread = threading.Thread(
+                target=self._run_refresh, args=(fetch,), name="news-cache-refresh", daemon=True
+            )
+            self._refresh_thread.start()
+        return True
+
+    def _run_refresh(self, fetch: Callable[[], Awaitable[List[Dict]]]) -> None:
+        try:
+            news = asyncio.run(fetch())
+            if news:
+                self.put(news)
+                logger.info(f"Refreshed tech news cache with {len(news)} items")
+        except Exception as e:
+            logger.warning(f"Background tech news refresh failed: {e}")
+
+    def _load(self) -> None:
+        """Load the last persisted snapshot, if any"""
+        if not self.path.exists():
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                payload = json.load(f)
+            self._news = payload["news"]
+            self._fetched_at = float(payload["fetched_at"])
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable news cache at {self.path}: {e}")
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Prompt Builder Module
+This module assembles the per-tweet prompts sent to the analysis agents. It keeps
+each prompt within a token budget by dropping repeated and near-duplicate comments,
+truncating long fields, and tracking how many tokens were sent versus saved.
+"""
+import re
+import math
+import threading
+from difflib import SequenceMatcher
+from typing import Dict, List, Optional, Tuple, Any
+
+# Token budgets for a single tweet's prompt, keyed by agent name
+DEFAULT_TOKEN_BUDGETS = {
+    "Tech Tweet Classifier": 350,
+    "Batch Tech Tweet Classifier": 250,
+    "Engagement Potential Scorer": 600,
+    "Tech Tweet Assessor": 600,
+    "Human Tech Reply Generator": 600,
+}
+FALLBACK_TOKEN_BUDGET = 500
+
+# Comments at least this similar to the tweet or an earlier comment are dropped
+DEFAULT_SIMILARITY_THRESHOLD = 0.85
+
+# Longest a single comment may be before it is truncated
+MAX_COMMENT_TOKENS = 60
+
+TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+
+def count_tokens(text: str) -> int:
+    """Approximate the number of model tokens in ``text`` without a tokenizer
+
+    Punctuation counts as one token and words as one token per four characters,
+    which tracks GPT tokenizers closely enough for budgeting.
+    """
+    return sum(math.ceil(len(piece) / 4) if piece[0].isalnum() or piece[0] == "_" else 1
+               for piece in TOKEN_PATTERN.findall(text))
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut ``text`` down to roughly ``max_tokens`` tokens, marking the cut with an ellipsis"""
+    used = 0
+    for match in TOKEN_PATTERN.finditer(text):
+        piece = match.group()
+        used += math.ceil(len(piece) / 4) if piece[0].isalnum() or piece[0] == "_" else 1
+        if used > max_tokens:
+            return text[:match.start()].rstrip() + "…"
+    return text
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase text and strip URLs, mentions, punctuation and extra whitespace for comparison"""
+    text = re.sub(r"https?://\S+|@\w+", " ", text.lower())
+    text = re.sub(r"[^\w\s]", " ", text)
+    return " ".join(text.split())
+
+
+def dedupe_comments(comments: List[str], post: str = "",
+                    threshold: float = DEFAULT_SIMILARITY_THRESHOLD, limit: Optional[int] = None) -> List[str]:
+    """Drop empty comments, comments that repeat the tweet text and near-identical comments
+
+    With a ``limit``, stops once that many distinct comments have been kept.
+    """
+    kept = []
+    seen = [normalize_text(post)] if post else []
+    for comment in comments:
+        if limit is not None and len(kept) >= limit:
+            break
+        normalized = normalize_text(comment)
+        if not normalized:
+            continue
+        if any(normalized == other or _similar(normalized, other, threshold) for other in seen):
+            continue
+        seen.append(normalized)
+        kept.append(comment)
+    return kept
+
+
+def _similar(first: str, second: str, threshold: float) -> bool:
+    # The length and character-count bounds are cheap and rule out most pairs
+    matcher = SequenceMatcher(None, first, second)
+    return (matcher.real_quick_ratio() >= threshold and matcher.quick_ratio() >= threshold
+            and matcher.ratio() >= threshold)
+
+
+class PromptBuilder:
+    """Builds budgeted tweet prompts and records token usage per agent"""
+
+    def __init__(self, budgets: Optional[Dict[str, int]] = None,
+                 similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD):
+        self.budgets = dict(DEFAULT_TOKEN_BUDGETS)
+        self.budgets.update(budgets or {})
+        self.similarity_threshold = similarity_threshold
+        self.usage: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def build(self, agent_name: str, fields: List[Tuple[str, Any]], comments: List[str],
+              post: str = "", comment_label: str = "Comments", max_comments: int = 5,
+              footer: str = "") -> str:
+        """Build a prompt of ``label: value`` lines followed by as many comments as fit the budget
+
+        Comments are deduplicated against ``post`` and each other before being added,
+        and any field or comment that is too long on its own is truncated.
+        """
+        budget = self.budgets.get(agent_name, FALLBACK_TOKEN_BUDGET)
+
+        # Fields may take at most half the budget each so the comments always get some room
+        lines = [f"{label}: {truncate_to_tokens(str(value), budget // 2)}" for label, value in fields]
+        used = count_tokens("\n".join(lines)) + count_tokens(footer)
+
+        # Fill the remaining budget with distinct comments, so dropped repeats make room for later ones
+        selected = []
+        for comment in dedupe_comments(comments, post, self.similarity_threshold, limit=max_comments):
+            comment = truncate_to_tokens(" ".join(comment.split()), MAX_COMMENT_TOKENS)
+            cost = count_tokens(comment) + 1
+            if used + cost > budget:
+                break
+            selected.append(comment)
+            used += cost
+
+        if selected:
+            lines.append(f"{comment_label}: {' | '.join(selected)}")
+        prompt = "\n".join(lines)
+        if footer:
+            prompt += "\n\n" + footer
+
+        # Compare against what the uncompacted prompt would have cost
+        raw_lines = [f"{label}: {value}" for label, value in fields]
+        raw_lines.append(f"{comment_label}: {' | '.join(comments[:max_comments])}")
+        self._record(agent_name, count_tokens(prompt), count_tokens("\n".join(raw_lines) + footer))
+
+        return prompt
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """Return prompts built, tokens sent, tokens saved and average tokens per prompt for each agent"""
+        with self._lock:
+            return {
+                agent_name: {
+                    "prompts": usage["prompts"],
+                    "tokens_sent": usage["tokens_sent"],
+                    "tokens_saved": usage["tokens_raw"] - usage["tokens_sent"],
+                    "avg_tokens_per_prompt": round(usage["tokens_sent"] / usage["prompts"], 1) if usage["prompts"] else 0
+                }
+                for agent_name, usage in self.usage.items()
+            }
+
+    def _record(self, agent_name: str, tokens_sent: int, tokens_raw: int) -> None:
+        with self._lock:
+            usage = self.usage.setdefault(agent_name, {"prompts": 0, "tokens_sent": 0, "tokens_raw": 0})
+            usage["prompts"] += 1
+            usage["tokens_sent"] += tokens_sent
+            usage["tokens_raw"] += max(tokens_raw, tokens_sent)
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Rate Limiter Module
+This module paces agent calls against the OpenAI API. A token bucket caps the request
+rate, an AIMD controller grows the number of calls in flight while they succeed and
+halves it on rate-limit errors and timeouts, and failed calls are retried with jittered
+exponential backoff instead of being dropped.
+"""
+import os
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+from typing import Dict, Optional, Callable, Awaitable, TypeVar, Any
+
+import openai
+
+T = TypeVar("T")
+
+# Defaults can be overridden from the environment; a rate of 0 disables the token bucket
+DEFAULT_REQUESTS_PER_SECOND = float(os.getenv("RATE_LIMIT_RPS", "10"))
+DEFAULT_BURST = int(os.getenv("RATE_LIMIT_BURST", "10"))
+DEFAULT_INITIAL_CONCURRENCY = int(os.getenv("RATE_LIMIT_INITIAL_CONCURRENCY", "4"))
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("RATE_LIMIT_MAX_CONCURRENCY", "32"))
+DEFAULT_MAX_RETRIES = int(os.getenv("AGENT_MAX_RETRIES", "4"))
+DEFAULT_BACKOFF_BASE = 1.0
+DEFAULT_BACKOFF_CAP = 30.0
+
+# Errors that mean the API is overloaded, as opposed to a transient server fault
+OVERLOAD_ERRORS = (openai.RateLimitError, openai.APITimeoutError, asyncio.TimeoutError)
+RETRYABLE_ERRORS = OVERLOAD_ERRORS + (openai.APIConnectionError, openai.InternalServerError)
+
+
+def is_overload(error: BaseException) -> bool:
+    """Return True for rate-limit errors and timeouts"""
+    return isinstance(error, OVERLOAD_ERRORS) or getattr(error, "status_code", None) == 429
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Return True for errors that are worth retrying after a pause"""
+    return isinstance(error, RETRYABLE_ERRORS) or getattr(error, "status_code", None) in (429, 500, 502, 503, 504)
+
+
+def retry_after(error: BaseException) -> float:
+    """Return the server's Retry-After delay in seconds, or 0 if it did not send one"""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("retry-after", 0)))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class TokenBucket:
+    """Caps the average request rate while allowing short bursts"""
+
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    async def acquire(self) -> None:
+        """Wait until a token is available
+
+        Tokens are reserved up front (the balance may go negative), so concurrent
+        callers queue behind each other without polling.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+class AIMDController:
+    """Concurrency limit that grows additively on success and shrinks multiplicatively on overload
+
+    The controller is shared by every analysis run in the process. The web app runs
+    each request in its own event loop, so waiters are woken through their own loop.
+    """
+
+    def __init__(self, initial: int = DEFAULT_INITIAL_CONCURRENCY, minimum: int = 1,
+                 maximum: int = DEFAULT_MAX_CONCURRENCY, decrease_factor: float = 0.5,
+                 cooldown_seconds: float = 2.0):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(self.maximum, max(self.minimum, initial)))
+        self.decrease_factor = decrease_factor
+        self.cooldown_seconds = cooldown_seconds
+        self.in_flight = 0
+        self.decreases = 0
+        self._last_decrease = 0.0
+        self._waiters = deque()
+        self._lock = threading.Lock()
+
+    async def acquire(self) -> None:
+        """Wait for a free slot under the current limit"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self.in_flight < int(self.limit) and not self._waiters:
+                self.in_flight += 1
+                return
+            future = loop.create_future()
+            self._waiters.append((loop, future))
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            with self._lock:
+                if (loop, future) in self._waiters:
+                    self._waiters.remove((loop, future))
+                    future = None
+            # The slot was handed over just as we were cancelled, so give it back
+            if future is not None and future.done() and not future.cancelled():
+                self.release()
+            raise
+
+    def try_acquire(self) -> bool:
+        """Take a free slot without waiting, returning False when none is free"""
+        with self._lock:
+            if self.in_flight < int(self.limit) and not self._waiters:
+                self.in_flight += 1
+                return True
+            return False
+
+    def release(self) -> None:
+        """Free a slot and wake the next waiter if the limit allows"""
+        with self._lock:
+            self.in_flight -= 1
+            self._wake()
+
+    def on_success(self) -> None:
+        """Grow the limit by roughly one slot per limit's worth of successful calls"""
+        with self._lock:
+            self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._wake()
+
+    def on_overload(self) -> None:
+        """Shrink the limit, at most once per cooldown so one burst of errors counts once"""
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_decrease < self.cooldown_seconds:
+                return
+            self._last_decrease = now
+            self.limit = max(self.minimum, self.limit * self.decrease_factor)
+            self.decreases += 1
+
+    def _wake(self) -> None:
+        # Called with the lock held
+        while self._waiters and self.in_flight < int(self.limit):
+            loop, future = self._waiters.popleft()
+            self.in_flight += 1
+            loop.call_soon_threadsafe(self._hand_over, future)
+
+    def _hand_over(self, future: asyncio.Future) -> None:
+        if future.cancelled():
+            self.release()
+        else:
+            future.set_result(None)
+
+
+class AdaptiveRateLimiter:
+    """Runs agent calls through a token bucket and an AIMD controller, retrying failures"""
+
+    def __init__(self, requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND, burst: int = DEFAULT_BURST,
+                 concurrency: Optional[AIMDController] = None, max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_base: float = DEFAULT_BACKOFF_BASE, backoff_cap: float = DEFAULT_BACKOFF_CAP):
+        self.bucket = TokenBucket(requests_per_second, burst) if requests_per_second > 0 else None
+        self.concurrency = concurrency or AIMDController()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.retries = 0
+        self.gave_up = 0
+
+    async def run(self, call: Callable[[], Awaitable[T]],
+                  on_retry: Optional[Callable[[BaseException, int, float], None]] = None) -> T:
+        """Await ``call()`` under the rate limits, retrying retryable errors
+
+        ``on_retry`` is told the error, the attempt number about to start and the
+        delay before it. The last error is raised once retries are exhausted.
+        """
+        attempt = 0
+        while True:
+            if self.bucket is not None:
+                await self.bucket.acquire()
+            await self.concurrency.acquire()
+            try:
+                result = await call()
+            except Exception as e:
+                error = e
+                if is_overload(error):
+                    self.concurrency.on_overload()
+                if attempt >= self.max_retries or not is_retryable(error):
+                    if is_retryable(error):
+                        self.gave_up += 1
+                    raise
+            else:
+                self.concurrency.on_success()
+                return result
+            finally:
+                self.concurrency.release()
+
+            attempt += 1
+            self.retries += 1
+            delay = self.backoff(attempt, error)
+            if on_retry is not None:
+                on_retry(error, attempt, delay)
+            await asyncio.sleep(delay)
+
+    def backoff(self, attempt: int, error: Optional[BaseException] = None) -> float:
+        """Full-jitter exponential backoff, never shorter than the server's Retry-After"""
+        ceiling = min(self.backoff_cap, self.backoff_base * 2 ** (attempt - 1))
+        delay = random.uniform(0, ceiling)
+        if error is not None:
+            delay = max(delay, min(self.backoff_cap, retry_after(error)))
+        return delay
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the current concurrency limit along with retry and throttle counters"""
+        return {
+            "concurrency_limit": int(self.concurrency.limit),
+            "in_flight": self.concurrency.in_flight,
+            "throttle_events": self.concurrency.decreases,
+            "retries": self.retries,
+            "gave_up": self.gave_up
+        }
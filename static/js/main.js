@@ -79,6 +79,67 @@ document.addEventListener("DOMContentLoaded", function () {
         }
     }
 
+    // Switch the reply target between the ranked tweets on the analysis page
+    const candidatesData = document.getElementById("replyCandidatesData");
+    const candidateCards = document.querySelectorAll(".candidate-card");
+    if (candidatesData && candidateCards.length) {
+        const candidates = JSON.parse(candidatesData.textContent);
+        const setText = (id, text) => {
+            const element = document.getElementById(id);
+            if (element) element.textContent = text;
+        };
+
+        candidateCards.forEach((card) => {
+            card.addEventListener("click", function () {
+                const index = parseInt(this.dataset.index, 10);
+                const candidate = candidates[index];
+                if (!candidate) return;
+
+                candidateCards.forEach((c) => {
+                    c.classList.remove("border-buttonBg", "shadow-md");
+                    c.classList.add("border-gray-200");
+                });
+                this.classList.add("border-buttonBg", "shadow-md");
+                this.classList.remove("border-gray-200");
+
+                // Tweet details
+                setText(
+                    "replyTargetHeading",
+                    index === 0
+                        ? "Best Tweet for Engagement"
+                        : `Reply Target #${index + 1}`
+                );
+                setText("replyTargetText", candidate.post);
+                setText("replyTargetStats", candidate.stats);
+                setText("replyTargetScore", `${candidate.engagement_score}/10`);
+                const link = document.getElementById("replyTargetLink");
+                if (link) link.href = candidate.url;
+                const scoreBar = document.getElementById("replyTargetScoreBar");
+                if (scoreBar) {
+                    scoreBar.style.width = `${candidate.engagement_score * 10}%`;
+                }
+                const categories = document.getElementById(
+                    "replyTargetCategories"
+                );
+                if (categories) {
+                    categories.innerHTML = "";
+                    candidate.tech_categories.forEach((category) => {
+                        const badge = document.createElement("span");
+                        badge.className =
+                            "px-2 py-1 bg-purple-100 text-purple-700 text-xs font-medium rounded-full";
+                        badge.textContent = category;
+                        categories.appendChild(badge);
+                    });
+                }
+
+                // Drafted replies; switching targets discards unsaved edits
+                showReplyVariants(candidate.variants || [candidate.reply]);
+                const targetInput = document.getElementById("replyTargetInput");
+                if (targetInput) targetInput.value = index;
+            });
+        });
+    }
+
     // Handle new post editing functionality
     const editPostBtn = document.getElementById("editPostBtn");
     const postTextDisplay = document.getElementById("postTextDisplay");
@@ -131,6 +192,177 @@ document.addEventListener("DOMContentLoaded", function () {
         }
     }
 
+    // Let the user pick between the drafts returned for the reply and the new post
+    const replyVariantPicker = document.getElementById("replyVariantPicker");
+    const postVariantPicker = document.getElementById("postVariantPicker");
+
+    function renderVariantPicker(picker, variants, onSelect) {
+        picker.innerHTML = "";
+        picker.classList.toggle("hidden", variants.length < 2);
+        const buttons = variants.map((variant, index) => {
+            const button = document.createElement("button");
+            button.type = "button";
+            button.className =
+                "px-3 py-1 text-xs font-medium rounded-full border";
+            button.textContent = `Draft ${index + 1}`;
+            button.title = `${variant.tone} · ${variant.style}`;
+            button.addEventListener("click", function () {
+                buttons.forEach((b) => {
+                    b.classList.remove("border-buttonBg", "text-buttonBg");
+                    b.classList.add("border-gray-300", "text-gray-600");
+                });
+                this.classList.add("border-buttonBg", "text-buttonBg");
+                this.classList.remove("border-gray-300", "text-gray-600");
+                onSelect(variant, index);
+            });
+            picker.appendChild(button);
+            return button;
+        });
+        if (buttons.length) buttons[0].click();
+    }
+
+    function showReplyVariants(variants) {
+        if (!replyVariantPicker) return;
+        renderVariantPicker(replyVariantPicker, variants, (variant, index) => {
+            if (replyTextDisplay) replyTextDisplay.textContent = variant.text;
+            if (replyTextEditor) replyTextEditor.value = variant.text;
+            if (editedReplyInput) editedReplyInput.value = variant.text;
+            document.getElementById("replyTone").textContent = variant.tone;
+            document.getElementById("replyStyle").textContent = variant.style;
+            document.getElementById("replyVariantInput").value = index;
+        });
+    }
+
+    const replyVariantsData = document.getElementById("replyVariantsData");
+    if (replyVariantPicker && replyVariantsData) {
+        showReplyVariants(JSON.parse(replyVariantsData.textContent));
+    }
+
+    const postVariantsData = document.getElementById("postVariantsData");
+    if (postVariantPicker && postVariantsData) {
+        const postVariants = JSON.parse(postVariantsData.textContent);
+        renderVariantPicker(postVariantPicker, postVariants, (variant, index) => {
+            if (postTextDisplay) postTextDisplay.textContent = variant.text;
+            if (postTextEditor) postTextEditor.value = variant.text;
+            if (editedPostInput) editedPostInput.value = variant.text;
+            document.getElementById("postVariantInput").value = index;
+        });
+    }
+
+    // Follow the analysis progress stream on the live analysis page
+    const liveAnalysis = document.getElementById("liveAnalysis");
+    if (liveAnalysis && !window.EventSource) {
+        // No streaming support; run the blocking analysis instead
+        window.location.href = liveAnalysis.dataset.fallbackUrl;
+    } else if (liveAnalysis) {
+        const source = new EventSource(liveAnalysis.dataset.streamUrl);
+        const liveFeed = document.getElementById("liveFeed");
+        const counts = { total: 0, classified: 0, tech: 0, scored: 0 };
+
+        const setLive = (id, text) => {
+            document.getElementById(id).textContent = text;
+        };
+        const updateProgress = () => {
+            setLive("liveClassified", counts.classified);
+            setLive("liveTech", counts.tech);
+            setLive("liveScored", counts.scored);
+            if (counts.total) {
+                const share = Math.min(1, counts.classified / counts.total);
+                document.getElementById("liveProgressBar").style.width = `${
+                    share * 100
+                }%`;
+            }
+        };
+        const addFeedItem = (text, className) => {
+            const item = document.createElement("li");
+            item.className = `px-2 py-1 rounded ${className}`;
+            item.textContent = text;
+            liveFeed.prepend(item);
+        };
+        const showDraft = (id, variants) => {
+            const draft = document.getElementById(id);
+            draft.textContent = variants.map((variant) => variant.text).join("\n\n");
+            draft.classList.remove("text-gray-500");
+            draft.classList.add("text-gray-800");
+        };
+        const onEvent = (name, handler) => {
+            source.addEventListener(name, (event) =>
+                handler(JSON.parse(event.data))
+            );
+        };
+
+        onEvent("started", (data) => {
+            counts.total = data.total;
+            setLive("liveTotal", data.total);
+            setLive("liveStatus", "Classifying tweets...");
+        });
+        onEvent("classified", (data) => {
+            counts.classified += 1;
+            if (data.is_tech) {
+                counts.tech += 1;
+                addFeedItem(
+                    `Tech: ${data.post.slice(0, 80)}`,
+                    "bg-purple-50 text-purple-700"
+                );
+            } else {
+                addFeedItem(
+                    `Skipped: ${data.post.slice(0, 80)}`,
+                    "bg-gray-50 text-gray-500"
+                );
+            }
+            updateProgress();
+        });
+        onEvent("scored", (data) => {
+            counts.scored += 1;
+            setLive("liveStatus", "Scoring engagement potential...");
+            addFeedItem(`Scored ${data.score}/10`, "bg-gray-100 text-gray-700");
+            updateProgress();
+        });
+        onEvent("best", (data) => {
+            document.getElementById("liveBestEmpty").classList.add("hidden");
+            document.getElementById("liveBest").classList.remove("hidden");
+            setLive("liveBestText", data.post);
+            setLive("liveBestStats", data.stats);
+            setLive("liveBestScore", `${data.score}/10`);
+            const categories = document.getElementById("liveBestCategories");
+            categories.innerHTML = "";
+            data.categories.forEach((category) => {
+                const badge = document.createElement("span");
+                badge.className =
+                    "px-2 py-1 bg-purple-100 text-purple-700 text-xs font-medium rounded-full";
+                badge.textContent = category;
+                categories.appendChild(badge);
+            });
+        });
+        onEvent("reply", (data) => {
+            setLive("liveStatus", "Drafting...");
+            showDraft("liveReplyDraft", data.variants);
+        });
+        onEvent("post", (data) => {
+            setLive("liveStatus", "Drafting...");
+            showDraft("livePostDraft", data.variants);
+        });
+        onEvent("done", (data) => {
+            // Close first, or EventSource reconnects and starts another run
+            source.close();
+            setLive("liveStatus", "Analysis complete. Loading results...");
+            window.location.href = data.redirect;
+        });
+        onEvent("failed", (data) => {
+            source.close();
+            setLive("liveStatus", data.message);
+            showNotification(data.message);
+        });
+        source.onerror = function () {
+            // The connection dropped; reconnecting would start the analysis over
+            if (source.readyState !== EventSource.CLOSED) {
+                source.close();
+                setLive("liveStatus", "Lost connection to the analysis.");
+                showNotification("Lost connection to the analysis.");
+            }
+        };
+    }
+
     // Handle tabs for reply vs new post
     const tabBtns = document.querySelectorAll(".tab-btn");
     const tabContents = document.querySelectorAll(".tab-content");
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Tech Pre-filter Module
+This module provides a small local naive Bayes classifier that screens tweets before
+they reach the LLM tech classifier. Clear positives and clear negatives are decided
+locally; only the uncertain middle band costs an API call.
+"""
+import os
+import re
+import math
+from typing import Dict, List, Tuple, Iterable
+
+# Probability thresholds for deciding a tweet locally
+DEFAULT_REJECT_BELOW = float(os.getenv("PREFILTER_REJECT_BELOW", "0.1"))
+DEFAULT_ACCEPT_ABOVE = float(os.getenv("PREFILTER_ACCEPT_ABOVE", "0.95"))
+
+# Pseudo-counts given to each seed keyword so the model is usable before any training data exists
+SEED_WEIGHT = 3
+
+# Seed keywords for technology tweets, grouped by the category reported for local accepts
+TECH_KEYWORDS = {
+    "AI/ML": ["ai", "ml", "llm", "llms", "gpt", "openai", "anthropic", "model", "models", "inference",
+              "agents", "transformer", "training", "dataset", "chatgpt", "claude", "gemini"],
+    "Startups": ["startup", "startups", "founder", "founders", "vc", "vcs", "funding", "yc", "saas",
+                 "seed", "raised", "valuation", "arr", "mrr", "fundraising", "investors"],
+    "Software Development": ["code", "coding", "developer", "developers", "programming", "python",
+                             "javascript", "typescript", "react", "rust", "golang", "api", "apis",
+                             "github", "database", "frontend", "backend", "devops", "bug", "deploy",
+                             "open-source", "framework", "compiler", "engineers", "engineering"],
+    "Cloud": ["cloud", "aws", "azure", "gcp", "kubernetes", "serverless", "infra", "infrastructure"],
+    "Hardware": ["gpu", "gpus", "nvidia", "chip", "chips", "hardware", "silicon", "semiconductor"],
+    "Security": ["security", "cybersecurity", "breach", "vulnerability", "exploit", "malware"],
+}
+
+# Seed keywords for tweets that are clearly not about technology
+NON_TECH_KEYWORDS = [
+    "match", "goal", "goals", "league", "nba", "nfl", "football", "soccer", "cricket", "playoffs",
+    "championship", "coach", "season", "election", "vote", "voters", "president", "senate",
+    "congress", "democrats", "republicans", "lol", "lmao", "meme", "movie", "album", "song",
+    "concert", "celebrity", "recipe", "weather", "church", "prayer", "wedding", "birthday",
+]
+
+TOKEN_PATTERN = re.compile(r"[a-z][a-z0-9+#-]*")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens, dropping URLs and @mentions"""
+    text = re.sub(r"https?://\S+|@\w+", " ", text.lower())
+    return [token.strip("-") for token in TOKEN_PATTERN.findall(text)]
+
+
+class TechPrefilter:
+    """Multinomial naive Bayes tech/non-tech scorer with a three-way routing decision"""
+
+    def __init__(self, reject_below: float = DEFAULT_REJECT_BELOW, accept_above: float = DEFAULT_ACCEPT_ABOVE,
+                 alpha: float = 1.0):
+        if not 0 <= reject_below < accept_above <= 1:
+            raise ValueError("Pre-filter thresholds must satisfy 0 <= reject_below < accept_above <= 1")
+
+        self.reject_below = reject_below
+        self.accept_above = accept_above
+        self.alpha = alpha
+        self.stats = {"accepted": 0, "rejected": 0, "uncertain": 0}
+        self.train([])
+
+    def train(self, examples: Iterable[Tuple[str, bool]]) -> int:
+        """Fit the model on (post text, is_tech) pairs on top of the seed keywords
+
+        Returns the number of labeled examples used.
+        """
+        self.word_counts = {True: {}, False: {}}
+        self.doc_counts = {True: 1, False: 1}
+
+        for keywords in TECH_KEYWORDS.values():
+            for keyword in keywords:
+                self.word_counts[True][keyword] = self.word_counts[True].get(keyword, 0) + SEED_WEIGHT
+        for keyword in NON_TECH_KEYWORDS:
+            self.word_counts[False][keyword] = self.word_counts[False].get(keyword, 0) + SEED_WEIGHT
+
+        trained = 0
+        for text, is_tech in examples:
+            label = bool(is_tech)
+            self.doc_counts[label] += 1
+            for token in tokenize(text):
+                self.word_counts[label][token] = self.word_counts[label].get(token, 0) + 1
+            trained += 1
+
+        self.vocabulary = set(self.word_counts[True]) | set(self.word_counts[False])
+        self.totals = {label: sum(counts.values()) for label, counts in self.word_counts.items()}
+        return trained
+
+    def predict_proba(self, text: str) -> float:
+        """Return the probability that ``text`` is technology-related"""
+        log_odds = math.log(self.doc_counts[True] / self.doc_counts[False])
+        vocabulary_size = len(self.vocabulary)
+
+        # Words the model has never seen carry no evidence either way
+        for token in tokenize(text):
+            if token not in self.vocabulary:
+                continue
+            tech_likelihood = (self.word_counts[True].get(token, 0) + self.alpha) / (self.totals[True] + self.alpha * vocabulary_size)
+            other_likelihood = (self.word_counts[False].get(token, 0) + self.alpha) / (self.totals[False] + self.alpha * vocabulary_size)
+            log_odds += math.log(tech_likelihood / other_likelihood)
+
+        # Clamp before exponentiating to avoid overflow on very long tweets
+        log_odds = max(-50.0, min(50.0, log_odds))
+        return 1 / (1 + math.exp(-log_odds))
+
+    def route(self, text: str) -> Tuple[str, float]:
+        """Decide a tweet locally: returns ("accept" | "reject" | "uncertain", probability)"""
+        probability = self.predict_proba(text)
+        if probability >= self.accept_above:
+            decision = "accept"
+        elif probability <= self.reject_below:
+            decision = "reject"
+        else:
+            decision = "uncertain"
+
+        self.stats[{"accept": "accepted", "reject": "rejected", "uncertain": "uncertain"}[decision]] += 1
+        return decision, probability
+
+    def matched_categories(self, text: str) -> List[str]:
+        """Return the seed tech categories whose keywords appear in ``text``"""
+        tokens = set(tokenize(text))
+        return [category for category, keywords in TECH_KEYWORDS.items() if tokens.intersection(keywords)]
+
+    def reset_stats(self) -> Dict[str, int]:
+        """Return the routing counters collected so far and start counting from zero"""
+        stats, self.stats = self.stats, {"accepted": 0, "rejected": 0, "uncertain": 0}
+        return stats
@@ -0,0 +1,93 @@
+"""Tests for the SQLite analysis cache: hits, TTL expiry, LRU eviction and prompt-change purges"""
+import pytest
+from pydantic import BaseModel
+from agents import Agent
+
+import analysis_cache
+from analysis_cache import AnalysisCache
+
+
+class Label(BaseModel):
+    is_tech: bool
+
+
+TWEET = {"url": "https://x.com/a/status/1", "post": "Rust 2.0 ships a faster compiler"}
+
+
+def make_agent(instructions="Classify the tweet"):
+    return Agent(name="classifier", instructions=instructions, model="gpt-4o-mini", output_type=Label)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Control the time the cache sees"""
+    now = [1000.0]
+    monkeypatch.setattr(analysis_cache.time, "time", lambda: now[0])
+    return now
+
+
+def test_round_trip_counts_hits_and_misses(tmp_path):
+    cache = AnalysisCache(path=tmp_path / "cache.db")
+    agent = make_agent()
+
+    assert cache.get(agent, TWEET) is None
+    cache.set(agent, TWEET, Label(is_tech=True))
+
+    assert cache.get(agent, TWEET) == Label(is_tech=True)
+    assert cache.stats()["agents"]["classifier"] == {"hits": 1, "misses": 1}
+
+
+def test_key_includes_post_text(tmp_path):
+    cache = AnalysisCache(path=tmp_path / "cache.db")
+    agent = make_agent()
+    cache.set(agent, TWEET, Label(is_tech=True))
+
+    assert cache.get(agent, dict(TWEET, post="Edited post")) is None
+
+
+def test_entries_expire_after_ttl(tmp_path, clock):
+    cache = AnalysisCache(path=tmp_path / "cache.db", ttl_seconds=60)
+    agent = make_agent()
+    cache.set(agent, TWEET, Label(is_tech=True))
+
+    clock[0] += 59
+    assert cache.get(agent, TWEET) is not None
+    clock[0] += 2
+    assert cache.get(agent, TWEET) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path, clock):
+    cache = AnalysisCache(path=tmp_path / "cache.db", max_entries=2)
+    agent = make_agent()
+    tweets = [{"url": f"https://x.com/a/status/{i}", "post": f"post {i}"} for i in range(3)]
+
+    for tweet in tweets[:2]:
+        clock[0] += 1
+        cache.set(agent, tweet, Label(is_tech=True))
+    # Touch the oldest entry so the second one becomes least recently used
+    clock[0] += 1
+    cache.get(agent, tweets[0])
+    clock[0] += 1
+    cache.set(agent, tweets[2], Label(is_tech=False))
+
+    assert cache.get(agent, tweets[0]) is not None
+    assert cache.get(agent, tweets[1]) is None
+    assert cache.get(agent, tweets[2]) is not None
+
+
+def test_changed_instructions_purge_old_entries(tmp_path):
+    path = tmp_path / "cache.db"
+    AnalysisCache(path=path).set(make_agent(), TWEET, Label(is_tech=True))
+
+    cache = AnalysisCache(path=path)
+    assert cache.get(make_agent("Classify the tweet strictly"), TWEET) is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_labeled_outputs_returns_current_version_only(tmp_path):
+    cache = AnalysisCache(path=tmp_path / "cache.db")
+    agent = make_agent()
+    cache.set(agent, TWEET, Label(is_tech=True))
+
+    assert cache.labeled_outputs(agent) == [(TWEET["post"], Label(is_tech=True))]
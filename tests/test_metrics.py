@@ -0,0 +1,41 @@
+"""Tests for per-run agent metrics and their roll-up into the process-wide metrics"""
+from types import SimpleNamespace
+
+from metrics import AgentMetrics
+
+
+def usage(input_tokens, output_tokens):
+    return SimpleNamespace(requests=1, input_tokens=input_tokens, output_tokens=output_tokens)
+
+
+def test_run_metrics_forward_every_observation_to_the_parent():
+    shared = AgentMetrics()
+    run = AgentMetrics(parent=shared)
+
+    run.observe_call("tech_classifier", 0.4, usage=usage(100, 20))
+    run.observe_call("tech_classifier", 3.0, error=True)
+    run.observe_retry("tech_classifier")
+    run.observe_hedge("tech_classifier")
+    run.observe_hedge_win("tech_classifier")
+    run.observe_cache("tech_classifier", hit=True)
+
+    assert run.report()["agents"] == shared.report()["agents"]
+    totals = shared.report()["totals"]
+    assert totals["calls"] == 2
+    assert totals["errors"] == 1
+    assert totals["input_tokens"] == 100
+    assert totals["cache_hits"] == 1
+
+
+def test_concurrent_runs_only_report_their_own_calls():
+    shared = AgentMetrics()
+    first, second = AgentMetrics(parent=shared), AgentMetrics(parent=shared)
+
+    first.observe_call("tech_classifier", 0.5)
+    second.observe_call("engagement_scorer", 1.5)
+    second.observe_call("engagement_scorer", 2.5)
+
+    assert list(first.report()["agents"]) == ["tech_classifier"]
+    assert second.report()["agents"]["engagement_scorer"]["latency_seconds"]["avg"] == 2.0
+    assert shared.report()["totals"]["calls"] == 3
+    assert 'agent_calls_total{agent="engagement_scorer"} 2' in shared.to_prometheus()
@@ -0,0 +1,67 @@
+"""Tests for post normalization and MinHash-LSH near-duplicate grouping"""
+import pytest
+
+from near_duplicates import NearDuplicateIndex, normalize, features, MIN_TOKENS
+
+POST = "OpenAI just released a new open source model for code review that runs on a laptop"
+
+
+def tweet(post, likes=0):
+    return {"post": post, "stats": {"likes": likes}}
+
+
+def test_normalize_strips_retweet_prefix_mentions_links_and_punctuation():
+    text = "RT @dev: Rust 2.0 is out!! https://t.co/abc pic.twitter.com/xyz"
+
+    assert normalize(text) == ["rust", "2", "0", "is", "out"]
+
+
+def test_features_are_words_and_word_pairs_and_skip_short_posts():
+    assert sorted(features("ship it now please")) == sorted([
+        "ship", "it", "now", "please", "ship it", "it now", "now please"
+    ])
+    assert features(" ".join(["word"] * (MIN_TOKENS - 1))) == []
+
+
+def test_retweets_and_link_copies_group_with_the_original():
+    tweets = [
+        tweet(POST),
+        tweet("Completely unrelated thoughts about sourdough bread and weekend hiking plans"),
+        tweet(f"RT @someone: {POST}"),
+        tweet(f"{POST} https://t.co/abc123"),
+    ]
+
+    groups = NearDuplicateIndex().group(tweets)
+
+    assert sorted(sorted(group) for group in groups) == [[0, 2, 3], [1]]
+
+
+def test_short_posts_are_never_grouped():
+    tweets = [tweet("So true"), tweet("So true"), tweet("so true!")]
+
+    assert NearDuplicateIndex().group(tweets) == [[0], [1], [2]]
+
+
+def test_representative_is_the_most_engaged_copy_and_groups_keep_tweet_order():
+    tweets = [
+        tweet("Completely unrelated thoughts about sourdough bread and weekend hiking plans", likes=1),
+        tweet(POST, likes=5),
+        tweet(f"RT @someone: {POST}", likes=50),
+    ]
+
+    assert NearDuplicateIndex().group(tweets) == [[0], [2, 1]]
+
+
+def test_every_tweet_lands_in_exactly_one_group():
+    tweets = [tweet(f"{POST} version {index % 7}") for index in range(40)] + [tweet("")]
+
+    groups = NearDuplicateIndex().group(tweets)
+
+    assert sorted(index for group in groups for index in group) == list(range(len(tweets)))
+
+
+def test_threshold_must_be_a_similarity():
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(threshold=0)
+    with pytest.raises(ValueError):
+        NearDuplicateIndex(threshold=1.5)
@@ -0,0 +1,73 @@
+"""Tests for token counting, truncation, comment dedupe and budgeted prompt building"""
+from prompt_builder import PromptBuilder, count_tokens, truncate_to_tokens, dedupe_comments
+
+
+def test_count_tokens_counts_words_by_length_and_punctuation_singly():
+    assert count_tokens("") == 0
+    assert count_tokens("hi all") == 2
+    assert count_tokens("hi there") == 3
+    assert count_tokens("internationalization") == 5
+    assert count_tokens("wow!!") == 3
+
+
+def test_truncate_leaves_short_text_alone():
+    assert truncate_to_tokens("short text", 10) == "short text"
+
+
+def test_truncate_cuts_at_the_budget_and_marks_the_cut():
+    # "three" is five characters, so it costs two tokens and would exceed a budget of 3
+    truncated = truncate_to_tokens("one two three four", 3)
+
+    assert truncated == "one two…"
+
+
+def test_truncate_to_zero_keeps_only_the_marker():
+    assert truncate_to_tokens("anything at all", 0) == "…"
+
+
+def test_dedupe_drops_empty_repeated_and_near_identical_comments():
+    post = "Rust 2.0 ships a faster compiler"
+    comments = [
+        "Rust 2.0 ships a faster compiler!",
+        "   ",
+        "Finally, faster builds",
+        "finally faster builds",
+        "Does it break macros?",
+    ]
+
+    assert dedupe_comments(comments, post) == ["Finally, faster builds", "Does it break macros?"]
+
+
+def test_build_stays_within_budget_and_records_savings():
+    builder = PromptBuilder(budgets={"Scorer": 40})
+    comments = [f"comment number {i} with some extra words to pad it" for i in range(10)]
+
+    prompt = builder.build("Scorer", [("Tweet", "A post")], comments, max_comments=10)
+
+    assert count_tokens(prompt) <= 40
+    assert prompt.startswith("Tweet: A post\nComments: comment number 0")
+    report = builder.report()["Scorer"]
+    assert report["prompts"] == 1
+    assert report["tokens_saved"] > 0
+
+
+def test_build_truncates_overlong_fields_to_half_the_budget():
+    builder = PromptBuilder(budgets={"Scorer": 20})
+
+    prompt = builder.build("Scorer", [("Tweet", "word " * 100)], [])
+
+    assert prompt.endswith("…")
+    assert count_tokens(prompt) <= 20
+
+
+def test_build_fills_dropped_repeats_with_later_distinct_comments():
+    post = "Rust 2.0 ships a faster compiler"
+    comments = [post, "Finally", "finally!", "Finally.", "Does it break macros?", "Benchmarks please", "Nice"]
+
+    prompt = PromptBuilder().build("Scorer", [("Tweet", post)], comments, post=post, max_comments=3)
+
+    assert prompt.endswith("Comments: Finally | Does it break macros? | Benchmarks please")
+
+
+def test_dedupe_stops_at_the_limit():
+    assert dedupe_comments(["a b", "a b", "c d", "e f"], limit=2) == ["a b", "c d"]
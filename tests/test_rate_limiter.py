@@ -0,0 +1,177 @@
+"""Tests for the token bucket, the AIMD concurrency controller and retry classification"""
+import asyncio
+
+import pytest
+
+import rate_limiter
+from rate_limiter import TokenBucket, AIMDController, AdaptiveRateLimiter, is_overload, is_retryable, retry_after
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def monotonic(self):
+        return self.now
+
+
+class StatusError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.response = type("Response", (), {"headers": headers or {}})()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, "monotonic", clock.monotonic)
+    return clock
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr(rate_limiter.asyncio, "sleep", fake_sleep)
+    return delays
+
+
+def test_bucket_allows_a_burst_then_paces_callers(clock, sleeps):
+    bucket = TokenBucket(rate=2, capacity=3)
+
+    async def take(count):
+        for _ in range(count):
+            await bucket.acquire()
+
+    asyncio.run(take(5))
+
+    # Three tokens are free, the fourth and fifth wait half a second per token owed
+    assert sleeps == [0.5, 1.0]
+
+
+def test_bucket_refills_over_time_up_to_capacity(clock, sleeps):
+    bucket = TokenBucket(rate=2, capacity=3)
+    asyncio.run(bucket.acquire())
+    clock.now += 60
+
+    async def take(count):
+        for _ in range(count):
+            await bucket.acquire()
+
+    asyncio.run(take(3))
+
+    assert sleeps == []
+    assert bucket.tokens == 0
+
+
+def test_aimd_grows_additively_and_stops_at_the_maximum():
+    controller = AIMDController(initial=2, maximum=3)
+    for _ in range(2):
+        controller.on_success()
+
+    assert controller.limit == pytest.approx(2 + 1 / 2 + 1 / 2.5)
+
+    for _ in range(20):
+        controller.on_success()
+
+    assert controller.limit == 3
+
+
+def test_aimd_halves_once_per_cooldown_and_respects_the_minimum(clock):
+    controller = AIMDController(initial=8, minimum=2, cooldown_seconds=2.0)
+
+    controller.on_overload()
+    controller.on_overload()
+    assert controller.limit == 4
+    assert controller.decreases == 1
+
+    clock.now += 2.5
+    controller.on_overload()
+    clock.now += 2.5
+    controller.on_overload()
+    assert controller.limit == 2
+    assert controller.decreases == 3
+
+
+def test_aimd_queues_callers_over_the_limit_until_a_slot_frees():
+    controller = AIMDController(initial=1)
+    order = []
+
+    async def worker(name):
+        await controller.acquire()
+        order.append(f"start {name}")
+        await asyncio.sleep(0)
+        order.append(f"end {name}")
+        controller.release()
+
+    async def main():
+        await asyncio.gather(worker("a"), worker("b"))
+
+    asyncio.run(main())
+
+    assert order == ["start a", "end a", "start b", "end b"]
+    assert controller.in_flight == 0
+
+
+def test_try_acquire_takes_a_free_slot_without_waiting():
+    controller = AIMDController(initial=1)
+
+    assert controller.try_acquire()
+    assert not controller.try_acquire()
+    controller.release()
+    assert controller.try_acquire()
+    assert controller.in_flight == 1
+
+
+def test_error_classification():
+    assert is_overload(StatusError(429))
+    assert is_overload(asyncio.TimeoutError())
+    assert not is_overload(StatusError(500))
+    assert is_retryable(StatusError(503))
+    assert not is_retryable(StatusError(400))
+    assert not is_retryable(ValueError("bad output"))
+    assert retry_after(StatusError(429, {"retry-after": "7"})) == 7
+    assert retry_after(StatusError(429, {"retry-after": "soon"})) == 0
+
+
+def test_limiter_retries_then_succeeds_and_backs_off_on_overload(clock, sleeps):
+    limiter = AdaptiveRateLimiter(requests_per_second=0, concurrency=AIMDController(initial=4), max_retries=3)
+    attempts = []
+
+    async def call():
+        attempts.append(len(attempts))
+        if len(attempts) < 3:
+            raise StatusError(429, {"retry-after": "5"})
+        return "ok"
+
+    assert asyncio.run(limiter.run(call)) == "ok"
+    assert len(attempts) == 3
+    assert limiter.retries == 2
+    # Backoff never undercuts the server's Retry-After
+    assert all(delay >= 5 for delay in sleeps)
+    assert limiter.concurrency.decreases == 1
+    assert limiter.concurrency.in_flight == 0
+
+
+def test_limiter_gives_up_after_max_retries_and_does_not_retry_other_errors(sleeps):
+    limiter = AdaptiveRateLimiter(requests_per_second=0, max_retries=2)
+
+    async def overloaded():
+        raise StatusError(503)
+
+    async def broken():
+        raise ValueError("bad output")
+
+    with pytest.raises(StatusError):
+        asyncio.run(limiter.run(overloaded))
+    assert limiter.retries == 2
+    assert limiter.gave_up == 1
+
+    with pytest.raises(ValueError):
+        asyncio.run(limiter.run(broken))
+    assert limiter.retries == 2
+    assert limiter.gave_up == 1
@@ -0,0 +1,94 @@
+"""Tests for the slotted tweet record that replaces per-tweet dicts in the analyzer"""
+import pytest
+
+import tweet_record
+from tweet_record import TweetRecord, as_record, intern_strings
+
+DATA = {
+    "url": "https://x.com/dev/status/1",
+    "post": "Rust 2.0 ships a faster compiler",
+    "stats": {"replies": 3, "reposts": 1, "likes": 40, "bookmarks": 0, "views": 900},
+    "comments": ["Finally", "Does it break macros?"],
+}
+
+
+def test_round_trips_a_data_json_entry():
+    record = TweetRecord.from_dict(DATA)
+
+    assert record.to_dict() == DATA
+    assert record['post'] == DATA['post']
+    assert record.comment_count == 2
+
+
+def test_stats_are_normalized_from_labels_and_partial_dicts():
+    assert TweetRecord("u", "p", "12 replies, 1.2K likes").stats["likes"] == 1200
+    assert TweetRecord("u", "p", {"likes": "7"}).stats == {"replies": 0, "reposts": 0, "likes": 7,
+                                                           "bookmarks": 0, "views": 0}
+    assert TweetRecord("u", "p").stats["views"] == 0
+
+
+def test_comments_are_capped_but_the_scraped_count_is_kept(monkeypatch):
+    monkeypatch.setattr(tweet_record, "MAX_STORED_COMMENTS", 3)
+    record = TweetRecord("u", "p", comments=[f"comment {index}" for index in range(10)])
+
+    assert record.comments == ("comment 0", "comment 1", "comment 2")
+    assert record.comment_count == 10
+    assert record['comment_count'] == 10
+
+
+def test_unknown_keys_are_kept_as_extras_and_written_back():
+    record = TweetRecord.from_dict({**DATA, "stats_raw": "3 replies, 1 repost, 40 likes"})
+
+    assert record['stats_raw'] == "3 replies, 1 repost, 40 likes"
+    assert record.to_dict()['stats_raw'] == "3 replies, 1 repost, 40 likes"
+    assert TweetRecord.from_dict(DATA).extra is None
+
+
+def test_analysis_keys_read_as_missing_until_set_and_after_clearing():
+    record = TweetRecord.from_dict(DATA)
+
+    assert 'tech_analysis' not in record
+    assert record.get('engagement_score') is None
+    with pytest.raises(KeyError):
+        record['duplicate_of']
+
+    record['tech_analysis'] = {"is_tech_related": True}
+    record['engagement_score'] = {"score": 7}
+    assert 'tech_analysis' in record
+    assert record['engagement_score'] == {"score": 7}
+    # Analysis results never leak into data.json
+    assert 'tech_analysis' not in record.to_dict()
+
+    record.clear_analysis()
+    assert 'tech_analysis' not in record
+    assert 'engagement_score' not in record
+
+
+def test_missing_keys_raise_and_get_falls_back_to_the_default():
+    record = TweetRecord.from_dict(DATA)
+
+    with pytest.raises(KeyError):
+        record['nope']
+    assert record.get('nope', "fallback") == "fallback"
+    assert 'nope' not in record
+
+
+def test_records_have_no_instance_dict():
+    with pytest.raises(AttributeError):
+        TweetRecord.from_dict(DATA).unexpected = True
+
+
+def test_as_record_reuses_records_and_converts_dicts():
+    record = TweetRecord.from_dict(DATA)
+
+    assert as_record(record) is record
+    converted = as_record(DATA)
+    assert isinstance(converted, TweetRecord)
+    assert converted.to_dict() == DATA
+
+
+def test_intern_strings_shares_one_copy_of_each_label():
+    first = intern_strings(["".join(["Artificial ", "Intelligence"])])
+    second = intern_strings(["".join(["Artificial", " Intelligence"])])
+
+    assert first[0] is second[0]
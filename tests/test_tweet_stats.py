@@ -0,0 +1,68 @@
+"""Tests for parsing scraped stats labels and formatting counts"""
+import pytest
+
+from tweet_stats import parse_count, parse_stats, normalize_stats, format_count, format_stats, stats_label
+
+
+@pytest.mark.parametrize("number, suffix, expected", [
+    ("950", None, 950),
+    ("1,234", None, 1234),
+    ("1.234.567", None, 1234567),
+    ("10 000", None, 10000),
+    ("10 000", None, 10000),
+    ("1.2", "K", 1200),
+    ("10", "K", 10000),
+    ("3.4", "M", 3400000),
+    ("1", "B", 1000000000),
+    ("1,5", "Mio", 1500000),
+    ("2,3", "Mrd", 2300000000),
+    ("12", "Tsd", 12000),
+    ("3,5", None, 4),
+])
+def test_parse_count_handles_abbreviations_and_locale_formats(number, suffix, expected):
+    assert parse_count(number, suffix) == expected
+
+
+def test_parse_stats_reads_every_field_from_an_english_label():
+    label = "12 replies, 30 reposts, 1,204 likes, 2 bookmarks, 10K views"
+
+    assert parse_stats(label) == {"replies": 12, "reposts": 30, "likes": 1204, "bookmarks": 2, "views": 10000}
+
+
+def test_parse_stats_understands_singulars_old_names_and_locale_suffixes():
+    label = "1 reply, 4 retweets, 1,5 Mio. likes, 2.3M views"
+
+    assert parse_stats(label) == {"replies": 1, "reposts": 4, "likes": 1500000, "bookmarks": 0, "views": 2300000}
+
+
+def test_parse_stats_defaults_missing_fields_to_zero():
+    assert parse_stats(None) == dict.fromkeys(("replies", "reposts", "likes", "bookmarks", "views"), 0)
+    assert parse_stats("5 likes, 3 followers") == {"replies": 0, "reposts": 0, "likes": 5, "bookmarks": 0, "views": 0}
+
+
+def test_normalize_accepts_parsed_dicts_raw_labels_and_junk():
+    assert normalize_stats({"likes": "7", "views": None}) == {"replies": 0, "reposts": 0, "likes": 7,
+                                                              "bookmarks": 0, "views": 0}
+    assert normalize_stats("3 replies")["replies"] == 3
+    assert normalize_stats(42) == parse_stats(None)
+
+
+@pytest.mark.parametrize("count, expected", [
+    (950, "950"), (1000, "1K"), (1234, "1.2K"), (10400, "10K"), (3400000, "3.4M"), (2000000000, "2B"),
+])
+def test_format_count_abbreviates_like_x(count, expected):
+    assert format_count(count) == expected
+
+
+def test_format_stats_drops_zero_counts_and_uses_singulars():
+    stats = {"replies": 1, "reposts": 0, "likes": 1234, "bookmarks": 0, "views": 10400}
+
+    assert format_stats(stats) == "1 reply, 1234 likes, 10400 views"
+    assert format_stats(stats, abbreviate=True) == "1 reply, 1.2K likes, 10K views"
+    assert format_stats({}) == "no engagement yet"
+
+
+def test_stats_label_round_trips_through_parse_stats():
+    stats = {"replies": 1, "reposts": 30, "likes": 1204, "bookmarks": 0, "views": 10000}
+
+    assert parse_stats(stats_label(stats)) == stats
@@ -0,0 +1,93 @@
+"""Tests for near-duplicate fan-out, per-call stage counters and hedging, run against the offline fake model"""
+import asyncio
+import contextlib
+import io
+
+import pytest
+from agents import set_tracing_disabled
+
+from analysis_cache import AnalysisCache
+from benchmarks.fake_model import FakeModelProvider
+from near_duplicates import NearDuplicateIndex
+from rate_limiter import AdaptiveRateLimiter, AIMDController
+from twitter_analyzer import TwitterAnalyzer
+
+set_tracing_disabled(True)
+
+SHARED_URL = "https://x.com/dev/status/1"
+AI_POST = "OpenAI released a new AI model for code review and the benchmark results look strong"
+CLOUD_POST = "Our Kubernetes cluster on AWS cut cloud costs in half after moving to serverless"
+
+
+def tweet(url, post, likes=0):
+    return {"url": url, "post": post, "stats": {"likes": likes}, "comments": []}
+
+
+@pytest.fixture
+def analyzer(tmp_path):
+    return TwitterAnalyzer(cache=AnalysisCache(path=tmp_path / "cache.db"),
+                           model_provider=FakeModelProvider(time_scale=0.001),
+                           deduplicator=NearDuplicateIndex())
+
+
+def classify(analyzer, tweets, **options):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return asyncio.run(analyzer.classify_and_score(tweets, max_concurrency=4, **options))
+
+
+@pytest.mark.parametrize("options", [{}, {"pipelined": True}, {"analysis_mode": "fused"}])
+def test_distinct_posts_sharing_a_url_keep_their_own_analysis(analyzer, options):
+    tweets = [
+        tweet(SHARED_URL, AI_POST),
+        tweet(SHARED_URL, CLOUD_POST),
+        tweet("https://x.com/fan/status/2", f"RT @dev: {AI_POST}"),
+    ]
+
+    tech_tweets, _ = classify(analyzer, tweets, **options)
+
+    assert [tweet['post'] for tweet in tech_tweets] == [tweet['post'] for tweet in tweets]
+    assert len({id(tweet) for tweet in tech_tweets}) == 3
+    assert "Cloud" in tech_tweets[1]['tech_analysis'].tech_categories
+    assert tech_tweets[2]['tech_analysis'] is tech_tweets[0]['tech_analysis']
+    assert tech_tweets[2]['duplicate_of'] == SHARED_URL
+    assert 'duplicate_of' not in tech_tweets[1]
+
+
+def test_concurrent_calls_report_their_own_stage_counters(analyzer):
+    first = [tweet(f"https://x.com/a/status/{index}", AI_POST if index % 2 else CLOUD_POST) for index in range(6)]
+    second = [tweet(f"https://x.com/b/status/{index}", f"{CLOUD_POST} part {index}") for index in range(3)]
+    first_reports, second_reports = {}, {}
+
+    async def main():
+        await asyncio.gather(
+            analyzer.classify_and_score(first, shortlist=1, reports=first_reports),
+            analyzer.classify_and_score(second, reports=second_reports)
+        )
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(main())
+
+    assert first_reports["dedupe"] == {"tweets": 6, "groups": 2, "duplicates_collapsed": 4}
+    assert first_reports["shortlist"] == {"candidates": 2, "shortlisted": 1, "scorer_calls_avoided": 1}
+    assert second_reports["dedupe"]["duplicates_collapsed"] == second_reports["dedupe"]["tweets"] - 1
+    assert "shortlist" not in second_reports
+
+
+@pytest.mark.parametrize("limit, hedged", [(1, False), (2, True)])
+def test_hedges_only_start_when_the_concurrency_limit_has_a_free_slot(tmp_path, limit, hedged):
+    controller = AIMDController(initial=limit, maximum=limit)
+    analyzer = TwitterAnalyzer(cache=AnalysisCache(path=tmp_path / "cache.db"),
+                               model_provider=FakeModelProvider(time_scale=0.01),
+                               rate_limiter=AdaptiveRateLimiter(requests_per_second=0, concurrency=controller),
+                               hedged_agents=["tech_classifier"])
+    # Enough fast history that every fake call runs past the p95 and asks for a hedge
+    for _ in range(100):
+        analyzer.metrics.observe_call(analyzer.tech_classifier.name, 0.0001)
+    tweets = [tweet(f"https://x.com/a/status/{index}", f"{AI_POST} number {index}") for index in range(3)]
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        asyncio.run(analyzer.classify_tech_tweets(tweets))
+
+    hedges = analyzer.metrics.report()["agents"][analyzer.tech_classifier.name]["hedges"]
+    assert (hedges == 3) if hedged else (hedges == 0)
+    assert controller.in_flight == 0
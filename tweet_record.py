@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Tweet Record Module
+This module provides the compact record the analyzer passes through its stages in
+place of per-tweet dicts. Records use ``__slots__``, keep stats as a tuple of counts,
+store at most TWEET_MAX_COMMENTS comments and receive analysis results in place
+instead of being copied for every stage.
+"""
+import os
+import sys
+from typing import Dict, List, Optional, Any, Iterable
+
+from tweet_stats import STAT_FIELDS, normalize_stats
+
+# Comments kept per tweet; prompts use at most 10, the rest leave room for dropped repeats
+MAX_STORED_COMMENTS = int(os.getenv("TWEET_MAX_COMMENTS", "20"))
+
+# Keys stored in slots; analysis results read as missing until a stage sets them
+SCRAPED_KEYS = ("url", "post", "stats", "comments", "comment_count")
+ANALYSIS_KEYS = ("tech_analysis", "engagement_score", "duplicate_of")
+
+
+class TweetRecord:
+    """A scraped tweet plus the analysis results attached to it
+
+    Records read and write like the dicts they replace (``tweet['post']``,
+    ``tweet.get('stats')``, ``'tech_analysis' in tweet``), so caches, rankers and
+    prompt builders accept either. Keys outside the known fields, such as
+    ``stats_raw``, are kept in a small dict that only exists when needed.
+    """
+
+    __slots__ = ("url", "post", "_stats", "comments", "comment_count",
+                 "tech_analysis", "engagement_score", "duplicate_of", "extra")
+
+    def __init__(self, url: str, post: str, stats: Any = None, comments: Iterable[str] = (),
+                 comment_count: Optional[int] = None, extra: Optional[Dict[str, Any]] = None):
+        self.url = url
+        self.post = post
+        self.stats = stats
+        comments = tuple(comments)
+        # Rankers still see how many comments were scraped after storage is capped
+        self.comment_count = len(comments) if comment_count is None else comment_count
+        self.comments = comments[:MAX_STORED_COMMENTS]
+        self.tech_analysis = None
+        self.engagement_score = None
+        self.duplicate_of = None
+        self.extra = extra or None
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TweetRecord":
+        """Build a record from a data.json entry or a tweet dict"""
+        record = cls(data.get('url', ""), data.get('post', ""), data.get('stats'), data.get('comments') or (),
+                     data.get('comment_count'))
+        for key, value in data.items():
+            if key not in SCRAPED_KEYS:
+                record[key] = value
+        return record
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the tweet in the data.json shape, with any extra keys it was loaded with"""
+        data = {"url": self.url, "post": self.post, "stats": self.stats, "comments": list(self.comments)}
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def clear_analysis(self) -> None:
+        """Forget results from an earlier analysis run"""
+        self.tech_analysis = None
+        self.engagement_score = None
+        self.duplicate_of = None
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return dict(zip(STAT_FIELDS, self._stats))
+
+    @stats.setter
+    def stats(self, value: Any) -> None:
+        stats = normalize_stats(value)
+        self._stats = tuple(stats[field] for field in STAT_FIELDS)
+
+    def __getitem__(self, key: str) -> Any:
+        if key in SCRAPED_KEYS:
+            return getattr(self, key)
+        if key in ANALYSIS_KEYS:
+            value = getattr(self, key)
+            if value is not None:
+                return value
+        elif self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in SCRAPED_KEYS or key in ANALYSIS_KEYS:
+            setattr(self, key, value)
+        else:
+            if self.extra is None:
+                self.extra = {}
+            self.extra[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        try:
+            self[key]
+        except KeyError:
+            return False
+        return True
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self) -> str:
+        return f"TweetRecord(url={self.url!r}, post={self.post[:40]!r})"
+
+
+def as_record(tweet: Any) -> TweetRecord:
+    """Return ``tweet`` itself if it is a record, otherwise a new record built from the dict"""
+    return tweet if isinstance(tweet, TweetRecord) else TweetRecord.from_dict(tweet)
+
+
+def intern_strings(values: Iterable[str]) -> List[str]:
+    """Intern repeated labels such as tech categories so every tweet shares one copy of each"""
+    return [sys.intern(value) for value in values]
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Tweet Stats Module
+This module turns the engagement stats label scraped from a tweet, such as
+"12 replies, 30 reposts, 400 likes, 2 bookmarks, 10K views", into integer counts,
+and formats counts back into short text for prompts and the UI.
+"""
+import re
+from typing import Dict, Optional, Any
+
+# Counts parsed from every stats label, in the order X lists them
+STAT_FIELDS = ("replies", "reposts", "likes", "bookmarks", "views")
+
+# Label words (singular, plural and older names) mapped to their stat field
+LABEL_WORDS = {
+    "reply": "replies", "replies": "replies",
+    "repost": "reposts", "reposts": "reposts", "retweet": "reposts", "retweets": "reposts",
+    "like": "likes", "likes": "likes",
+    "bookmark": "bookmarks", "bookmarks": "bookmarks",
+    "view": "views", "views": "views",
+}
+
+# Field names as written for a count of one
+SINGULAR = {"replies": "reply", "reposts": "repost", "likes": "like", "bookmarks": "bookmark", "views": "view"}
+
+# Abbreviation suffixes used by X and common locales, mapped to their multiplier
+SUFFIXES = {
+    "k": 10 ** 3, "tsd": 10 ** 3, "mil": 10 ** 3,
+    "m": 10 ** 6, "mio": 10 ** 6, "mn": 10 ** 6, "mln": 10 ** 6,
+    "b": 10 ** 9, "bn": 10 ** 9, "mrd": 10 ** 9,
+}
+
+# A number with optional digit grouping ("1,234", "1.234", "1 234", also with no-break
+# spaces) or decimals ("1,2"), an optional suffix ("K", "Mio."), then the word it counts
+STAT_PATTERN = re.compile(
+    r"(\d+(?:[.,\s]\d+)*)\s*(" + "|".join(sorted(SUFFIXES, key=len, reverse=True)) + r")?\.?\s+([a-z]+)",
+    re.IGNORECASE
+)
+
+
+def parse_count(number: str, suffix: Optional[str] = None) -> int:
+    """Parse a displayed count such as "1,234", "1.234", "10 000", "1.2" + "K" or "1,5" + "Mio" """
+    digits = re.sub(r"\s", "", number)
+    multiplier = SUFFIXES[suffix.lower()] if suffix else 1
+    parts = re.split(r"[.,]", digits)
+
+    if len(parts) > 1 and (multiplier > 1 or len(parts[-1]) != 3):
+        # The last separator is a decimal point: "1.2K", "1,5 Mio", "3,5"
+        value = float("".join(parts[:-1]) + "." + parts[-1])
+    else:
+        # Every separator groups thousands: "1,234", "1.234.567"
+        value = float("".join(parts))
+    return int(round(value * multiplier))
+
+
+def parse_stats(label: Optional[str]) -> Dict[str, int]:
+    """Parse a stats label into a count for every field in STAT_FIELDS
+
+    Missing fields are 0. Words are matched in English, since the scraper loads
+    X with ``lang=en``; number formats from other locales are understood.
+    """
+    stats = dict.fromkeys(STAT_FIELDS, 0)
+    for number, suffix, word in STAT_PATTERN.findall(label or ""):
+        field = LABEL_WORDS.get(word.lower())
+        if field is not None:
+            stats[field] = parse_count(number, suffix)
+    return stats
+
+
+def normalize_stats(stats: Any) -> Dict[str, int]:
+    """Return integer stats from a parsed dict or from a raw label in older data.json files"""
+    if isinstance(stats, dict):
+        return {field: int(stats.get(field) or 0) for field in STAT_FIELDS}
+    return parse_stats(stats if isinstance(stats, str) else None)
+
+
+def format_count(count: int) -> str:
+    """Abbreviate a count the way X displays it: 950, 1.2K, 10K, 3.4M"""
+    for suffix, multiplier in (("B", 10 ** 9), ("M", 10 ** 6), ("K", 10 ** 3)):
+        if count >= multiplier:
+            value = count / multiplier
+            return f"{value:.1f}".rstrip("0").rstrip(".") + suffix if value < 10 else f"{value:.0f}{suffix}"
+    return str(count)
+
+
+def format_stats(stats: Any, abbreviate: bool = False) -> str:
+    """Format stats for prompts and display, leaving out zero counts
+
+    Exact numbers are the cheaper choice for prompts: model tokenizers split "1.2K"
+    into more tokens than "1234". ``abbreviate`` gives the shorter form for the UI.
+    """
+    stats = normalize_stats(stats)
+    parts = [f"{format_count(stats[field]) if abbreviate else stats[field]} {_unit(field, stats[field])}"
+             for field in STAT_FIELDS if stats[field]]
+    return ", ".join(parts) or "no engagement yet"
+
+
+def stats_label(stats: Any) -> str:
+    """Render stats as the full aria-label X uses, the inverse of ``parse_stats``"""
+    stats = normalize_stats(stats)
+    return ", ".join(f"{stats[field]} {_unit(field, stats[field])}" for field in STAT_FIELDS)
+
+
+def _unit(field: str, count: int) -> str:
+    return SINGULAR[field] if count == 1 else field
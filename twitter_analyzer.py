@@ -1,27 +1,150 @@
 import json
 import os
 import asyncio
+import argparse
+import heapq
 import random
-from typing import Dict, List, Any
+import time
+import contextvars
+from typing import Dict, List, Any, Optional, Tuple, Callable, Awaitable, Literal
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
-from agents import Agent, Runner, trace
+from agents import Agent, Runner, RunConfig, trace
+from agents.models.interface import ModelProvider
 from agents.tool import WebSearchTool
+from analysis_cache import AnalysisCache
+from tech_prefilter import TechPrefilter
+from engagement_preranker import EngagementPreRanker
+from near_duplicates import NearDuplicateIndex
+from news_cache import NewsCache
+from prompt_builder import PromptBuilder
+from tweet_stats import format_stats
+from tweet_record import TweetRecord, as_record, intern_strings
+from metrics import AgentMetrics, write_report, METRICS_REPORT_PATH
+from rate_limiter import AdaptiveRateLimiter
 
 # Load environment variables
 load_dotenv()
 
+# Maximum number of agent calls kept in flight at once during analysis
+DEFAULT_CONCURRENCY = int(os.getenv("ANALYSIS_CONCURRENCY", "5"))
+
+# How tweets are classified and scored: "two_stage" (classifier then scorer) or "fused" (single call)
+ANALYSIS_MODES = ("two_stage", "fused")
+DEFAULT_ANALYSIS_MODE = os.getenv("ANALYSIS_MODE", "two_stage")
+
+# Whether two-stage analysis starts scoring tech tweets while classification is still running
+DEFAULT_PIPELINED = os.getenv("ANALYSIS_PIPELINE", "true").lower() in ("1", "true", "yes")
+
+# Whether clear-cut tweets are classified locally before calling the LLM
+PREFILTER_ENABLED = os.getenv("TECH_PREFILTER", "false").lower() in ("1", "true", "yes")
+
+# Whether near-duplicate tweets are analyzed once and share the result
+DEDUPE_ENABLED = os.getenv("DEDUPE_TWEETS", "true").lower() in ("1", "true", "yes")
+
+# Number of tweets packed into each classifier call (1 classifies tweets one at a time)
+DEFAULT_BATCH_SIZE = int(os.getenv("CLASSIFY_BATCH_SIZE", "1"))
+
+# Number of top-scoring tweets kept while scoring engagement; at least one is needed to pick a reply target
+DEFAULT_TOP_K = max(1, int(os.getenv("ENGAGEMENT_TOP_K", "3")))
+
+# Number of top-scoring tweets that get a reply drafted, so the user can switch targets
+DEFAULT_REPLY_CANDIDATES = int(os.getenv("REPLY_CANDIDATES", "3"))
+
+# Number of drafts returned by each reply and post generator call (1 asks for a single draft)
+DEFAULT_VARIANTS = int(os.getenv("GENERATION_VARIANTS", "1"))
+
+# Optional early-stop rules for engagement scoring (unset means score every tech tweet)
+ENGAGEMENT_STOP_SCORE = float(os.environ["ENGAGEMENT_STOP_SCORE"]) if os.getenv("ENGAGEMENT_STOP_SCORE") else None
+ENGAGEMENT_MAX_SCORED = int(os.environ["ENGAGEMENT_MAX_SCORED"]) if os.getenv("ENGAGEMENT_MAX_SCORED") else None
+
+# Number of tech tweets sent to the engagement scorer after local pre-ranking (unset scores them all)
+ENGAGEMENT_SHORTLIST = max(1, int(os.environ["ENGAGEMENT_SHORTLIST"])) if os.getenv("ENGAGEMENT_SHORTLIST") else None
+
+def parse_agent_timeouts(value: str) -> Dict[str, float]:
+    """Parse "tech_classifier=20,reply_generator=60" into a dict of seconds per agent"""
+    timeouts = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        key, _, seconds = item.partition("=")
+        timeouts[key.strip()] = float(seconds)
+    return timeouts
+
+# Per-call deadlines in seconds, keyed by analyzer agent attribute; other agents use AGENT_TIMEOUT
+DEFAULT_AGENT_TIMEOUT = float(os.getenv("AGENT_TIMEOUT", "120"))
+DEFAULT_AGENT_TIMEOUTS = {
+    "tech_classifier": 30.0,
+    "engagement_scorer": 30.0,
+    "reply_generator": 60.0,
+    "post_generator": 60.0,
+    "variant_reply_generator": 90.0,
+    "variant_post_generator": 90.0,
+    **parse_agent_timeouts(os.getenv("AGENT_TIMEOUTS", ""))
+}
+
+# Agents whose slow calls are duplicated once they run past their observed p95 latency
+DEFAULT_HEDGED_AGENTS = [key.strip() for key in os.getenv("AGENT_HEDGING", "").split(",") if key.strip()]
+
+# Progress callback of the analysis running in the current context; see TwitterAnalyzer.run_analysis
+_progress_callback: contextvars.ContextVar[Optional[Callable[[str, Dict[str, Any]], None]]] = \
+    contextvars.ContextVar("progress_callback", default=None)
+
+# Agent metrics of the analysis running in the current context; see TwitterAnalyzer.run_analysis
+_run_metrics: contextvars.ContextVar[Optional[AgentMetrics]] = contextvars.ContextVar("run_metrics", default=None)
+
+# Stage counters of the classify_and_score call running in the current context, keyed by stage
+_stage_reports: contextvars.ContextVar[Optional[Dict[str, Dict[str, int]]]] = \
+    contextvars.ContextVar("stage_reports", default=None)
+
 class TweetAnalysis(BaseModel):
     is_technology_related: bool = Field(description="Whether the tweet is technology-related")
     confidence_score: float = Field(description="Confidence score between 0 and 1")
     reasoning: str = Field(description="Reasoning for the classification")
     tech_categories: List[str] = Field(description="List of technology categories the tweet belongs to")
 
+class IndexedTweetAnalysis(TweetAnalysis):
+    index: int = Field(description="Index of the tweet in the batch this analysis belongs to")
+
+class TweetAnalysisBatch(BaseModel):
+    analyses: List[IndexedTweetAnalysis] = Field(description="One analysis for every tweet in the batch")
+
 class EngagementScore(BaseModel):
     engagement_potential: float = Field(description="Engagement potential score between 0 and 10")
     reasoning: str = Field(description="Reasoning for the engagement score")
     factors: List[str] = Field(description="Factors that contribute to engagement potential")
 
+class TweetAssessment(BaseModel):
+    is_technology_related: bool = Field(description="Whether the tweet is technology-related")
+    confidence_score: float = Field(description="Confidence score between 0 and 1")
+    reasoning: str = Field(description="Reasoning for the classification")
+    tech_categories: List[str] = Field(description="List of technology categories the tweet belongs to")
+    engagement_potential: float = Field(description="Engagement potential score between 0 and 10")
+    engagement_reasoning: str = Field(description="Reasoning for the engagement score")
+    engagement_factors: List[str] = Field(description="Factors that contribute to engagement potential")
+
+    def to_analysis(self) -> TweetAnalysis:
+        return TweetAnalysis(
+            is_technology_related=self.is_technology_related,
+            confidence_score=self.confidence_score,
+            reasoning=self.reasoning,
+            tech_categories=self.tech_categories
+        )
+
+    def to_engagement_score(self) -> EngagementScore:
+        return EngagementScore(
+            engagement_potential=self.engagement_potential,
+            reasoning=self.engagement_reasoning,
+            factors=self.engagement_factors
+        )
+
+class NewsHeadlineAnalysis(BaseModel):
+    index: int = Field(description="Index of the headline this analysis belongs to")
+    topic: str = Field(description="Main topic or tech domain of the headline")
+    sentiment: Literal["positive", "negative", "neutral"] = Field(description="Overall sentiment of the headline")
+    controversy_level: Literal["low", "medium", "high"] = Field(description="Potential controversy level")
+
+class NewsAnalysisBatch(BaseModel):
+    headlines: List[NewsHeadlineAnalysis] = Field(description="One analysis for every headline")
+
 class TweetReply(BaseModel):
     reply_text: str = Field(description="The natural, human-like reply text")
     tone: str = Field(description="Whether the reply agrees or disagrees with the tweet")
@@ -29,16 +152,66 @@ class TweetReply(BaseModel):
     humor_style: str = Field(description="The conversational style used in the reply")
     style: str = Field(description="The conversational style used in the reply")
 
+class TweetReplyVariants(BaseModel):
+    variants: List[TweetReply] = Field(description="Distinct drafts, strongest first")
+
+def _variant_dict(reply: TweetReply) -> Dict[str, str]:
+    """Return the text, tone and style of a generated draft"""
+    return {"text": reply.reply_text, "tone": reply.tone, "style": reply.humor_style}
+
 class TweetData:
     def __init__(self, data_file: str = "data.json"):
         with open(data_file, 'r', encoding='utf-8') as f:
-            self.tweets = json.load(f)
+            # Records parse stats labels from older data.json files into counts as they load
+            self.tweets = [TweetRecord.from_dict(tweet) for tweet in json.load(f)]
     
-    def get_tweets(self) -> List[Dict[str, Any]]:
+    def get_tweets(self) -> List[TweetRecord]:
         return self.tweets
 
 class TwitterAnalyzer:
-    def __init__(self):
+    def __init__(self, cache: Optional[AnalysisCache] = None, analysis_mode: str = DEFAULT_ANALYSIS_MODE,
+                 prefilter: Optional[TechPrefilter] = None, pipelined: bool = DEFAULT_PIPELINED,
+                 news_cache: Optional[NewsCache] = None, prompt_builder: Optional[PromptBuilder] = None,
+                 metrics: Optional[AgentMetrics] = None, rate_limiter: Optional[AdaptiveRateLimiter] = None,
+                 timeouts: Optional[Dict[str, float]] = None, hedged_agents: Optional[List[str]] = None,
+                 model_provider: Optional[ModelProvider] = None, preranker: Optional[EngagementPreRanker] = None,
+                 deduplicator: Optional[NearDuplicateIndex] = None):
+        # Optional on-disk cache of classifier and scorer outputs
+        self.cache = cache
+        
+        # Optional shared snapshot of recent tech news used by the post generator
+        self.news_cache = news_cache
+        
+        # Overlap the classification and scoring stages in two-stage mode
+        self.pipelined = pipelined
+        
+        # Optional stand-in for the OpenAI models, e.g. the offline fake used by the benchmarks
+        self.run_config = RunConfig(model_provider=model_provider) if model_provider is not None else None
+        
+        # Latency, token, error and cache-hit counters for every agent call
+        self.metrics = metrics or AgentMetrics()
+        
+        # Paces agent calls to the account's limits and retries rate-limited or failed calls
+        self.rate_limiter = rate_limiter or AdaptiveRateLimiter()
+        
+        # Builds token-budgeted tweet prompts and tracks tokens sent per agent
+        self.prompt_builder = prompt_builder or PromptBuilder()
+        
+        # Optional local pre-filter that decides clear-cut tweets without an LLM call
+        self.prefilter = prefilter
+        
+        # Local NumPy ranking that picks which tech tweets reach the engagement scorer
+        self.preranker = preranker or EngagementPreRanker()
+        
+        # MinHash-LSH grouping so near-duplicate tweets are classified and scored once; the app and CLI
+        # pass one unless DEDUPE_TWEETS=false, and None turns grouping off
+        self.deduplicator = deduplicator
+        
+        # "two_stage" (classifier then scorer) or "fused" (one combined call per tweet)
+        if analysis_mode not in ANALYSIS_MODES:
+            raise ValueError(f"Unknown analysis mode: {analysis_mode}")
+        self.analysis_mode = analysis_mode
+        
         # Web Search Tool for fetching tech news
         self.web_search_tool = WebSearchTool(
             search_context_size="medium"  # Options: "low", "medium", "high"
@@ -64,6 +237,17 @@ class TwitterAnalyzer:
             model="gpt-4o"
         )
         
+        # Batched variant of the classifier that analyzes several numbered tweets per call
+        self.batch_tech_classifier = self.tech_classifier.clone(
+            name="Batch Tech Tweet Classifier",
+            instructions=self.tech_classifier.instructions + """
+            
+            You will receive several tweets, each prefixed with its index in square brackets, e.g. [0].
+            Classify every tweet independently and return exactly one analysis per tweet,
+            setting its index field to the number shown before that tweet.""",
+            output_type=TweetAnalysisBatch
+        )
+        
         # Engagement Scoring Agent
         self.engagement_scorer = Agent(
             name="Engagement Potential Scorer",
@@ -91,6 +275,33 @@ class TwitterAnalyzer:
             model="gpt-4o"
         )
         
+        # Fused agent that classifies and scores a tweet in a single call
+        self.tweet_assessor = Agent(
+            name="Tech Tweet Assessor",
+            instructions=f"""You perform two assessments of each tweet in a single pass.
+            
+            First, classification:
+            {self.tech_classifier.instructions}
+            
+            Second, engagement scoring (fill the engagement_* fields; only meaningful for tech tweets):
+            {self.engagement_scorer.instructions}""",
+            output_type=TweetAssessment,
+            model="gpt-4o"
+        )
+        
+        # Tech News Analyzer Agent that categorizes a numbered list of headlines in one call
+        self.tech_news_analyzer = Agent(
+            name="Tech News Analyzer",
+            instructions="""Analyze these tech news headlines and provide structured information about each one.
+            Each headline is prefixed with its index in square brackets, e.g. [0].
+            For every headline, extract the main topic, categorize it by tech domain, assess its sentiment
+            (positive/negative/neutral), and rate the potential controversy level (low/medium/high).
+            Return exactly one analysis per headline, setting its index field to the number shown before it.
+            """,
+            output_type=NewsAnalysisBatch,
+            model="gpt-4o"
+        )
+        
         # Post Generator Agent
         self.post_generator = Agent(
             name="Tech Thought Leadership Post Generator",
@@ -151,77 +362,823 @@ class TwitterAnalyzer:
             output_type=TweetReply,
             model="gpt-4o"
         )
+        
+        # Variant versions of the generators that return several distinct drafts per call
+        variant_instructions = """
+            
+            You will be asked for a number of variants. Return exactly that many drafts, strongest first.
+            Each variant must take a clearly different angle, tone or style rather than rephrasing another."""
+        self.variant_reply_generator = self.reply_generator.clone(
+            name="Human Tech Reply Variant Generator",
+            instructions=self.reply_generator.instructions + variant_instructions,
+            output_type=TweetReplyVariants
+        )
+        self.variant_post_generator = self.post_generator.clone(
+            name="Tech Thought Leadership Post Variant Generator",
+            instructions=self.post_generator.instructions + variant_instructions,
+            output_type=TweetReplyVariants
+        )
+        
+        # Deadlines and hedging are configured by agent attribute and looked up by agent name
+        self.agent_timeouts = {
+            self._agent_by_key(key).name: seconds
+            for key, seconds in (DEFAULT_AGENT_TIMEOUTS if timeouts is None else timeouts).items()
+        }
+        self.hedged_agents = {
+            self._agent_by_key(key).name
+            for key in (DEFAULT_HEDGED_AGENTS if hedged_agents is None else hedged_agents)
+        }
 
-    async def classify_tech_tweets(self, tweets: List[Dict]) -> List[Dict]:
-        """Classify tweets as technology-related or not"""
-        tech_tweets = []
+    def _agent_by_key(self, key: str) -> Agent:
+        """Return the agent stored on the analyzer under attribute ``key``"""
+        agent = getattr(self, key, None)
+        if not isinstance(agent, Agent):
+            raise ValueError(f"Unknown agent '{key}' in timeout or hedging settings")
+        return agent
+
+    async def classify_and_score(
+        self,
+        tweets: List[Dict],
+        max_concurrency: int = 1,
+        batch_size: int = 1,
+        k: int = DEFAULT_TOP_K,
+        stop_at_score: Optional[float] = None,
+        max_scored: Optional[int] = None,
+        analysis_mode: Optional[str] = None,
+        pipelined: Optional[bool] = None,
+        shortlist: Optional[int] = None,
+        reports: Optional[Dict[str, Dict[str, int]]] = None
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """Find tech tweets and their engagement scores using the selected analysis mode
+
+        ``two_stage`` classifies every tweet and then scores the tech tweets with a second
+        agent, either stage by stage or as an overlapping pipeline when ``pipelined``;
+        ``fused`` does both with a single call per tweet. With a ``shortlist`` size, only
+        that many of the best pre-ranked tech tweets are sent to the scorer in
+        ``two_stage`` mode. Returns the tech tweets and the top ``k`` scored tweets, best first.
+
+        With a deduplicator, only one representative of each group of near-duplicate
+        tweets is analyzed. The other tech tweets of the group are returned with the
+        representative's classification, while scored tweets are representatives only.
+
+        Tweets are analyzed as TweetRecords. Records are updated in place and returned
+        as they are, so results from an earlier run on the same records are cleared.
+
+        Counters for the stages that skipped work are written into ``reports`` under
+        ``prefilter``, ``shortlist`` and ``dedupe``. They are kept per call rather than on
+        the analyzer, which concurrent runs share.
+        """
+        analysis_mode = analysis_mode or self.analysis_mode
+        if analysis_mode not in ANALYSIS_MODES:
+            raise ValueError(f"Unknown analysis mode: {analysis_mode}")
+        if shortlist is not None:
+            # A reply target needs at least one scored tweet
+            shortlist = max(1, shortlist)
         
+        tweets = [as_record(tweet) for tweet in tweets]
         for tweet in tweets:
-            # Prepare tweet content for analysis
-            tweet_content = f"""
-            Tweet: {tweet['post']}
-            Stats: {tweet['stats']}
-            Sample Comments: {' | '.join(tweet['comments'][:5])}
-            """
+            tweet.clear_analysis()
+        
+        reports_token = _stage_reports.set(reports)
+        try:
+            groups = self._group_duplicates(tweets)
+            tech_tweets, scored_tweets = await self._classify_and_score_unique(
+                tweets if groups is None else [tweets[group[0]] for group in groups],
+                max_concurrency, batch_size, k, stop_at_score, max_scored, analysis_mode, pipelined, shortlist
+            )
+        finally:
+            _stage_reports.reset(reports_token)
+        if groups is not None:
+            tech_tweets = self._fan_out(tweets, groups, tech_tweets)
+        return tech_tweets, scored_tweets
+
+    async def _classify_and_score_unique(
+        self,
+        tweets: List[Dict],
+        max_concurrency: int,
+        batch_size: int,
+        k: int,
+        stop_at_score: Optional[float],
+        max_scored: Optional[int],
+        analysis_mode: str,
+        pipelined: Optional[bool],
+        shortlist: Optional[int]
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """Dispatch already deduplicated tweets to the selected analysis mode"""
+        if analysis_mode == "fused":
+            if shortlist is not None:
+                # The fused agent scores while it classifies, so no scoring call can be skipped
+                print("ℹ️  The engagement shortlist only applies to two_stage analysis")
+            return await self.assess_tweets(
+                tweets, max_concurrency=max_concurrency, k=k,
+                stop_at_score=stop_at_score, max_scored=max_scored
+            )
+        
+        if pipelined if pipelined is not None else self.pipelined:
+            return await self.classify_and_score_pipelined(
+                tweets, max_concurrency=max_concurrency, batch_size=batch_size, k=k,
+                stop_at_score=stop_at_score, max_scored=max_scored, shortlist=shortlist
+            )
+        
+        tech_tweets = await self.classify_tech_tweets(
+            tweets, max_concurrency=max_concurrency, batch_size=batch_size
+        )
+        print(f"\n✅ Found {len(tech_tweets)} technology-related tweets")
+        if not tech_tweets:
+            return [], []
+        
+        scored_tweets = await self.score_top_tweets(
+            self._shortlist(tech_tweets, shortlist), k=k, max_concurrency=max_concurrency,
+            stop_at_score=stop_at_score, max_scored=max_scored
+        )
+        return tech_tweets, scored_tweets
+
+    async def classify_and_score_pipelined(
+        self,
+        tweets: List[Dict],
+        max_concurrency: int = 1,
+        batch_size: int = 1,
+        k: int = DEFAULT_TOP_K,
+        stop_at_score: Optional[float] = None,
+        max_scored: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        shortlist: Optional[int] = None
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """Classify and score tweets as two overlapping stages connected by a queue
+
+        Each tweet the classifier accepts is handed straight to the scoring workers, so
+        scoring starts with the first tech tweet instead of after the whole classification
+        pass. The bounded queue applies backpressure to the classifiers when scoring falls
+        behind. Returns the tech tweets in input order and the top ``k`` scored tweets.
+
+        With a ``shortlist`` size, tweets are classified in pre-rank order and a tech
+        tweet is handed off once every better pre-ranked tweet has been classified, until
+        ``shortlist`` tech tweets have been handed off, so scoring still starts before the
+        classification pass is over. Here the pre-ranker sees the whole scraped batch
+        rather than just the tech tweets, which can shift borderline shortlist picks.
+        """
+        max_concurrency = max(1, max_concurrency)
+        batch_size = max(1, batch_size)
+        queue = asyncio.Queue(maxsize=queue_size or max_concurrency * 2)
+        stop_event = asyncio.Event()
+        tech_tweets = []
+        top_heap = []
+        launched = 0
+        
+        decided, remaining = self._apply_prefilter(tweets)
+        ranked = self.preranker.rank(tweets) if shortlist is not None else None
+        if ranked is not None:
+            # Classify the most promising tweets first so the shortlist fills early
+            positions = {index: rank for rank, index in enumerate(ranked)}
+            remaining.sort(key=positions.__getitem__)
+        batches = [remaining[i:i + batch_size] for i in range(0, len(remaining), batch_size)]
+        batches.reverse()
+        if self.prefilter is not None:
+            self._report("prefilter", llm_calls_avoided=-(-len(tweets) // batch_size) - len(batches))
+        
+        classified = {}
+        cursor = 0
+        admitted = 0
+        
+        async def hand_off(index: int, tweet: Optional[Dict]):
+            nonlocal cursor, admitted
+            if tweet is not None:
+                tech_tweets.append((index, tweet))
+            if ranked is None:
+                if tweet is not None:
+                    await queue.put((index, tweet))
+                return
             
-            try:
+            classified[index] = tweet
+            # Walk the pre-rank order up to the first tweet that is still being classified
+            while cursor < len(ranked) and admitted < shortlist and ranked[cursor] in classified:
+                candidate_index = ranked[cursor]
+                cursor += 1
+                if classified[candidate_index] is not None:
+                    admitted += 1
+                    await queue.put((candidate_index, classified[candidate_index]))
+        
+        async def feed_prefiltered():
+            for index, tweet in sorted(decided.items()):
+                await hand_off(index, tweet)
+        
+        async def classifier_worker():
+            while batches and not stop_event.is_set():
+                batch = batches.pop()
+                if len(batch) == 1:
+                    results = [await self._classify_tweet(tweets[batch[0]])]
+                else:
+                    results = await self._classify_batch([tweets[index] for index in batch])
+                for index, tweet in zip(batch, results):
+                    await hand_off(index, tweet)
+        
+        async def scorer_worker():
+            nonlocal launched
+            while True:
+                item = await queue.get()
+                if item is None:
+                    return
+                if max_scored is not None and launched >= max_scored:
+                    continue
+                
+                launched += 1
+                index, tweet = item
+                scored = await self._score_tweet(tweet)
+                if scored is None:
+                    continue
+                
+                score = self._push_top(top_heap, k, index, scored)
+                if stop_at_score is not None and score >= stop_at_score:
+                    print(f"⏹️  Stopping early: found a tweet scoring {score:.1f}/10")
+                    stop_event.set()
+        
+        async def classify_stage():
+            classifiers = [classifier_worker() for _ in range(max(1, min(max_concurrency, len(batches))))]
+            await asyncio.gather(feed_prefiltered(), *classifiers)
+            # Let every scorer drain the queue and exit once classification is finished
+            for _ in range(max_concurrency):
+                await queue.put(None)
+        
+        scorers = [scorer_worker() for _ in range(max_concurrency)]
+        await self._run_until_stopped([classify_stage(), *scorers], stop_event)
+        
+        tech_tweets.sort(key=lambda item: item[0])
+        print(f"\n✅ Found {len(tech_tweets)} technology-related tweets")
+        if ranked is not None:
+            self._report_shortlist(len(tech_tweets), admitted)
+        
+        return (
+            [tweet for _, tweet in tech_tweets],
+            [entry[2] for entry in sorted(top_heap, key=lambda entry: entry[:2], reverse=True)]
+        )
+
+    async def assess_tweets(
+        self,
+        tweets: List[Dict],
+        max_concurrency: int = 1,
+        k: int = DEFAULT_TOP_K,
+        stop_at_score: Optional[float] = None,
+        max_scored: Optional[int] = None
+    ) -> Tuple[List[Dict], List[Dict]]:
+        """Classify and score tweets with one fused agent call per tweet
+
+        Returns the tech tweets in input order and the top ``k`` scored tweets, best first.
+        """
+        # The fused agent also produces the engagement score, so the pre-filter can only skip clear
+        # negatives; likely tech tweets are classified once, by the assessment
+        _, to_assess = self._apply_prefilter(tweets, accept_locally=False)
+        tweets = [tweets[index] for index in to_assess]
+        
+        positions = {id(tweet): index for index, tweet in enumerate(tweets)}
+        tech_tweets = []
+        
+        async def assess_and_collect(tweet: Dict) -> Optional[Dict]:
+            assessed = await self._assess_tweet(tweet)
+            if assessed is not None:
+                tech_tweets.append((positions[id(tweet)], assessed))
+            return assessed
+        
+        scored_tweets = await self._select_top(
+            tweets, assess_and_collect, k, max_concurrency, stop_at_score, max_scored
+        )
+        tech_tweets.sort(key=lambda item: item[0])
+        print(f"\n✅ Found {len(tech_tweets)} technology-related tweets")
+        
+        return [tweet for _, tweet in tech_tweets], scored_tweets
+
+    async def _assess_tweet(self, tweet: Dict) -> Optional[Dict]:
+        """Classify and score a single tweet with the fused agent"""
+        try:
+            assessment = self._get_cached(self.tweet_assessor, tweet)
+            if assessment is None:
+                tweet_content = self.prompt_builder.build(
+                    self.tweet_assessor.name,
+                    [("Tweet", tweet['post']), ("Stats", format_stats(tweet['stats']))],
+                    tweet['comments'],
+                    post=tweet['post'],
+                    max_comments=10
+                )
+                
+                # Run fused classification and scoring agent with tracing
+                result = await self._run_agent(self.tweet_assessor, tweet_content, "Tweet_Assessment")
+                
+                assessment = result.final_output
+                self._set_cached(self.tweet_assessor, tweet, assessment)
+            
+            tweet_with_analysis = self._accept_classification(tweet, assessment.to_analysis())
+            if tweet_with_analysis is None:
+                return None
+            
+            engagement = assessment.to_engagement_score()
+            tweet_with_analysis['engagement_score'] = engagement
+            print(f"📊 Engagement score: {engagement.engagement_potential:.1f}/10")
+            print(f"   Factors: {engagement.factors}")
+            self._emit("scored", url=tweet['url'], score=engagement.engagement_potential, factors=engagement.factors)
+            
+            return tweet_with_analysis
+            
+        except Exception as e:
+            print(f"Error assessing tweet: {e}")
+            print(f"Error details: {str(e)}")
+            return None
+
+    async def classify_tech_tweets(self, tweets: List[Dict], max_concurrency: int = 1,
+                                   batch_size: int = 1) -> List[Dict]:
+        """Classify tweets as technology-related or not
+
+        Up to ``max_concurrency`` classifier calls are kept in flight at once. With a
+        ``batch_size`` above 1, that many tweets are packed into each classifier call.
+        Results are returned in the same order as the input tweets.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        batch_size = max(1, batch_size)
+        
+        # Decide clear-cut tweets locally and only send the rest to the classifier
+        decided, remaining = self._apply_prefilter(tweets)
+        batches = [remaining[i:i + batch_size] for i in range(0, len(remaining), batch_size)]
+        if self.prefilter is not None:
+            self._report("prefilter", llm_calls_avoided=-(-len(tweets) // batch_size) - len(batches))
+        
+        async def classify_with_limit(batch: List[int]) -> List[Optional[Dict]]:
+            async with semaphore:
+                if len(batch) == 1:
+                    return [await self._classify_tweet(tweets[batch[0]])]
+                return await self._classify_batch([tweets[index] for index in batch])
+        
+        results = await asyncio.gather(*(classify_with_limit(batch) for batch in batches))
+        for batch, batch_results in zip(batches, results):
+            decided.update(zip(batch, batch_results))
+        
+        return [decided[index] for index in range(len(tweets)) if decided[index] is not None]
+
+    def _group_duplicates(self, tweets: List[Dict]) -> Optional[List[List[int]]]:
+        """Group near-duplicate tweets, representative first, or return None without a deduplicator"""
+        if self.deduplicator is None:
+            return None
+        
+        groups = self.deduplicator.group(tweets)
+        self._report("dedupe", tweets=len(tweets), groups=len(groups), duplicates_collapsed=len(tweets) - len(groups))
+        print(f"🧬 Near-duplicates: {len(tweets)} tweets collapsed into {len(groups)} to analyze")
+        return groups
+
+    def _fan_out(self, tweets: List[Dict], groups: List[List[int]], tech_tweets: List[Dict]) -> List[Dict]:
+        """Give every near-duplicate its representative's classification, in input order
+
+        Duplicates are marked with ``duplicate_of``, the representative's URL. Their own
+        stats and comments are kept. Representatives are matched by identity rather than
+        URL, since a repeated status or two short posts can share one.
+        """
+        # Tech tweets are the representative records themselves, updated in place
+        analyzed = {id(tweet) for tweet in tech_tweets}
+        fanned = []
+        for group in groups:
+            representative = tweets[group[0]]
+            tech_tweet = representative if id(representative) in analyzed else None
+            if tech_tweet is not None:
+                fanned.append((group[0], tech_tweet))
+            
+            for index in group[1:]:
+                duplicate = tweets[index]
+                analysis = tech_tweet['tech_analysis'] if tech_tweet is not None else None
+                self._emit("classified", url=duplicate['url'], post=duplicate['post'], is_tech=analysis is not None,
+                           categories=analysis.tech_categories if analysis is not None else [],
+                           confidence=analysis.confidence_score if analysis is not None else None,
+                           duplicate_of=representative['url'])
+                if analysis is None:
+                    continue
+                duplicate = as_record(duplicate)
+                duplicate.tech_analysis = analysis
+                duplicate.duplicate_of = representative['url']
+                fanned.append((index, duplicate))
+        
+        fanned.sort(key=lambda item: item[0])
+        return [tweet for _, tweet in fanned]
+
+    def _apply_prefilter(self, tweets: List[Dict],
+                         accept_locally: bool = True) -> Tuple[Dict[int, Optional[Dict]], List[int]]:
+        """Decide clear-cut tweets with the local pre-filter
+
+        Returns the locally decided results keyed by tweet index (None for rejected
+        tweets) and the indices of the tweets that still need an LLM call. Without
+        ``accept_locally``, tweets the pre-filter would accept also need the LLM call.
+        """
+        if self.prefilter is None:
+            return {}, list(range(len(tweets)))
+        
+        # Retrain on the latest cached LLM labels before routing this run's tweets
+        if self.cache is not None:
+            examples = [
+                (post, output.is_technology_related and output.confidence_score >= 0.7)
+                for agent in (self.tech_classifier, self.tweet_assessor)
+                for post, output in self.cache.labeled_outputs(agent)
+            ]
+            self.prefilter.train(examples)
+        
+        decided = {}
+        remaining = []
+        for index, tweet in enumerate(tweets):
+            decision, probability = self.prefilter.route(tweet['post'])
+            if decision == "reject":
+                print(f"❌ Not tech-related (pre-filter, p={probability:.2f}): {tweet['post'][:100]}...")
+                self._emit("classified", url=tweet['url'], post=tweet['post'], is_tech=False,
+                           categories=[], confidence=round(1 - probability, 2))
+                decided[index] = None
+            elif decision == "accept" and accept_locally:
+                analysis = TweetAnalysis(
+                    is_technology_related=True,
+                    confidence_score=probability,
+                    reasoning=f"Classified locally by the keyword pre-filter (p={probability:.2f})",
+                    tech_categories=self.prefilter.matched_categories(tweet['post']) or ["Technology"]
+                )
+                decided[index] = self._accept_classification(tweet, analysis)
+            else:
+                remaining.append(index)
+        
+        accepted = sum(1 for result in decided.values() if result is not None)
+        self._report("prefilter", accepted=accepted, rejected=len(decided) - accepted,
+                     sent_to_llm=len(remaining), llm_calls_avoided=len(decided))
+        print(f"🧮 Pre-filter: {accepted} accepted and {len(decided) - accepted} rejected locally, "
+              f"{len(remaining)} sent to the LLM")
+        
+        return decided, remaining
+
+    async def _classify_tweet(self, tweet: Dict) -> Optional[Dict]:
+        """Classify a single tweet, returning it with its analysis attached if it is tech-related"""
+        try:
+            analysis = self._get_cached(self.tech_classifier, tweet)
+            if analysis is None:
+                # Prepare tweet content for analysis
+                tweet_content = self.prompt_builder.build(
+                    self.tech_classifier.name,
+                    [("Tweet", tweet['post'])],
+                    tweet['comments'],
+                    post=tweet['post'],
+                    comment_label="Sample Comments",
+                    max_comments=5
+                )
+                
                 # Run tech classification agent with tracing
-                with trace(workflow_name="Tech_Classification"):
-                    result = await Runner.run(self.tech_classifier, tweet_content)
+                result = await self._run_agent(self.tech_classifier, tweet_content, "Tech_Classification")
                     
                 # Get the structured output as a TweetAnalysis model
                 analysis = result.final_output
+                self._set_cached(self.tech_classifier, tweet, analysis)
+            
+            return self._accept_classification(tweet, analysis)
                 
-                if analysis.is_technology_related and analysis.confidence_score >= 0.7:
-                    tweet_with_analysis = tweet.copy()
-                    tweet_with_analysis['tech_analysis'] = analysis
-                    tech_tweets.append(tweet_with_analysis)
-                    print(f"✅ Tech tweet found: {tweet['post'][:100]}...")
-                    print(f"   Categories: {analysis.tech_categories}")
-                    print(f"   Confidence: {analysis.confidence_score:.2f}")
-                else:
-                    print(f"❌ Not tech-related: {tweet['post'][:100]}...")
-                    
-            except Exception as e:
-                print(f"Error classifying tweet: {e}")
-                print(f"Error details: {str(e)}")
-                continue
+        except Exception as e:
+            print(f"Error classifying tweet: {e}")
+            print(f"Error details: {str(e)}")
         
-        return tech_tweets
+        return None
 
-    async def score_engagement_potential(self, tech_tweets: List[Dict]) -> List[Dict]:
-        """Score engagement potential for tech tweets"""
-        scored_tweets = []
+    async def _classify_batch(self, batch: List[Dict]) -> List[Optional[Dict]]:
+        """Classify several tweets with a single classifier call
+
+        Tweets whose analysis is missing from a malformed batch response, or every
+        tweet if the batch call fails outright, are classified one at a time instead.
+        """
+        analyses: Dict[int, TweetAnalysis] = {}
+        uncached = []
+        for index, tweet in enumerate(batch):
+            cached = self._get_cached(self.tech_classifier, tweet)
+            if cached is None:
+                uncached.append(index)
+            else:
+                analyses[index] = cached
         
-        for tweet in tech_tweets:
-            tweet_content = f"""
-            Tweet: {tweet['post']}
-            Stats: {tweet['stats']}
-            Comments: {' | '.join(tweet['comments'][:10])}
-            Tech Categories: {tweet['tech_analysis'].tech_categories}
-            Tech Reasoning: {tweet['tech_analysis'].reasoning}
-            """
+        if uncached:
+            batch_content = "\n\n".join(
+                f"[{position}]\n" + self.prompt_builder.build(
+                    self.batch_tech_classifier.name,
+                    [("Tweet", batch[index]['post'])],
+                    batch[index]['comments'],
+                    post=batch[index]['post'],
+                    comment_label="Sample Comments",
+                    max_comments=5
+                )
+                for position, index in enumerate(uncached)
+            )
             
             try:
-                # Run engagement scoring agent with tracing
-                with trace(workflow_name="Engagement_Scoring"):
-                    result = await Runner.run(self.engagement_scorer, tweet_content)
+                # Run batch classification agent with tracing
+                result = await self._run_agent(self.batch_tech_classifier, batch_content, "Tech_Classification_Batch")
                 
-                # Get the structured output as an EngagementScore model
-                engagement = result.final_output
+                # Match each analysis back to its tweet, ignoring out-of-range or repeated indices
+                for item in result.final_output.analyses:
+                    if 0 <= item.index < len(uncached) and uncached[item.index] not in analyses:
+                        index = uncached[item.index]
+                        analyses[index] = TweetAnalysis(**item.model_dump(exclude={'index'}))
+                        self._set_cached(self.tech_classifier, batch[index], analyses[index])
+                
+            except Exception as e:
+                print(f"Error classifying batch of {len(uncached)} tweets: {e}")
+        
+        results = []
+        for index, tweet in enumerate(batch):
+            if index in analyses:
+                results.append(self._accept_classification(tweet, analyses[index]))
+            else:
+                print(f"⚠️ No batch result for tweet, classifying it on its own: {tweet['post'][:100]}...")
+                results.append(await self._classify_tweet(tweet))
+        
+        return results
+
+    def _accept_classification(self, tweet: Dict, analysis: TweetAnalysis) -> Optional[Dict]:
+        """Return the tweet with its analysis attached if it is confidently tech-related"""
+        is_tech = analysis.is_technology_related and analysis.confidence_score >= 0.7
+        self._emit("classified", url=tweet['url'], post=tweet['post'], is_tech=is_tech,
+                   categories=analysis.tech_categories if is_tech else [], confidence=analysis.confidence_score)
+        if is_tech:
+            # Results are attached to the record itself rather than to a copy of the tweet
+            tweet = as_record(tweet)
+            analysis.tech_categories = intern_strings(analysis.tech_categories)
+            tweet.tech_analysis = analysis
+            print(f"✅ Tech tweet found: {tweet['post'][:100]}...")
+            print(f"   Categories: {analysis.tech_categories}")
+            print(f"   Confidence: {analysis.confidence_score:.2f}")
+            return tweet
+        
+        print(f"❌ Not tech-related: {tweet['post'][:100]}...")
+        return None
+
+    def _shortlist(self, tech_tweets: List[Dict], size: Optional[int]) -> List[Dict]:
+        """Keep the ``size`` best pre-ranked tech tweets for the engagement scorer, in input order"""
+        if size is None:
+            return tech_tweets
+        
+        shortlisted = [tech_tweets[index] for index in self.preranker.shortlist(tech_tweets, size)]
+        self._report_shortlist(len(tech_tweets), len(shortlisted))
+        return shortlisted
+
+    def _report_shortlist(self, candidates: int, shortlisted: int) -> None:
+        self._report("shortlist", candidates=candidates, shortlisted=shortlisted,
+                     scorer_calls_avoided=candidates - shortlisted)
+        print(f"🧮 Pre-ranker: {shortlisted} of {candidates} tech tweets shortlisted for the engagement scorer")
+
+    async def score_engagement_potential(self, tech_tweets: List[Dict], max_concurrency: int = 1) -> List[Dict]:
+        """Score engagement potential for tech tweets
+
+        Up to ``max_concurrency`` scorer calls are kept in flight at once.
+        Results are returned in the same order as the input tweets.
+        """
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async def score_with_limit(tweet: Dict) -> Optional[Dict]:
+            async with semaphore:
+                return await self._score_tweet(tweet)
+        
+        results = await asyncio.gather(*(score_with_limit(tweet) for tweet in tech_tweets))
+        
+        return [tweet for tweet in results if tweet is not None]
+
+    async def score_top_tweets(
+        self,
+        tech_tweets: List[Dict],
+        k: int = DEFAULT_TOP_K,
+        max_concurrency: int = 1,
+        stop_at_score: Optional[float] = None,
+        max_scored: Optional[int] = None
+    ) -> List[Dict]:
+        """Score tech tweets concurrently and keep only the ``k`` most engaging ones
+
+        Scoring stops early once a tweet reaches ``stop_at_score``, cancelling any
+        calls still in flight, and never issues more than ``max_scored`` scorer calls.
+        Returns the top tweets ordered from highest to lowest engagement score.
+        """
+        return await self._select_top(
+            tech_tweets, self._score_tweet, k, max_concurrency, stop_at_score, max_scored
+        )
+
+    async def _select_top(
+        self,
+        tweets: List[Dict],
+        score_tweet: Callable[[Dict], Awaitable[Optional[Dict]]],
+        k: int,
+        max_concurrency: int,
+        stop_at_score: Optional[float],
+        max_scored: Optional[int]
+    ) -> List[Dict]:
+        """Run ``score_tweet`` over tweets with a worker pool, keeping a top-k heap of the results"""
+        top_heap = []
+        pending = list(enumerate(tweets))
+        if max_scored is not None:
+            pending = pending[:max(0, max_scored)]
+        pending.reverse()
+        stop_event = asyncio.Event()
+        
+        async def worker():
+            while pending and not stop_event.is_set():
+                index, tweet = pending.pop()
+                scored = await score_tweet(tweet)
+                if scored is None:
+                    continue
                 
-                tweet['engagement_score'] = engagement
-                scored_tweets.append(tweet)
+                score = self._push_top(top_heap, k, index, scored)
+                if stop_at_score is not None and score >= stop_at_score:
+                    print(f"⏹️  Stopping early: found a tweet scoring {score:.1f}/10")
+                    stop_event.set()
+        
+        workers = [worker() for _ in range(max(1, min(max_concurrency, len(pending))))]
+        await self._run_until_stopped(workers, stop_event)
+        
+        return [entry[2] for entry in sorted(top_heap, key=lambda entry: entry[:2], reverse=True)]
+
+    def _push_top(self, top_heap: List[Tuple], k: int, index: int, scored: Dict) -> float:
+        """Offer a scored tweet to a top-k min-heap and return its engagement score
+
+        Emits a ``best`` progress event when the tweet takes the lead.
+        """
+        # Entries are (score, -index, tweet); the index breaks ties in favour of earlier tweets
+        score = scored['engagement_score'].engagement_potential
+        entry = (score, -index, scored)
+        leads = all(entry[:2] > other[:2] for other in top_heap)
+        if len(top_heap) < k:
+            heapq.heappush(top_heap, entry)
+        elif top_heap and entry[:2] > top_heap[0][:2]:
+            heapq.heapreplace(top_heap, entry)
+        if leads and k > 0:
+            self._emit("best", url=scored['url'], post=scored['post'], stats=format_stats(scored['stats'], abbreviate=True),
+                       score=score, categories=scored['tech_analysis'].tech_categories)
+        return score
+
+    async def _run_until_stopped(self, coroutines: List[Awaitable], stop_event: asyncio.Event) -> None:
+        """Run worker coroutines until they all finish or ``stop_event`` is set, then cancel the rest"""
+        workers = [asyncio.ensure_future(coroutine) for coroutine in coroutines]
+        stop_waiter = asyncio.ensure_future(stop_event.wait())
+        all_workers = asyncio.gather(*workers)
+        try:
+            await asyncio.wait([all_workers, stop_waiter], return_when=asyncio.FIRST_COMPLETED)
+            if all_workers.done() and not all_workers.cancelled():
+                # Surface unexpected worker failures instead of swallowing them
+                all_workers.result()
+        finally:
+            # Cancel agent calls that are still running once we have what we need
+            for task in workers:
+                task.cancel()
+            stop_waiter.cancel()
+            await asyncio.gather(all_workers, stop_waiter, return_exceptions=True)
+
+    async def _score_tweet(self, tweet: Dict) -> Optional[Dict]:
+        """Score a single tech tweet, returning it with its engagement score attached"""
+        try:
+            engagement = self._get_cached(self.engagement_scorer, tweet)
+            if engagement is None:
+                tweet_content = self.prompt_builder.build(
+                    self.engagement_scorer.name,
+                    [
+                        ("Tweet", tweet['post']),
+                        ("Stats", format_stats(tweet['stats'])),
+                        ("Tech Categories", tweet['tech_analysis'].tech_categories),
+                        ("Tech Reasoning", tweet['tech_analysis'].reasoning)
+                    ],
+                    tweet['comments'],
+                    post=tweet['post'],
+                    max_comments=10
+                )
                 
-                print(f"📊 Engagement score: {engagement.engagement_potential:.1f}/10")
-                print(f"   Factors: {engagement.factors}")
+                # Run engagement scoring agent with tracing
+                result = await self._run_agent(self.engagement_scorer, tweet_content, "Engagement_Scoring")
                 
-            except Exception as e:
-                print(f"Error scoring engagement: {e}")
-                print(f"Error details: {str(e)}")
-                continue
+                # Get the structured output as an EngagementScore model
+                engagement = result.final_output
+                self._set_cached(self.engagement_scorer, tweet, engagement)
+            
+            tweet['engagement_score'] = engagement
+            
+            print(f"📊 Engagement score: {engagement.engagement_potential:.1f}/10")
+            print(f"   Factors: {engagement.factors}")
+            self._emit("scored", url=tweet['url'], score=engagement.engagement_potential, factors=engagement.factors)
+            
+            return tweet
+            
+        except Exception as e:
+            print(f"Error scoring engagement: {e}")
+            print(f"Error details: {str(e)}")
+            return None
+
+    def _report(self, stage: str, **counters: int) -> None:
+        """Record counters for a stage of the classify_and_score call running in this context"""
+        reports = _stage_reports.get()
+        if reports is not None:
+            reports.setdefault(stage, {}).update(counters)
+
+    def _emit(self, event: str, **data) -> None:
+        """Pass a progress event to the ``on_event`` callback of the analysis running in this context"""
+        on_event = _progress_callback.get()
+        if on_event is None:
+            return
+        
+        try:
+            on_event(event, data)
+        except Exception as e:
+            print(f"⚠️ Progress callback failed: {e}")
+
+    def _metrics(self) -> AgentMetrics:
+        """Return the metrics of the analysis running in this context, or the shared metrics outside a run"""
+        run_metrics = _run_metrics.get()
+        return self.metrics if run_metrics is None else run_metrics
+
+    def _get_cached(self, agent: Agent, tweet: Dict):
+        """Look up a previous output of ``agent`` for ``tweet`` in the analysis cache"""
+        if self.cache is None:
+            return None
         
-        return scored_tweets
+        try:
+            output = self.cache.get(agent, tweet)
+        except Exception as e:
+            print(f"⚠️ Cache lookup failed: {e}")
+            return None
+        
+        self._metrics().observe_cache(agent.name, output is not None)
+        return output
+
+    def _set_cached(self, agent: Agent, tweet: Dict, output: BaseModel) -> None:
+        """Store the output of ``agent`` for ``tweet`` in the analysis cache"""
+        if self.cache is None:
+            return
+        
+        try:
+            self.cache.set(agent, tweet, output)
+        except Exception as e:
+            print(f"⚠️ Cache write failed: {e}")
+
+    async def _run_agent(self, agent: Agent, agent_input: str, workflow_name: str):
+        """Run ``agent`` under a trace, recording its latency, token usage and errors
+
+        Calls go through the shared rate limiter, so rate-limit errors, timeouts and
+        server errors are retried with backoff before the error is raised. Each attempt
+        is cut off at the agent's deadline and may be hedged (see ``_run_hedged``).
+        """
+        timeout = self.agent_timeouts.get(agent.name, DEFAULT_AGENT_TIMEOUT)
+        
+        async def attempt():
+            start = time.perf_counter()
+            try:
+                result = await asyncio.wait_for(self._run_hedged(agent, agent_input, workflow_name), timeout)
+            except asyncio.TimeoutError:
+                self._metrics().observe_call(agent.name, time.perf_counter() - start, error=True)
+                raise asyncio.TimeoutError(f"{agent.name} did not respond within {timeout:g}s")
+            except Exception:
+                self._metrics().observe_call(agent.name, time.perf_counter() - start, error=True)
+                raise
+            
+            self._metrics().observe_call(agent.name, time.perf_counter() - start, usage=result.context_wrapper.usage)
+            return result
+        
+        def on_retry(error: BaseException, attempt_number: int, delay: float):
+            self._metrics().observe_retry(agent.name)
+            print(f"⏳ {agent.name} failed ({type(error).__name__}), retry {attempt_number} in {delay:.1f}s")
+        
+        return await self.rate_limiter.run(attempt, on_retry=on_retry)
+
+    async def _run_hedged(self, agent: Agent, agent_input: str, workflow_name: str):
+        """Run ``agent`` once, starting a duplicate run if it is slower than usual
+
+        For hedged agents with enough latency history, a second run starts once the
+        first has taken longer than the agent's p95 latency. The first successful
+        result wins and the other run is cancelled. The second run needs a free slot
+        under the rate limiter's concurrency limit and is skipped when there is none,
+        so hedging never pushes the calls in flight past that limit.
+        """
+        async def run_traced():
+            with trace(workflow_name=workflow_name):
+                return await Runner.run(agent, agent_input, run_config=self.run_config)
+        
+        hedge_after = self.metrics.latency_percentile(agent.name, 0.95) if agent.name in self.hedged_agents else None
+        if hedge_after is None:
+            return await run_traced()
+        
+        primary = asyncio.ensure_future(run_traced())
+        runs = [primary]
+        hedge_slot = False
+        try:
+            done, _ = await asyncio.wait(runs, timeout=hedge_after)
+            if not done:
+                hedge_slot = self.rate_limiter.concurrency.try_acquire()
+            if hedge_slot:
+                if self.rate_limiter.bucket is not None:
+                    await self.rate_limiter.bucket.acquire()
+                runs.append(asyncio.ensure_future(run_traced()))
+                self._metrics().observe_hedge(agent.name)
+            
+            pending = set(runs)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for run in done:
+                    if run.exception() is None:
+                        if run is not primary:
+                            self._metrics().observe_hedge_win(agent.name)
+                        return run.result()
+            
+            # Every run failed; surface the last error
+            raise run.exception()
+        finally:
+            for run in runs:
+                run.cancel()
+            await asyncio.gather(*runs, return_exceptions=True)
+            if hedge_slot:
+                self.rate_limiter.concurrency.release()
 
     async def find_best_tweet(self, scored_tweets: List[Dict]) -> Dict:
         """Find the tweet with highest engagement potential"""
@@ -234,30 +1191,88 @@ class TwitterAnalyzer:
         print(f"Tweet: {best_tweet['post']}")
         print(f"Score: {best_tweet['engagement_score'].engagement_potential:.1f}/10")
         print(f"URL: {best_tweet['url']}")
-        print(f"Stats: {best_tweet['stats']}")
+        print(f"Stats: {format_stats(best_tweet['stats'], abbreviate=True)}")
         
         return best_tweet
 
     async def generate_reply(self, best_tweet: Dict) -> TweetReply:
         """Generate a natural, human-like reply to the best tweet"""
-        tweet_context = f"""
-        Original Tweet: {best_tweet['post']}
-        Tweet Stats: {best_tweet['stats']}
-        Tech Categories: {best_tweet['tech_analysis'].tech_categories}
-        Engagement Factors: {best_tweet['engagement_score'].factors}
-        Sample Comments: {' | '.join(best_tweet['comments'][:5])}
-        
-        Generate a natural, conversational reply that a tech-savvy person would write.
-        The reply should sound authentic and continue the conversation naturally.
-        """
+        tweet_context = self._reply_prompt(self.reply_generator, best_tweet)
         
-        with trace(workflow_name="Reply_Generation"):
-            result = await Runner.run(self.reply_generator, tweet_context)
+        result = await self._run_agent(self.reply_generator, tweet_context, "Reply_Generation")
         
         return result.final_output
 
+    async def generate_reply_variants(self, best_tweet: Dict, count: int) -> List[TweetReply]:
+        """Generate ``count`` distinct replies to the best tweet in a single call"""
+        tweet_context = self._reply_prompt(self.variant_reply_generator, best_tweet)
+        tweet_context += f"\nWrite {count} variants."
+        
+        result = await self._run_agent(self.variant_reply_generator, tweet_context, "Reply_Generation")
+        
+        return self._take_variants(self.variant_reply_generator, result.final_output, count)
+
+    def _reply_prompt(self, agent: Agent, best_tweet: Dict) -> str:
+        """Build the reply generator prompt for a tweet"""
+        return self.prompt_builder.build(
+            agent.name,
+            [
+                ("Original Tweet", best_tweet['post']),
+                ("Tweet Stats", format_stats(best_tweet['stats'])),
+                ("Tech Categories", best_tweet['tech_analysis'].tech_categories),
+                ("Engagement Factors", best_tweet['engagement_score'].factors)
+            ],
+            best_tweet['comments'],
+            post=best_tweet['post'],
+            comment_label="Sample Comments",
+            max_comments=5,
+            footer="""Generate a natural, conversational reply that a tech-savvy person would write.
+The reply should sound authentic and continue the conversation naturally."""
+        )
+
+    @staticmethod
+    def _take_variants(agent: Agent, output: TweetReplyVariants, count: int) -> List[TweetReply]:
+        """Return at most ``count`` variants, raising if the agent returned none"""
+        if not output.variants:
+            raise ValueError(f"{agent.name} returned no variants")
+        return output.variants[:count]
+
     async def get_recent_tech_news(self) -> List[Dict]:
-        """Get recent tech news and trending topics in the tech world using web search"""
+        """Get recent tech news and trending topics in the tech world
+
+        When a news cache is configured, a fresh snapshot is returned directly and a stale
+        one is returned immediately while a background refresh runs. The web is only
+        searched inline when there is no usable snapshot.
+        """
+        if self.news_cache is not None:
+            news, age = self.news_cache.snapshot()
+            usable = news is not None and self.news_cache.is_usable(age)
+            self._metrics().observe_cache(self.tech_news_analyzer.name, usable)
+            if usable:
+                if not self.news_cache.is_fresh(age):
+                    if self.news_cache.refresh_in_background(self._search_tech_news):
+                        print("🔄 Cached tech news is stale, refreshing in the background...")
+                print(f"📰 Using cached tech news ({len(news)} items, {age / 60:.0f} minutes old)")
+                return news
+        
+        recent_tech_news = await self._search_tech_news()
+        
+        # If web search failed or returned no results, use fallback simulated news
+        if not recent_tech_news:
+            print("  ⚠️ Web search returned no results, using fallback news data")
+            return self._get_fallback_tech_news()
+        
+        if self.news_cache is not None:
+            self.news_cache.put(recent_tech_news)
+        
+        return recent_tech_news
+
+    async def _search_tech_news(self) -> List[Dict]:
+        """Search the web for recent tech news and analyze the headlines found
+
+        Topics are searched concurrently and every headline found is analyzed in a
+        single structured call, so a run costs one call per topic plus one.
+        """
         print("🔍 Searching the web for latest tech news...")
         
         # Topics to search for
@@ -274,75 +1289,78 @@ class TwitterAnalyzer:
         
         # Select a few random topics to search for
         selected_topics = random.sample(search_topics, min(3, len(search_topics)))
-        recent_tech_news = []
         
-        # Create a tech analyzer Agent to categorize web search results
-        tech_news_analyzer = Agent(
-            name="Tech News Analyzer",
-            instructions="""Analyze this tech news headline and provide structured information about it.
-            Extract the main topic, categorize it by tech domain, assess its sentiment (positive/negative/neutral),
-            and rate the potential controversy level (low/medium/high).
-            """,
-            model="gpt-4o"
-        )
+        # Search for every topic at once
+        topic_headlines = await asyncio.gather(*(self._search_topic(topic) for topic in selected_topics))
         
-        # Search for each topic and process results
-        for topic in selected_topics:
-            try:
-                print(f"  Searching for: {topic}")
-                
-                # Prepare the search context
-                search_context = f"""
-                Find the most recent and significant tech news about {topic}.
-                Focus on headlines from reputable tech news sources published in the last week.
-                Look for specific announcements, product launches, funding rounds, or industry trends.
-                """
-                
-                # Use the WebSearchTool via an agent to search the web
-                with trace(workflow_name=f"Web_Search_{topic}"):
-                    search_agent = Agent(
-                        name="Web Search Agent",
-                        instructions=search_context,
-                        tools=[self.web_search_tool]
-                    )
-                    search_result = await Runner.run(search_agent, f"Find the latest news on {topic}")
-                
-                # Extract headlines from the search results
-                raw_results = search_result.final_output
-                
-                # Process each headline to categorize it
-                headlines = self._extract_headlines_from_search(raw_results)
-                
-                for headline in headlines[:2]:  # Process top 2 headlines per topic
-                    analysis_prompt = f"Analyze this tech news headline: '{headline}'"
-                    
-                    with trace(workflow_name="News_Analysis"):
-                        analysis_result = await Runner.run(tech_news_analyzer, analysis_prompt)
-                    
-                    # Extract structured information
-                    analysis = analysis_result.final_output
-                    
-                    # Create a news item with the analyzed data
-                    news_item = {
-                        "title": headline,
-                        "topic": self._extract_field(analysis, "topic", "Technology"),
-                        "sentiment": self._extract_field(analysis, "sentiment", "neutral"),
-                        "controversy_level": self._extract_field(analysis, "controversy_level", "medium")
-                    }
-                    
-                    recent_tech_news.append(news_item)
-                    print(f"  ✅ Found: {headline}")
-                
-            except Exception as e:
-                print(f"  ❌ Error searching for {topic}: {e}")
-                continue
+        # Keep the top 2 headlines per topic, skipping any that another topic already found
+        headlines = []
+        for found in topic_headlines:
+            for headline in found[:2]:
+                if headline not in headlines:
+                    headlines.append(headline)
         
-        # If web search failed or returned no results, use fallback simulated news
-        if not recent_tech_news:
-            print("  ⚠️ Web search returned no results, using fallback news data")
-            recent_tech_news = self._get_fallback_tech_news()
+        if not headlines:
+            return []
+        
+        # Categorize all headlines with a single structured call
+        analyses: Dict[int, NewsHeadlineAnalysis] = {}
+        try:
+            analysis_prompt = "Analyze these tech news headlines:\n" + "\n".join(
+                f"[{index}] {headline}" for index, headline in enumerate(headlines)
+            )
+            
+            analysis_result = await self._run_agent(self.tech_news_analyzer, analysis_prompt, "News_Analysis")
+            
+            for item in analysis_result.final_output.headlines:
+                if 0 <= item.index < len(headlines):
+                    analyses.setdefault(item.index, item)
+        except Exception as e:
+            print(f"  ❌ Error analyzing news headlines: {e}")
+        
+        recent_tech_news = []
+        for index, headline in enumerate(headlines):
+            analysis = analyses.get(index)
+            
+            # Create a news item with the analyzed data, using neutral defaults if the analysis is missing
+            recent_tech_news.append({
+                "title": headline,
+                "topic": analysis.topic if analysis else "Technology",
+                "sentiment": analysis.sentiment if analysis else "neutral",
+                "controversy_level": analysis.controversy_level if analysis else "medium"
+            })
+            print(f"  ✅ Found: {headline}")
         
         return recent_tech_news
+
+    async def _search_topic(self, topic: str) -> List[str]:
+        """Run a web search for one news topic and return the headlines found"""
+        try:
+            print(f"  Searching for: {topic}")
+            
+            # Prepare the search context
+            search_context = f"""
+            Find the most recent and significant tech news about {topic}.
+            Focus on headlines from reputable tech news sources published in the last week.
+            Look for specific announcements, product launches, funding rounds, or industry trends.
+            """
+            
+            # Use the WebSearchTool via an agent to search the web
+            search_agent = Agent(
+                name="Web Search Agent",
+                instructions=search_context,
+                tools=[self.web_search_tool]
+            )
+            search_result = await self._run_agent(
+                search_agent, f"Find the latest news on {topic}", f"Web_Search_{topic}"
+            )
+            
+            # Extract headlines from the search results
+            return self._extract_headlines_from_search(search_result.final_output)
+            
+        except Exception as e:
+            print(f"  ❌ Error searching for {topic}: {e}")
+            return []
     
     def _extract_headlines_from_search(self, search_result: str) -> List[str]:
         """Extract headlines from search results text"""
@@ -390,19 +1408,6 @@ class TwitterAnalyzer:
         
         return unique_headlines
     
-    def _extract_field(self, analysis: str, field_name: str, default_value: str) -> str:
-        """Extract a specific field from the analysis text"""
-        try:
-            # Try to find the field in the analysis text
-            import re
-            pattern = rf"{field_name}\s*[:=]\s*([a-zA-Z0-9 /-]+)"
-            match = re.search(pattern, analysis.lower())
-            if match:
-                return match.group(1).strip()
-            return default_value
-        except:
-            return default_value
-    
     def _get_fallback_tech_news(self) -> List[Dict]:
         """Provide fallback tech news when web search fails"""
         fallback_news = [
@@ -437,8 +1442,31 @@ class TwitterAnalyzer:
         
         return selected_news
         
-    async def generate_new_post(self, tech_tweets: List[Dict]) -> TweetReply:
-        """Generate an engaging standalone post based on analyzed tech tweets and recent news"""
+    async def generate_new_post(self, tech_tweets: List[Dict],
+                                recent_news: Optional[List[Dict]] = None) -> TweetReply:
+        """Generate an engaging standalone post based on analyzed tech tweets and recent news
+
+        Pass ``recent_news`` to reuse news gathered earlier instead of searching the web again.
+        """
+        post_context = await self._post_prompt(tech_tweets, recent_news)
+        
+        result = await self._run_agent(self.post_generator, post_context, "Post_Generation")
+        
+        return result.final_output
+
+    async def generate_post_variants(self, tech_tweets: List[Dict], count: int,
+                                     recent_news: Optional[List[Dict]] = None) -> List[TweetReply]:
+        """Generate ``count`` distinct standalone posts in a single call"""
+        post_context = await self._post_prompt(tech_tweets, recent_news)
+        post_context += f"""7. Write {count} variants, each on a different topic or with a different stance.
+        """
+        
+        result = await self._run_agent(self.variant_post_generator, post_context, "Post_Generation")
+        
+        return self._take_variants(self.variant_post_generator, result.final_output, count)
+
+    async def _post_prompt(self, tech_tweets: List[Dict], recent_news: Optional[List[Dict]]) -> str:
+        """Build the post generator prompt, searching for news unless it was passed in"""
         # Extract tech categories and topics from all analyzed tweets
         categories = []
         topics = []
@@ -449,8 +1477,9 @@ class TwitterAnalyzer:
         # Get unique categories
         unique_categories = list(set(categories))
         
-        # Get recent tech news using web search
-        recent_news = await self.get_recent_tech_news()
+        # Get recent tech news using web search unless it was gathered ahead of time
+        if recent_news is None:
+            recent_news = await self.get_recent_tech_news()
         
         # Select high controversy topics for more opinionated content
         controversial_topics = [news for news in recent_news if news["controversy_level"] in ["medium", "high"]]
@@ -475,49 +1504,150 @@ class TwitterAnalyzer:
         5. The post should be original and provocative enough to generate strong reactions.
         6. Focus on ONE specific topic rather than making general statements about the tech industry.
         """
+        return post_context
+
+    async def run_analysis(self, tweets: List[Dict], reply_candidates: int = DEFAULT_REPLY_CANDIDATES,
+                           variants: int = DEFAULT_VARIANTS,
+                           on_event: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+                           **options) -> Optional[Dict[str, Any]]:
+        """Run the full analysis, overlapping independent steps
+
+        News gathering starts immediately and runs alongside classification and scoring.
+        Once the best tweet is known, replies for the top ``reply_candidates`` scored
+        tweets and the new post are generated concurrently, each call returning
+        ``variants`` drafts. ``options`` are passed through to ``classify_and_score``.
+        Returns None when no tech tweets are found or none of them could be scored, otherwise a dict with the tech
+        tweets, scored tweets, best tweet, generated reply and post with their
+        ``reply_variants`` and ``post_variants``, ranked ``reply_candidates`` (tweet and
+        reply variants pairs, best first), a ``metrics`` report of the agent calls
+        made during the run and the ``prefilter``, ``shortlist`` and ``dedupe`` counters
+        of this run's ``classify_and_score`` call.
+
+        ``on_event(event, data)`` is called as the run progresses with ``started``,
+        ``classified``, ``scored``, ``best``, ``reply`` and ``post`` events. The callback
+        is held in a context variable, so concurrent runs sharing this analyzer only
+        see their own events.
+        """
+        progress_token = _progress_callback.set(on_event)
+        # Calls are also recorded in the shared metrics, but the report only covers this run
+        run_metrics = AgentMetrics(parent=self.metrics)
+        metrics_token = _run_metrics.set(run_metrics)
+        stage_reports: Dict[str, Dict[str, int]] = {}
+        self._emit("started", total=len(tweets))
+        news_task = asyncio.ensure_future(self.get_recent_tech_news())
+        try:
+            tech_tweets, scored_tweets = await self.classify_and_score(tweets, reports=stage_reports, **options)
+            if not tech_tweets:
+                return None
+            if not scored_tweets:
+                # Every scorer call failed, so there is no tweet to reply to
+                print("⚠️ None of the tech tweets could be scored")
+                return None
+            
+            best_tweet = await self.find_best_tweet(scored_tweets)
+            
+            # Draft replies for the runners-up too, so switching targets needs no new run
+            ranked = sorted(scored_tweets, key=lambda t: t['engagement_score'].engagement_potential, reverse=True)
+            alternatives = [tweet for tweet in ranked if tweet is not best_tweet][:max(0, reply_candidates - 1)]
+            
+            async def generate_replies(tweet: Dict) -> List[TweetReply]:
+                if variants > 1:
+                    return await self.generate_reply_variants(tweet, variants)
+                return [await self.generate_reply(tweet)]
+            
+            async def generate_best_replies() -> List[TweetReply]:
+                replies = await generate_replies(best_tweet)
+                self._emit("reply", url=best_tweet['url'], variants=[_variant_dict(reply) for reply in replies])
+                return replies
+            
+            async def generate_alternative_replies(tweet: Dict) -> Optional[List[TweetReply]]:
+                try:
+                    return await generate_replies(tweet)
+                except Exception as e:
+                    print(f"⚠️ Could not draft an alternative reply: {e}")
+                    return None
+            
+            async def generate_posts_with_news() -> List[TweetReply]:
+                recent_news = await news_task
+                if variants > 1:
+                    posts = await self.generate_post_variants(tech_tweets, variants, recent_news=recent_news)
+                else:
+                    posts = [await self.generate_new_post(tech_tweets, recent_news=recent_news)]
+                self._emit("post", variants=[_variant_dict(post) for post in posts])
+                return posts
+            
+            reply_variants, post_variants, *alternative_replies = await asyncio.gather(
+                generate_best_replies(),
+                generate_posts_with_news(),
+                *(generate_alternative_replies(tweet) for tweet in alternatives)
+            )
+        finally:
+            # Don't leave the web searches running if analysis stopped early
+            if not news_task.done():
+                news_task.cancel()
+                await asyncio.gather(news_task, return_exceptions=True)
+            _progress_callback.reset(progress_token)
+            _run_metrics.reset(metrics_token)
         
-        with trace(workflow_name="Post_Generation"):
-            result = await Runner.run(self.post_generator, post_context)
-        
-        return result.final_output
+        return {
+            "tech_tweets": tech_tweets,
+            "scored_tweets": scored_tweets,
+            "best_tweet": best_tweet,
+            "tweet_reply": reply_variants[0],
+            "reply_variants": reply_variants,
+            "reply_candidates": [(best_tweet, reply_variants)] + [
+                (tweet, replies) for tweet, replies in zip(alternatives, alternative_replies) if replies is not None
+            ],
+            "new_post": post_variants[0],
+            "post_variants": post_variants,
+            "metrics": run_metrics.report(),
+            "prefilter": stage_reports.get("prefilter", {}),
+            "shortlist": stage_reports.get("shortlist", {}),
+            "dedupe": stage_reports.get("dedupe", {})
+        }
 
-async def main():
+async def main(max_concurrency: int = DEFAULT_CONCURRENCY, batch_size: int = DEFAULT_BATCH_SIZE,
+               analysis_mode: str = DEFAULT_ANALYSIS_MODE, pipelined: bool = DEFAULT_PIPELINED,
+               variants: int = DEFAULT_VARIANTS):
     print("🤖 Starting Twitter Analysis with OpenAI Agents...")
     print("=" * 60)
     
     # Initialize analyzer and load tweets
-    analyzer = TwitterAnalyzer()
+    analyzer = TwitterAnalyzer(
+        cache=AnalysisCache(),
+        prefilter=TechPrefilter() if PREFILTER_ENABLED else None,
+        news_cache=NewsCache(),
+        deduplicator=NearDuplicateIndex() if DEDUPE_ENABLED else None
+    )
     tweet_data = TweetData()
     tweets = tweet_data.get_tweets()
     
     print(f"📁 Loaded {len(tweets)} tweets from data.json")
-    print("\n🔍 Step 1: Classifying technology-related tweets...")
+    print(f"\n🔍 Classifying tweets and scoring engagement potential ({analysis_mode} mode)...")
+    print("   Tech news search, reply and post generation run alongside the analysis")
     
     # Use an overall trace for the entire workflow
     with trace(workflow_name="Tweet_Analysis"):
-        # Step 1: Classify tech tweets
-        tech_tweets = await analyzer.classify_tech_tweets(tweets)
-        print(f"\n✅ Found {len(tech_tweets)} technology-related tweets")
-        
-        if not tech_tweets:
-            print("No technology tweets found. Exiting.")
-            return
-        
-        # Step 2: Score engagement potential
-        print(f"\n📊 Step 2: Scoring engagement potential...")
-        scored_tweets = await analyzer.score_engagement_potential(tech_tweets)
-        
-        # Step 3: Find best tweet
-        print(f"\n🎯 Step 3: Finding best tweet for engagement...")
-        best_tweet = await analyzer.find_best_tweet(scored_tweets)
-        
-        # Step 4: Generate human-like reply
-        print(f"\n✍️  Step 4: Generating human-like reply...")
-        tweet_reply = await analyzer.generate_reply(best_tweet)
-        
-        # Step 5: Generate standalone post
-        print(f"\n📝 Step 5: Generating standalone post...")
-        tweet_post = await analyzer.generate_new_post(scored_tweets)
+        analysis = await analyzer.run_analysis(
+            tweets,
+            max_concurrency=max_concurrency,
+            batch_size=batch_size,
+            stop_at_score=ENGAGEMENT_STOP_SCORE,
+            max_scored=ENGAGEMENT_MAX_SCORED,
+            shortlist=ENGAGEMENT_SHORTLIST,
+            analysis_mode=analysis_mode,
+            pipelined=pipelined,
+            variants=variants
+        )
+    
+    if analysis is None:
+        print("No technology tweets found to reply to. Exiting.")
+        return
+    
+    tech_tweets = analysis["tech_tweets"]
+    best_tweet = analysis["best_tweet"]
+    tweet_reply = analysis["tweet_reply"]
+    tweet_post = analysis["new_post"]
     
     # Display results
     print("\n" + "=" * 60)
@@ -527,7 +1657,7 @@ async def main():
     print(f"\n📝 ORIGINAL TWEET:")
     print(f"   {best_tweet['post']}")
     print(f"   URL: {best_tweet['url']}")
-    print(f"   Stats: {best_tweet['stats']}")
+    print(f"   Stats: {format_stats(best_tweet['stats'], abbreviate=True)}")
     
     print(f"\n🎯 ENGAGEMENT ANALYSIS:")
     print(f"   Score: {best_tweet['engagement_score'].engagement_potential:.1f}/10")
@@ -539,18 +1669,31 @@ async def main():
     print(f"   Style: {tweet_reply.humor_style}")
     print(f"   Reasoning: {tweet_reply.reasoning}")
     
+    for number, variant in enumerate(analysis["reply_variants"][1:], 2):
+        print(f"\n💬 REPLY VARIANT #{number} ({variant.tone}, {variant.humor_style}):")
+        print(f"   {variant.reply_text}")
+    
+    for rank, (tweet, replies) in enumerate(analysis["reply_candidates"][1:], 2):
+        print(f"\n💭 ALTERNATIVE REPLY #{rank} (score {tweet['engagement_score'].engagement_potential:.1f}/10):")
+        print(f"   Tweet: {tweet['post'][:100]}...")
+        print(f"   {replies[0].reply_text}")
+    
     print(f"\n📢 GENERATED POST:")
     print(f"   {tweet_post.reply_text}")
     print(f"   Tone: {tweet_post.tone}")
     print(f"   Style: {tweet_post.humor_style}")
     print(f"   Reasoning: {tweet_post.reasoning}")
     
+    for number, variant in enumerate(analysis["post_variants"][1:], 2):
+        print(f"\n📢 POST VARIANT #{number} ({variant.tone}, {variant.humor_style}):")
+        print(f"   {variant.reply_text}")
+    
     # Save results
     results = {
         "best_tweet": {
             "url": best_tweet['url'],
             "post": best_tweet['post'],
-            "stats": best_tweet['stats'],
+            "stats": format_stats(best_tweet['stats'], abbreviate=True),
             "engagement_score": best_tweet['engagement_score'].engagement_potential,
             "tech_categories": best_tweet['tech_analysis'].tech_categories
         },
@@ -558,18 +1701,33 @@ async def main():
             "text": tweet_reply.reply_text,
             "tone": tweet_reply.tone,
             "style": tweet_reply.humor_style,
-            "reasoning": tweet_reply.reasoning
+            "reasoning": tweet_reply.reasoning,
+            "variants": [_variant_dict(variant) for variant in analysis["reply_variants"]]
         },
         "generated_post": {
             "text": tweet_post.reply_text,
             "tone": tweet_post.tone,
             "style": tweet_post.humor_style,
-            "reasoning": tweet_post.reasoning
+            "reasoning": tweet_post.reasoning,
+            "variants": [_variant_dict(variant) for variant in analysis["post_variants"]]
         },
+        "reply_candidates": [
+            {
+                "url": tweet['url'],
+                "post": tweet['post'],
+                "engagement_score": tweet['engagement_score'].engagement_potential,
+                "reply": _variant_dict(replies[0]),
+                "variants": [_variant_dict(reply) for reply in replies]
+            }
+            for tweet, replies in analysis["reply_candidates"]
+        ],
         "analysis_summary": {
             "total_tweets": len(tweets),
             "tech_tweets_found": len(tech_tweets),
-            "best_score": best_tweet['engagement_score'].engagement_potential
+            "best_score": best_tweet['engagement_score'].engagement_potential,
+            "llm_calls_avoided": analysis["prefilter"].get("llm_calls_avoided", 0),
+            "scorer_calls_avoided": analysis["shortlist"].get("scorer_calls_avoided", 0),
+            "duplicates_collapsed": analysis["dedupe"].get("duplicates_collapsed", 0)
         }
     }
     
@@ -577,7 +1735,65 @@ async def main():
         json.dump(results, f, indent=2, ensure_ascii=False, default=str)
     
     print(f"\n💾 Results saved to analysis_results.json")
+    
+    write_report(analysis["metrics"], METRICS_REPORT_PATH)
+    totals = analysis["metrics"]["totals"]
+    print(f"⏱️  Agent metrics saved to {METRICS_REPORT_PATH.name}: {totals['calls']} calls, "
+          f"{totals['errors']} errors, {totals['input_tokens'] + totals['output_tokens']} tokens")
+    
+    if totals['hedges']:
+        print(f"🪞 Hedged {totals['hedges']} slow calls, {totals['hedge_wins']} hedges finished first")
+    
+    limiter_stats = analyzer.rate_limiter.stats()
+    print(f"🚦 Rate limiter: concurrency limit {limiter_stats['concurrency_limit']}, "
+          f"{limiter_stats['throttle_events']} throttle events, {limiter_stats['retries']} retries")
+    
+    cache_stats = analyzer.cache.stats()
+    print(f"♻️  Analysis cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['entries']} entries")
+    
+    for agent_name, usage in analyzer.prompt_builder.report().items():
+        print(f"🔢 {agent_name}: {usage['tokens_sent']} prompt tokens over {usage['prompts']} prompts "
+              f"({usage['avg_tokens_per_prompt']:.0f} avg, {usage['tokens_saved']} saved by compaction)")
     print("\n🚀 Analysis complete! Ready to engage!")
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Analyze scraped tweets and generate engagement content")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=DEFAULT_CONCURRENCY,
+        help=f"Maximum number of classifier calls in flight at once (default: {DEFAULT_CONCURRENCY})"
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_BATCH_SIZE,
+        help=f"Number of tweets packed into each classifier call (default: {DEFAULT_BATCH_SIZE})"
+    )
+    parser.add_argument(
+        "--mode",
+        choices=ANALYSIS_MODES,
+        default=DEFAULT_ANALYSIS_MODE,
+        help=f"Classify and score with two agents or one fused agent (default: {DEFAULT_ANALYSIS_MODE})"
+    )
+    parser.add_argument(
+        "--no-pipeline",
+        dest="pipelined",
+        action="store_false",
+        default=DEFAULT_PIPELINED,
+        help="Finish classifying every tweet before scoring starts (two_stage mode only)"
+    )
+    parser.add_argument(
+        "--variants",
+        type=int,
+        default=DEFAULT_VARIANTS,
+        help=f"Drafts returned by each reply and post generator call (default: {DEFAULT_VARIANTS})"
+    )
+    args = parser.parse_args()
+    asyncio.run(main(
+        max_concurrency=args.concurrency,
+        batch_size=args.batch_size,
+        analysis_mode=args.mode,
+        pipelined=args.pipelined,
+        variants=args.variants
+    ))
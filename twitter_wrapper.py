@@ -9,6 +9,7 @@ import asyncio
 import logging
 from pathlib import Path
 from playwright.async_api import async_playwright
+from tweet_stats import parse_stats
 
 # Configure logging
 logging.basicConfig(level=logging.INFO,
@@ -20,8 +21,78 @@ SCRIPT_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
 STORAGE_STATE_PATH = SCRIPT_DIR / "state.json"
 DATA_PATH = SCRIPT_DIR / "data.json"
 
-async def fetch_tweets_async(scroll_count=3):
-    """Fetch tweets from Twitter using Playwright with configurable scroll count"""
+# Whether scraped tweets keep the original stats label next to the parsed counts
+KEEP_RAW_STATS = os.getenv("KEEP_RAW_STATS", "false").lower() in ("1", "true", "yes")
+
+# Browser pages fetching status pages at the same time after the timeline is scrolled
+SCRAPE_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "4"))
+
+async def _fetch_status(page, url, stats, keep_raw_stats):
+    """Open one status page and return its tweet, or None when the post text is missing"""
+    await page.goto(url)
+    stats["navigations"] += 1
+    await page.wait_for_selector('[data-testid="tweet"]')
+    
+    # Check if post text exists
+    post_exists = await page.evaluate('''() => {
+        return document.querySelector('[data-testid="tweet"] [data-testid="tweetText"]') !== null;
+    }''')
+    
+    if not post_exists:
+        logger.warning(f"Post not found for URL: {url}")
+        return None
+    
+    # Extract post text
+    post = await page.evaluate('''() => {
+        return document.querySelector('[data-testid="tweet"] [data-testid="tweetText"]').innerText;
+    }''')
+    
+    # Scroll down to load more content
+    await page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
+    await page.wait_for_timeout(2000)
+    
+    # Get stats
+    stats_label = await page.evaluate('''() => {
+        return document.querySelector('[data-testid="tweet"] div[aria-label*="like"]').getAttribute("aria-label");
+    }''')
+    
+    # Get comments
+    comments = await page.evaluate('''() => {
+        let els = document.querySelectorAll('article[data-testid="tweet"] div[data-testid="tweetText"]');
+        let comments = [];
+        els.forEach((el) => {
+            comments.push(el.innerText);
+        });
+        return comments;
+    }''')
+    
+    tweet = {
+        "url": url,
+        "post": post,
+        "stats": parse_stats(stats_label),
+        "comments": comments,
+    }
+    if keep_raw_stats:
+        tweet["stats_raw"] = stats_label
+    return tweet
+
+async def fetch_tweets_async(scroll_count=3, base_url="https://x.com", headless=False, stats=None,
+                             data_path=DATA_PATH, keep_raw_stats=KEEP_RAW_STATS, concurrency=SCRAPE_CONCURRENCY):
+    """Fetch tweets from Twitter using Playwright with configurable scroll count
+
+    ``base_url`` points the scraper at another host, such as the local fixture server
+    used by the benchmarks. When ``stats`` is a dict it is filled with the number of
+    page navigations, timeline scrolls, status URLs found, status pages that failed
+    and tweets extracted. Each tweet's engagement label is stored as integer counts
+    under ``stats``, and the label itself under ``stats_raw`` when ``keep_raw_stats``
+    is set. Up to ``concurrency`` status pages are fetched at once; tweets keep their
+    timeline order, and a page that fails is logged and skipped.
+    """
+    if stats is None:
+        stats = {}
+    stats.update({"navigations": 0, "scrolls": 0, "urls_found": 0, "failed": 0, "tweets": 0})
+    base_url = base_url.rstrip("/")
+    
     logger.info(f"Starting tweet fetch with {scroll_count} scrolls")
     logger.info(f"Storage state will be loaded from: {STORAGE_STATE_PATH}")
     
@@ -36,7 +107,7 @@ async def fetch_tweets_async(scroll_count=3):
                     "--disable-extensions",  # Disable extensions
                     "--start-maximized",  # Start maximized
                 ],
-                headless=False,  # Ensure the browser is visible
+                headless=headless,  # Visible by default so the user can log in
             )
             
             # Set up context options for desktop browser dimensions
@@ -55,7 +126,8 @@ async def fetch_tweets_async(scroll_count=3):
             context = await browser.new_context(**context_options)
             page = await context.new_page()
             
-            await page.goto("https://x.com/home?lang=en")
+            await page.goto(f"{base_url}/home?lang=en")
+            stats["navigations"] += 1
             logger.info(f"Page loaded: {await page.title()}")
             
             # Check if login is required (usually needed on first run)
@@ -89,6 +161,7 @@ async def fetch_tweets_async(scroll_count=3):
             logger.info(f"Scrolling {scroll_count} times to load tweets...")
             for i in range(scroll_count):
                 await page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
+                stats["scrolls"] += 1
                 logger.info(f"Scroll {i+1}/{scroll_count} completed")
                 # Wait for content to load after each scroll
                 await page.wait_for_timeout(2000)
@@ -105,62 +178,64 @@ async def fetch_tweets_async(scroll_count=3):
                 return postsURLs;
             }''')
             
+            stats["urls_found"] = len(posts_urls)
             logger.info(f"Extracted {len(posts_urls)} post URLs")
             
-            my_posts = []
+            # Status pages are fetched by a pool of pages sharing the logged-in context
+            pages = [page]
+            for _ in range(max(1, min(concurrency, len(posts_urls))) - 1):
+                try:
+                    pages.append(await context.new_page())
+                except Exception as e:
+                    logger.warning(f"Could not open another browser page, using {len(pages)}: {str(e)}")
+                    break
+            logger.info(f"Fetching status pages with {len(pages)} browser pages")
             
-            # Go to each URL and get the post
+            pending = asyncio.Queue()
             for idx, url in enumerate(posts_urls):
-                logger.info(f"Processing tweet {idx+1}/{len(posts_urls)}: {url}")
-                await page.goto(url)
-                await page.wait_for_selector('[data-testid="tweet"]')
-                
-                # Check if post text exists
-                post_exists = await page.evaluate('''() => {
-                    return document.querySelector('[data-testid="tweet"] [data-testid="tweetText"]') !== null;
-                }''')
-                
-                if not post_exists:
-                    logger.warning(f"Post not found for URL: {url}")
-                    continue
-                
-                # Extract post text
-                post = await page.evaluate('''() => {
-                    return document.querySelector('[data-testid="tweet"] [data-testid="tweetText"]').innerText;
-                }''')
-                
-                # Scroll down to load more content
-                await page.evaluate("window.scrollTo(0, document.body.scrollHeight);")
-                await page.wait_for_timeout(2000)
-                
-                # Get stats
-                stats = await page.evaluate('''() => {
-                    return document.querySelector('[data-testid="tweet"] div[aria-label*="like"]').getAttribute("aria-label");
-                }''')
-                
-                # Get comments
-                comments = await page.evaluate('''() => {
-                    let els = document.querySelectorAll('article[data-testid="tweet"] div[data-testid="tweetText"]');
-                    let comments = [];
-                    els.forEach((el) => {
-                        comments.push(el.innerText);
-                    });
-                    return comments;
-                }''')
-                
-                my_posts.append({
-                    "url": url,
-                    "post": post,
-                    "stats": stats,
-                    "comments": comments,
-                })
+                pending.put_nowait((idx, url))
+            results = [None] * len(posts_urls)
+            
+            async def fetch_with_page(status_page):
+                while not pending.empty():
+                    idx, url = pending.get_nowait()
+                    logger.info(f"Processing tweet {idx+1}/{len(posts_urls)}: {url}")
+                    try:
+                        results[idx] = await _fetch_status(status_page, url, stats, keep_raw_stats)
+                    except Exception as e:
+                        # One broken status page should not cost the rest of the scrape
+                        logger.warning(f"Failed to fetch {url}: {str(e)}")
+                        stats["failed"] += 1
+                    
+                    if status_page.is_closed():
+                        # Replace a page that crashed; if that fails too, the pool shrinks by one
+                        try:
+                            status_page = await context.new_page()
+                        except Exception as e:
+                            logger.warning(f"Could not replace a closed browser page: {str(e)}")
+                            return
+            
+            outcomes = await asyncio.gather(*(fetch_with_page(status_page) for status_page in pages),
+                                            return_exceptions=True)
+            for outcome in outcomes:
+                if isinstance(outcome, Exception):
+                    logger.warning(f"A browser page stopped fetching: {str(outcome)}")
+            
+            # Every page is gone; the URLs nobody got to count as failed
+            if not pending.empty():
+                logger.warning(f"No browser pages left, skipping {pending.qsize()} status pages")
+                stats["failed"] += pending.qsize()
+            
+            # Results are stored by timeline position, whichever page finished first
+            my_posts = [tweet for tweet in results if tweet is not None]
             
+            stats["tweets"] = len(my_posts)
             logger.info(f"Extracted {len(my_posts)} posts")
             
             # Save collected data to data.json
-            with open(DATA_PATH, "w", encoding="utf-8") as f:
+            with open(data_path, "w", encoding="utf-8") as f:
                 json.dump(my_posts, f, indent=2)
-            logger.info(f"Data saved to {DATA_PATH}")
+            logger.info(f"Data saved to {data_path}")
             
             logger.info("Closing browser...")
             await browser.close()